@@ -26,6 +26,16 @@ if config.config_file_name is not None:
 # Metadata dos modelos para autogenerate
 target_metadata = Base.metadata
 
+# Objetos criados só por migrations manuais (fora dos modelos) -
+# o autogenerate não deve tentar removê-los
+MANUAL_SCHEMA_OBJECTS = {"search_vector", "ix_episodes_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Filtro do autogenerate."""
+    return not (reflected and name in MANUAL_SCHEMA_OBJECTS)
+
+
 # Sobrescrever sqlalchemy.url com nossa configuração
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
@@ -38,6 +48,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -55,7 +66,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,88 @@
+"""initial schema
+
+Cria as tabelas episodes, official_links e admin_users.
+Bancos criados antes desta migration (tabelas já existentes) são
+preservados: cada tabela só é criada se ainda não existir.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-01-31 15:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+episode_status = sa.Enum('DRAFT', 'PUBLISHED', name='episodestatus')
+link_type = sa.Enum('INSTAGRAM', 'YOUTUBE', 'SPOTIFY', 'SITE', 'OTHER', name='linktype')
+
+
+def upgrade() -> None:
+    # Em modo offline (--sql) não há conexão para inspecionar
+    if context.is_offline_mode():
+        existing = set()
+    else:
+        existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'episodes' not in existing:
+        op.create_table(
+            'episodes',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('status', episode_status, nullable=False),
+            sa.Column('cover_image_url', sa.String(length=500), nullable=True),
+            sa.Column('spotify_url', sa.String(length=500), nullable=True),
+            sa.Column('youtube_url', sa.String(length=500), nullable=True),
+            sa.Column('tags', sa.String(length=500), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_episodes_id', 'episodes', ['id'], unique=False)
+
+    if 'official_links' not in existing:
+        op.create_table(
+            'official_links',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('label', sa.String(length=100), nullable=False),
+            sa.Column('url', sa.String(length=500), nullable=False),
+            sa.Column('type', link_type, nullable=False),
+            sa.Column('order', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_official_links_id', 'official_links', ['id'], unique=False)
+
+    if 'admin_users' not in existing:
+        op.create_table(
+            'admin_users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=False),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('role', sa.String(length=50), nullable=False),
+            sa.Column('is_active', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_admin_users_id', 'admin_users', ['id'], unique=False)
+        op.create_index('ix_admin_users_email', 'admin_users', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table('admin_users')
+    op.drop_table('official_links')
+    op.drop_table('episodes')
+    link_type.drop(op.get_bind(), checkfirst=True)
+    episode_status.drop(op.get_bind(), checkfirst=True)
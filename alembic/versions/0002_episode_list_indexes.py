@@ -0,0 +1,62 @@
+"""episode list indexes
+
+Índices das listagens de episódios, na mesma ordem de
+crud.episode.episodes_query (published_at DESC NULLS LAST, id DESC):
+
+- ix_episodes_status_published_at_id: listagem admin com filtro de status
+- ix_episodes_published_published_at_id: parcial (status = 'PUBLISHED'),
+  usado pela listagem pública
+
+Criados com CREATE INDEX CONCURRENTLY fora de transação, para não
+bloquear escritas na tabela durante o deploy.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_episodes_status_published_at_id',
+            'episodes',
+            ['status', sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_episodes_published_published_at_id',
+            'episodes',
+            [sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+            postgresql_where=sa.text("status = 'PUBLISHED'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_episodes_published_published_at_id',
+            table_name='episodes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_episodes_status_published_at_id',
+            table_name='episodes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,37 @@
+"""table versions
+
+Tabela table_versions: marca d'água de alteração por tabela, usada
+para ETags e coerência dos caches de resposta.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    op.bulk_insert(table_versions, [
+        {'table_name': 'episodes', 'version': 1},
+        {'table_name': 'official_links', 'version': 1},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
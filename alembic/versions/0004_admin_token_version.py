@@ -0,0 +1,30 @@
+"""admin token version
+
+Coluna admin_users.token_version: incrementada ao trocar senha/email ou
+desativar o usuário, revogando tokens JWT emitidos antes (claim "tv").
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'admin_users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('admin_users', 'token_version')
@@ -0,0 +1,56 @@
+"""episode search vector
+
+Busca full-text de episódios:
+
+- coluna gerada episodes.search_vector (tsvector, STORED) com pesos
+  A = título, B = tags, C = descrição
+- índice GIN ix_episodes_search_vector, criado CONCURRENTLY
+
+A coluna gerada reescreve a tabela (lock exclusivo durante o ADD COLUMN);
+em catálogos grandes, rode esta migration fora do horário de pico.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mesma configuração de texto de crud.episode.SEARCH_TEXT_CONFIG
+    op.execute("""
+        ALTER TABLE episodes ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('portuguese', replace(coalesce(tags, ''), ',', ' ')), 'B') ||
+            setweight(to_tsvector('portuguese', coalesce(description, '')), 'C')
+        ) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_episodes_search_vector',
+            'episodes',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_episodes_search_vector',
+            table_name='episodes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('episodes', 'search_vector')
@@ -0,0 +1,77 @@
+"""normalized tags
+
+Tags normalizadas: tabelas tags (com published_count mantido pelo CRUD)
+e episode_tags (N:N). Faz o backfill a partir de episodes.tags
+("tag1,tag2") e calcula as contagens iniciais de publicados.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('published_count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tags_id', 'tags', ['id'], unique=False)
+    op.create_index('ix_tags_name', 'tags', ['name'], unique=True)
+
+    op.create_table(
+        'episode_tags',
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('episode_id', 'tag_id'),
+    )
+    op.create_index(
+        'ix_episode_tags_tag_id_episode_id', 'episode_tags', ['tag_id', 'episode_id'], unique=False
+    )
+
+    # Backfill a partir das strings separadas por vírgula
+    op.execute("""
+        INSERT INTO tags (name, published_count)
+        SELECT DISTINCT left(lower(trim(t)), 100), 0
+        FROM episodes, unnest(string_to_array(episodes.tags, ',')) AS t
+        WHERE trim(t) <> ''
+    """)
+    op.execute("""
+        INSERT INTO episode_tags (episode_id, tag_id)
+        SELECT DISTINCT e.id, tg.id
+        FROM episodes e, unnest(string_to_array(e.tags, ',')) AS t
+        JOIN tags tg ON tg.name = left(lower(trim(t)), 100)
+        WHERE trim(t) <> ''
+    """)
+    op.execute("""
+        UPDATE tags SET published_count = counts.total
+        FROM (
+            SELECT et.tag_id, count(*) AS total
+            FROM episode_tags et
+            JOIN episodes e ON e.id = et.episode_id
+            WHERE e.status = 'PUBLISHED'
+            GROUP BY et.tag_id
+        ) AS counts
+        WHERE tags.id = counts.tag_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('episode_tags')
+    op.drop_index('ix_tags_name', table_name='tags')
+    op.drop_index('ix_tags_id', table_name='tags')
+    op.drop_table('tags')
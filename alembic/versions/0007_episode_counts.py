@@ -0,0 +1,40 @@
+"""episode counts
+
+Tabela episode_counts: total de episódios por status, mantido pelo CRUD
+e usado no header X-Total-Count das listagens. Backfill com a contagem
+atual (uma linha por status, inclusive os sem episódios).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'episode_counts',
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('status'),
+    )
+    op.execute("""
+        INSERT INTO episode_counts (status, total)
+        SELECT s.status, count(e.id)
+        FROM (VALUES ('DRAFT'), ('PUBLISHED')) AS s (status)
+        LEFT JOIN episodes e ON e.status::text = s.status
+        GROUP BY s.status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('episode_counts')
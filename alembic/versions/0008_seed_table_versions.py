@@ -0,0 +1,32 @@
+"""seed table versions
+
+Garante uma linha em table_versions para cada marca d'água usada pela
+aplicação, inclusive a pseudo-tabela published_episodes (conjunto
+publicado, usada pelo feed), que a 0003 não criava.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        INSERT INTO table_versions (table_name, version)
+        VALUES ('episodes', 1), ('official_links', 1), ('published_episodes', 1)
+        ON CONFLICT (table_name) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    # As linhas continuam válidas com o schema anterior
+    pass
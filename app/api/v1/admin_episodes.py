@@ -2,18 +2,25 @@
 Rotas administrativas de episódios.
 CRUD completo e publicação de episódios (requer autenticação).
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.session import get_db
+from typing import List, Optional, Tuple
+from app.core.batch import BATCH_OPENAPI_BODY, check_batch_size, read_batch_items, validate_items
+from app.core.pagination import Cursor, cursor_param, next_cursor_for, next_page_link
+from app.core.query_budget import query_budget
+from app.core.serialization import fields_param, project_episodes, render_projection
+from app.db.session import get_db, run_db
 from app.schemas.schemas import (
     EpisodeResponse, EpisodeCreate, EpisodeUpdate,
-    EpisodePublish, MessageResponse
+    EpisodePublish, MessageResponse,
+    EpisodeBatchPublish, BatchItemError, BatchResult
 )
 from app.crud.episode import (
     get_episode, get_episodes, create_episode,
-    update_episode, delete_episode, publish_episode, unpublish_episode
+    update_episode, delete_episode, publish_episode, unpublish_episode,
+    create_episodes_bulk, publish_episodes_bulk
 )
+from app.crud.episode_count import get_episode_total
 from app.api.v1.auth import get_current_user
 from app.models.models import EpisodeStatus
 
@@ -21,16 +28,24 @@ router = APIRouter(prefix="/episodes", tags=["admin-episodes"])
 
 
 @router.get("", response_model=List[EpisodeResponse])
+@query_budget(4)  # +1 só na página em que published_at passa para a cauda de NULLs
 def list_all_episodes(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = Query(None, description="Filtrar por status: DRAFT ou PUBLISHED"),
+    cursor: Optional[Cursor] = Depends(cursor_param),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_param),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     Lista todos os episódios (incluindo rascunhos).
     Apenas para admins autenticados.
+    Suporta paginação por cursor (header `Link` / `X-Next-Cursor`)
+    e `?fields=` como a listagem pública. `X-Total-Count` vem dos
+    contadores por status (respeita o filtro `status`).
     """
     status_filter = None
     if status:
@@ -42,7 +57,19 @@ def list_all_episodes(
                 detail="Status inválido. Use DRAFT ou PUBLISHED"
             )
     
-    episodes = get_episodes(db, skip=skip, limit=limit, status=status_filter)
+    episodes = get_episodes(
+        db, skip=skip, limit=limit, status=status_filter, cursor=cursor, fields=fields
+    )
+    
+    headers = {"X-Total-Count": str(get_episode_total(db, status_filter))}
+    next_cursor = next_cursor_for(episodes, limit)
+    if next_cursor:
+        headers["Link"] = next_page_link(request.url, next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+    
+    if fields:
+        return render_projection(project_episodes(episodes, fields), fields, headers=headers)
+    response.headers.update(headers)
     return episodes
 
 
@@ -59,7 +86,48 @@ def create_new_episode(
     return create_episode(db, episode)
 
 
+@router.post(":batch", response_model=BatchResult, openapi_extra=BATCH_OPENAPI_BODY)
+async def create_episodes_batch(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Cria vários episódios em uma única transação.
+    Itens inválidos são reportados em `errors` (pela posição no array/linha)
+    e os válidos são inseridos mesmo assim.
+    Aceita array JSON ou NDJSON (Content-Type application/x-ndjson).
+    """
+    items = await read_batch_items(request)
+    valid, errors = validate_items(items, EpisodeCreate)
+    ids = await run_db(db, create_episodes_bulk, [episode for _, episode in valid]) if valid else []
+    return BatchResult(succeeded=len(ids), failed=len(errors), ids=ids, errors=errors)
+
+
+@router.patch(":batch-publish", response_model=BatchResult)
+def publish_episodes_batch(
+    body: EpisodeBatchPublish,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Publica vários episódios em uma única transação.
+    IDs inexistentes são reportados em `errors` (pela primeira posição);
+    IDs repetidos contam uma vez.
+    """
+    check_batch_size(body.ids)
+    ids, missing = publish_episodes_bulk(db, body.ids)
+    missing = set(missing)
+    errors = []
+    for index, episode_id in enumerate(body.ids):
+        if episode_id in missing:
+            missing.discard(episode_id)
+            errors.append(BatchItemError(index=index, detail="Episódio não encontrado"))
+    return BatchResult(succeeded=len(ids), failed=len(errors), ids=ids, errors=errors)
+
+
 @router.get("/{episode_id}", response_model=EpisodeResponse)
+@query_budget(2)
 def get_episode_by_id(
     episode_id: int,
     db: Session = Depends(get_db),
@@ -76,6 +144,7 @@ def get_episode_by_id(
 
 
 @router.put("/{episode_id}", response_model=EpisodeResponse)
+@query_budget(12)
 def update_episode_by_id(
     episode_id: int,
     episode_update: EpisodeUpdate,
@@ -93,6 +162,7 @@ def update_episode_by_id(
 
 
 @router.delete("/{episode_id}", response_model=MessageResponse)
+@query_budget(12)
 def delete_episode_by_id(
     episode_id: int,
     db: Session = Depends(get_db),
@@ -109,6 +179,7 @@ def delete_episode_by_id(
 
 
 @router.patch("/{episode_id}/publish", response_model=EpisodeResponse)
+@query_budget(12)
 def publish_episode_by_id(
     episode_id: int,
     db: Session = Depends(get_db),
@@ -128,6 +199,7 @@ def publish_episode_by_id(
 
 
 @router.patch("/{episode_id}/unpublish", response_model=EpisodeResponse)
+@query_budget(12)
 def unpublish_episode_by_id(
     episode_id: int,
     db: Session = Depends(get_db),
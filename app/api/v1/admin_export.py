@@ -0,0 +1,25 @@
+"""
+Rotas administrativas de export.
+Dump completo do catálogo sem paginação (requer autenticação).
+"""
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.core.export import NDJSON_MEDIA_TYPE, iter_episodes_ndjson
+from app.api.v1.auth import get_current_user
+
+router = APIRouter(prefix="/export", tags=["admin-export"])
+
+
+@router.get("/episodes.ndjson")
+def export_episodes(current_user = Depends(get_current_user)):
+    """
+    Exporta todos os episódios (incluindo rascunhos) em NDJSON.
+    Transmitido em streaming, com memória constante; o arquivo inteiro é
+    reimportado com `python import_catalog.py episodes` (o :batch recusa
+    lotes acima de BATCH_MAX_ITEMS).
+    """
+    return StreamingResponse(
+        iter_episodes_ndjson(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="episodes.ndjson"'}
+    )
@@ -2,15 +2,18 @@
 Rotas administrativas de links oficiais.
 CRUD completo de links (requer autenticação).
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.db.session import get_db
+from app.core.batch import BATCH_OPENAPI_BODY, read_batch_items, validate_items
+from app.db.session import get_db, run_db
 from app.schemas.schemas import (
     OfficialLinkResponse, OfficialLinkCreate,
-    OfficialLinkUpdate, MessageResponse
+    OfficialLinkUpdate, MessageResponse, BatchResult
+)
+from app.crud.link import (
+    get_link, get_links, create_link, update_link, delete_link, create_links_bulk
 )
-from app.crud.link import get_link, get_links, create_link, update_link, delete_link
 from app.api.v1.auth import get_current_user
 
 router = APIRouter(prefix="/links", tags=["admin-links"])
@@ -35,6 +38,23 @@ def create_new_link(
     return create_link(db, link)
 
 
+@router.post(":batch", response_model=BatchResult, openapi_extra=BATCH_OPENAPI_BODY)
+async def create_links_batch(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Cria vários links em uma única transação.
+    Itens inválidos são reportados em `errors` (pela posição no array/linha).
+    Aceita array JSON ou NDJSON (Content-Type application/x-ndjson).
+    """
+    items = await read_batch_items(request)
+    valid, errors = validate_items(items, OfficialLinkCreate)
+    ids = await run_db(db, create_links_bulk, [link for _, link in valid]) if valid else []
+    return BatchResult(succeeded=len(ids), failed=len(errors), ids=ids, errors=errors)
+
+
 @router.get("/{link_id}", response_model=OfficialLinkResponse)
 def get_link_by_id(
     link_id: int,
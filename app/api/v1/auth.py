@@ -6,10 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from app.db.session import get_db
+from app.db.session import get_db, run_db
 from app.schemas.schemas import Token, LoginRequest, AdminUserResponse
-from app.crud.user import authenticate_user, get_user_by_email
-from app.core.security import create_access_token, decode_access_token
+from app.crud.user import authenticate_user_async, get_user_by_email
+from app.core.cache import MISSING, principal_cache
+from app.core.security import (
+    PasswordPoolBusyError, create_access_token, decode_access_token_cached
+)
 from app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -25,6 +28,11 @@ async def get_current_user(
     """
     Dependency para obter usuário atual a partir do token JWT.
     Usado em rotas protegidas.
+    
+    O usuário fica em cache por (sub, token_version) durante
+    AUTH_PRINCIPAL_TTL_SECONDS. `update_user` limpa o cache do worker que
+    fez a alteração na hora; nos demais, a revogação vale quando a
+    entrada expira (a cada miss, is_active e token_version são relidos).
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,7 +40,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if payload is None:
         raise credentials_exception
     
@@ -40,7 +48,18 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = get_user_by_email(db, email=email)
+    # Tokens emitidos antes do claim "tv" equivalem à versão 0
+    token_version = payload.get("tv", 0)
+    key = (email, token_version)
+    user = principal_cache.get(key)
+    if user is MISSING:
+        generation = principal_cache.generation
+        db_user = await run_db(db, get_user_by_email, email=email)
+        user = None
+        if db_user and db_user.is_active and db_user.token_version == token_version:
+            user = AdminUserResponse.model_validate(db_user)
+        principal_cache.set(key, user, generation=generation)
+    
     if user is None:
         raise credentials_exception
     
@@ -48,15 +67,23 @@ async def get_current_user(
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
     """
     Endpoint de login.
     Recebe email e senha, retorna token JWT se credenciais válidas.
+    Responde 503 quando a fila de verificação de senha está cheia.
     """
-    user = authenticate_user(db, login_data.email, login_data.password)
+    try:
+        user = await authenticate_user_async(db, login_data.email, login_data.password)
+    except PasswordPoolBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitas tentativas de login simultâneas, tente novamente",
+            headers={"Retry-After": "1"},
+        )
     
     if not user:
         raise HTTPException(
@@ -67,7 +94,8 @@ def login(
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "tv": user.token_version},
+        expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -79,3 +107,4 @@ async def read_users_me(current_user = Depends(get_current_user)):
     Retorna informações do usuário autenticado.
     """
     return current_user
+
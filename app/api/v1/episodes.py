@@ -2,52 +2,189 @@
 Rotas públicas de episódios.
 Listagem e detalhes de episódios publicados (sem autenticação).
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from typing import List, Optional, Tuple
+from app.core.cache import MISSING, cache_key, episodes_cache
+from app.core.config import settings
+from app.core.etag import current_watermark, etag_matches, make_etag, not_modified
+from app.core.pagination import Cursor, cursor_param, next_cursor_for, next_page_link
+from app.core.query_budget import query_budget
+from app.core.serialization import (
+    episode_from_db, episodes_from_db, fields_param, project_episodes,
+    render_episode, render_episodes, render_projection
+)
+from app.db.session import get_router_db, run_db
 from app.schemas.schemas import EpisodeResponse
-from app.crud.episode import get_episode, get_published_episodes
+from app.crud.episode import (
+    count_published_episodes, get_episode, get_published_episodes, search_published_episodes
+)
 
 router = APIRouter(prefix="/episodes", tags=["episodes"])
 
+# Session síncrona ou AsyncSession, conforme ASYNC_DB_ROUTERS
+get_episodes_db = get_router_db("episodes")
+
 
 @router.get("", response_model=List[EpisodeResponse])
-def list_published_episodes(
+@query_budget(4)  # +1 só na página em que published_at passa para a cauda de NULLs
+async def list_published_episodes(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a pular"),
     limit: int = Query(100, ge=1, le=100, description="Limite de registros"),
-    db: Session = Depends(get_db)
+    cursor: Optional[Cursor] = Depends(cursor_param),
+    tag: Optional[List[str]] = Query(None, description="Filtrar por tag (repita para exigir várias)"),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_param),
+    db = Depends(get_episodes_db)
 ):
     """
     Lista episódios publicados.
     Retorna apenas episódios com status PUBLISHED.
+    `?tag=a&tag=b` retorna só episódios com todas as tags.
+    `?fields=id,title,published_at` (ou `?fields=summary`) retorna só esses
+    campos; as demais colunas nem são lidas do banco.
+    
+    Paginação por cursor: a próxima página vem no header `Link`
+    (rel="next") e em `X-Next-Cursor`. `skip` continua aceito.
+    `X-Total-Count` traz o total (sem COUNT(*): vem dos contadores por
+    status, ou da tag filtrada); ausente com mais de uma tag.
+    Suporta GET condicional (`ETag` / `If-None-Match` -> 304).
+    """
+    key = cache_key(request)
+    watermark = await current_watermark(db, "episodes")
+    etag = make_etag("episodes", watermark, key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # A versão entra na chave: outro worker que escreveu invalida este cache
+    cached = episodes_cache.get((watermark.source, watermark.version, key))
+    if cached is MISSING:
+        generation = episodes_cache.generation
+        rows = await run_db(
+            db, get_published_episodes,
+            skip=skip, limit=limit, cursor=cursor, tags=tag, fields=fields
+        )
+        if fields:
+            episodes = project_episodes(rows, fields)
+        elif settings.FAST_JSON:
+            episodes = episodes_from_db(rows)
+        else:
+            episodes = [EpisodeResponse.model_validate(row) for row in rows]
+        total = await run_db(db, count_published_episodes, tag)
+        # Cursor calculado das linhas: a projeção pode não ter published_at
+        cached = (episodes, next_cursor_for(rows, limit), total)
+        episodes_cache.set((watermark.source, watermark.version, key), cached, generation=generation)
+    episodes, next_cursor, total = cached
+    
+    headers = {"ETag": etag}
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        headers["Link"] = next_page_link(request.url, next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+    
+    if fields:
+        return render_projection(episodes, fields, headers=headers)
+    if settings.FAST_JSON:
+        return render_episodes(episodes, headers=headers)
+    response.headers.update(headers)
+    return episodes
+
+
+@router.get("/search", response_model=List[EpisodeResponse])
+@query_budget(4)
+async def search_episodes(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Texto da busca"),
+    skip: int = Query(0, ge=0, description="Número de registros a pular"),
+    limit: int = Query(20, ge=1, le=100, description="Limite de registros"),
+    db = Depends(get_episodes_db)
+):
     """
-    episodes = get_published_episodes(db, skip=skip, limit=limit)
+    Busca full-text em título, descrição e tags de episódios publicados.
+    Resultados por relevância; próxima página no header `Link`.
+    Mesmo cache e GET condicional da listagem.
+    
+    Só os SEARCH_MAX_RESULTS (padrão 1000) resultados mais relevantes são
+    alcançáveis: `skip + limit` acima disso responde 400 (refine a busca).
+    
+    No PostgreSQL a busca usa `websearch_to_tsquery` com a configuração
+    `portuguese` (stemming, stopwords, "frase", -termo, or). Em outros
+    bancos (desenvolvimento/testes) o índice em memória só casa palavras
+    inteiras, sem acentos: sem stemming, stopwords nem operadores, então
+    os resultados podem diferir dos de produção.
+    """
+    if skip + limit > settings.SEARCH_MAX_RESULTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A busca alcança só os {settings.SEARCH_MAX_RESULTS} resultados mais relevantes; refine a busca"
+        )
+    key = cache_key(request)
+    watermark = await current_watermark(db, "episodes")
+    etag = make_etag("episodes", watermark, key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    episodes = episodes_cache.get((watermark.source, watermark.version, key))
+    if episodes is MISSING:
+        generation = episodes_cache.generation
+        rows = await run_db(db, search_published_episodes, q, skip=skip, limit=limit)
+        if settings.FAST_JSON:
+            episodes = episodes_from_db(rows)
+        else:
+            episodes = [EpisodeResponse.model_validate(row) for row in rows]
+        episodes_cache.set((watermark.source, watermark.version, key), episodes, generation=generation)
+    
+    headers = {"ETag": etag}
+    remaining = settings.SEARCH_MAX_RESULTS - (skip + limit)
+    if len(episodes) == limit and remaining > 0:
+        next_url = request.url.include_query_params(skip=skip + limit, limit=min(limit, remaining))
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    
+    if settings.FAST_JSON:
+        return render_episodes(episodes, headers=headers)
+    response.headers.update(headers)
     return episodes
 
 
 @router.get("/{episode_id}", response_model=EpisodeResponse)
-def get_episode_detail(
+@query_budget(2)
+async def get_episode_detail(
+    request: Request,
+    response: Response,
     episode_id: int,
-    db: Session = Depends(get_db)
+    db = Depends(get_episodes_db)
 ):
     """
     Detalhe de um episódio específico.
     Retorna 404 se episódio não existe ou não está publicado.
+    Suporta GET condicional (`ETag` / `If-None-Match` -> 304).
     """
-    episode = get_episode(db, episode_id)
+    key = cache_key(request)
+    watermark = await current_watermark(db, "episodes")
+    etag = make_etag("episodes", watermark, key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    if not episode:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Episódio não encontrado"
-        )
+    episode = episodes_cache.get((watermark.source, watermark.version, key))
+    if episode is MISSING:
+        generation = episodes_cache.generation
+        row = await run_db(db, get_episode, episode_id)
+        # Apenas episódios publicados são acessíveis publicamente;
+        # o 404 também é cacheado (None) para não martelar o banco
+        episode = None
+        if row and row.status == "PUBLISHED":
+            episode = episode_from_db(row) if settings.FAST_JSON else EpisodeResponse.model_validate(row)
+        episodes_cache.set((watermark.source, watermark.version, key), episode, generation=generation)
     
-    # Apenas episódios publicados são acessíveis publicamente
-    if episode.status != "PUBLISHED":
+    if episode is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Episódio não encontrado"
         )
     
+    if settings.FAST_JSON:
+        return render_episode(episode, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return episode
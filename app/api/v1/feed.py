@@ -0,0 +1,81 @@
+"""
+Rota pública do feed RSS dos episódios publicados.
+Sem <enclosure> (os episódios não têm arquivo de áudio): serve leitores
+de RSS e integrações, não diretórios de podcast.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from app.core.compression import negotiate_encoding
+from app.core.etag import current_watermark, etag_matches, make_etag
+from app.core.feed import FEED_MEDIA_TYPE, feed_cache, http_date, iter_gunzip, render_feed_gzip
+from app.core.config import settings
+from app.core.query_budget import query_budget
+from app.crud.episode import PUBLISHED_SET
+from app.db.session import get_router_db, run_db
+
+router = APIRouter(tags=["feed"])
+
+# Session síncrona ou AsyncSession, conforme ASYNC_DB_ROUTERS
+get_feed_db = get_router_db("feed")
+
+
+def _not_modified_since(request: Request, last_modified: Optional[datetime]) -> bool:
+    """If-Modified-Since (só consultado sem If-None-Match, RFC 9110)."""
+    header = request.headers.get("if-modified-since")
+    if not header or last_modified is None or "if-none-match" in request.headers:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Datas HTTP têm resolução de segundos
+    return last_modified.replace(microsecond=0) <= since
+
+
+@router.get("/feed.xml", response_class=Response)
+@query_budget(2)
+async def podcast_feed(request: Request, db = Depends(get_feed_db)):
+    """
+    Feed RSS com os episódios publicados.
+    
+    Servido de bytes gzip pré-comprimidos, renderizados apenas quando o
+    conjunto publicado muda; clientes sem gzip recebem o corpo
+    descomprimido em streaming. Suporta ETag/If-None-Match e
+    Last-Modified/If-Modified-Since.
+    """
+    watermark = await current_watermark(db, PUBLISHED_SET)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), available=("gzip",))
+    etag = make_etag(PUBLISHED_SET, watermark, ("feed",))
+    if encoding:
+        etag = f'{etag[:-1]}-{encoding}"'
+    last_modified = http_date(watermark.updated_at)
+    
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": f"public, max-age={settings.FEED_CACHE_MAX_AGE}",
+    }
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    if etag_matches(request, etag) or _not_modified_since(request, watermark.updated_at):
+        return Response(status_code=304, headers=headers)
+    
+    body = feed_cache.get(watermark)
+    if body is None:
+        async with feed_cache.lock:
+            body = feed_cache.get(watermark)
+            if body is None:
+                body = await run_db(db, render_feed_gzip, watermark.updated_at)
+                feed_cache.store(watermark, body)
+    
+    if not encoding:
+        return StreamingResponse(iter_gunzip(body), media_type=FEED_MEDIA_TYPE, headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=FEED_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,45 @@
+"""
+Rotas internas de observabilidade.
+Estatísticas de caches, pools, rate limit e recursos do processo (requer autenticação).
+"""
+from fastapi import APIRouter, Depends
+from app.core.cache import response_caches
+from app.core.feed import feed_cache
+from app.core.rate_limit import rate_limiter
+from app.core.security import password_pool_stats
+from app.core.snapshots import links_snapshot
+from app.db.pool import pool_stats
+from app.db.session import replica_set
+from app.api.v1.auth import get_current_user
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/cache")
+def cache_stats(current_user = Depends(get_current_user)):
+    """Contadores de hit/miss/eviction dos caches de resposta."""
+    return {
+        "caches": [cache.stats() for cache in response_caches],
+        "snapshots": [links_snapshot.stats(), feed_cache.stats()],
+    }
+
+
+@router.get("/auth")
+def auth_stats(current_user = Depends(get_current_user)):
+    """Fila e tempo de espera do pool de verificação de senhas (login)."""
+    return password_pool_stats.snapshot()
+
+
+@router.get("/pool")
+def connection_pool_stats(current_user = Depends(get_current_user)):
+    """Conexões em uso, overflow, espera por conexão e timeouts de cada pool."""
+    return {
+        "pools": [stats.snapshot() for stats in pool_stats.values()],
+        "replicas": replica_set.stats(),
+    }
+
+
+@router.get("/rate-limit")
+def rate_limit_stats(current_user = Depends(get_current_user)):
+    """Regras ativas, requisições rejeitadas (429) e baldes em memória."""
+    return rate_limiter.stats() if rate_limiter else {"enabled": False}
@@ -2,21 +2,52 @@
 Rotas públicas de links oficiais.
 Listagem de links das redes sociais e plataformas do Metocast.
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
 from typing import List
-from app.db.session import get_db
+from app.core.cache import cache_key
+from app.core.compression import negotiate_encoding
+from app.core.etag import current_watermark, etag_matches, make_etag, not_modified
+from app.core.query_budget import query_budget
+from app.core.snapshots import links_snapshot
+from app.db.session import get_router_db, run_db
 from app.schemas.schemas import OfficialLinkResponse
 from app.crud.link import get_links
 
 router = APIRouter(prefix="/links", tags=["links"])
 
+# Session síncrona ou AsyncSession, conforme ASYNC_DB_ROUTERS
+get_links_db = get_router_db("links")
+
 
 @router.get("", response_model=List[OfficialLinkResponse])
-def list_official_links(db: Session = Depends(get_db)):
+@query_budget(2)
+async def list_official_links(request: Request, db = Depends(get_links_db)):
     """
     Lista todos os links oficiais do projeto.
     Ordenados pelo campo 'order'.
+    
+    Servido de um snapshot em memória (JSON + gzip/brotli) reconstruído
+    quando a versão da tabela muda. Suporta GET condicional.
     """
-    links = get_links(db)
-    return links
+    watermark = await current_watermark(db, "official_links")
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    etag = make_etag("official_links", watermark, cache_key(request))
+    if encoding:
+        # Cada codificação é uma representação distinta (ETag forte)
+        etag = f'{etag[:-1]}-{encoding}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    snapshot = links_snapshot.get(watermark)
+    if snapshot is None:
+        rows = await run_db(db, get_links)
+        snapshot = links_snapshot.rebuild(watermark, rows)
+    
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=snapshot.encoded(encoding),
+        media_type="application/json",
+        headers=headers
+    )
@@ -0,0 +1,23 @@
+"""
+Rota de métricas para o Prometheus.
+Sem autenticação JWT; se METRICS_TOKEN estiver definido, exige Bearer.
+"""
+import secrets
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from app.core.config import settings
+from app.core.metrics import metrics
+
+router = APIRouter(tags=["internal"])
+
+# O Response acrescenta "; charset=utf-8" sozinho em tipos text/*
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=Response, include_in_schema=False)
+def prometheus_metrics(request: Request):
+    """Métricas no formato texto do Prometheus."""
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+    return Response(content=metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
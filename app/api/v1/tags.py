@@ -0,0 +1,46 @@
+"""
+Rotas públicas de tags.
+Facetas: tags com a contagem de episódios publicados.
+"""
+from fastapi import APIRouter, Depends, Query, Request, Response
+from typing import List
+from app.core.cache import MISSING, cache_key, episodes_cache
+from app.core.etag import current_watermark, etag_matches, make_etag, not_modified
+from app.core.query_budget import query_budget
+from app.db.session import get_router_db, run_db
+from app.schemas.schemas import TagFacet
+from app.crud.tag import get_tag_facets
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+# Contagens mudam junto com episódios: mesma sessão e mesmo cache
+get_tags_db = get_router_db("episodes")
+
+
+@router.get("", response_model=List[TagFacet])
+@query_budget(2)
+async def list_tag_facets(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Limite de tags"),
+    db = Depends(get_tags_db)
+):
+    """
+    Lista tags com número de episódios publicados.
+    Contagens mantidas incrementalmente pelo CRUD (sem GROUP BY).
+    """
+    key = cache_key(request)
+    watermark = await current_watermark(db, "episodes")
+    etag = make_etag("episodes", watermark, key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    facets = episodes_cache.get((watermark.source, watermark.version, key))
+    if facets is MISSING:
+        generation = episodes_cache.generation
+        rows = await run_db(db, get_tag_facets, limit=limit)
+        facets = [TagFacet(name=row.name, count=row.published_count) for row in rows]
+        episodes_cache.set((watermark.source, watermark.version, key), facets, generation=generation)
+    
+    response.headers["ETag"] = etag
+    return facets
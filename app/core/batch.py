@@ -0,0 +1,89 @@
+"""
+Utilitários para endpoints em lote.
+Validação item a item, para reportar erros sem rejeitar o lote inteiro.
+"""
+import json
+from typing import Any, List, Tuple, Type
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from app.core.config import settings
+from app.schemas.schemas import BatchItemError
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Documentação do corpo para rotas que leem o corpo cru (JSON ou NDJSON)
+BATCH_OPENAPI_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+async def read_batch_items(request: Request) -> List[Any]:
+    """
+    Lê o corpo de uma rota em lote: array JSON ou NDJSON (um objeto por
+    linha, formato do export), conforme o Content-Type.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        items = []
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"JSON inválido na linha {line_number}"
+                )
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON inválido")
+        if not isinstance(items, list):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="O corpo deve ser um array"
+            )
+    check_batch_size(items)
+    return items
+
+
+def check_batch_size(items: List[Any]) -> None:
+    """Rejeita lotes acima de BATCH_MAX_ITEMS (413)."""
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Lote excede o máximo de {settings.BATCH_MAX_ITEMS} itens"
+        )
+
+
+def validate_items(
+    items: List[Any],
+    schema: Type[BaseModel]
+) -> Tuple[List[Tuple[int, BaseModel]], List[BatchItemError]]:
+    """
+    Valida cada item com `schema`.
+    
+    Returns:
+        (itens válidos como (posição, modelo), erros por posição)
+    """
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as exc:
+            errors.append(BatchItemError(
+                index=index,
+                detail=exc.errors(include_url=False, include_context=False, include_input=False)
+            ))
+    return valid, errors
@@ -0,0 +1,149 @@
+"""
+Cache em processo (TTL + LRU) para respostas dos endpoints públicos.
+
+As mutações do CRUD chamam `invalidate(tabela)` após o commit; cada cache
+registra um hook para a(s) tabela(s) da qual depende e é limpo na hora.
+O TTL limita a defasagem entre workers diferentes.
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, List
+from starlette.requests import Request
+from app.core.config import settings
+
+# Sentinela para diferenciar "não está no cache" de um valor None cacheado
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache LRU limitado com expiração por entrada.
+    
+    Thread-safe: rotas sync (threadpool) e async compartilham a instância.
+    Contadores de hit/miss/eviction ficam disponíveis em `stats()`.
+    """
+    
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrementada a cada clear(): um set() iniciado antes da
+        # invalidação não pode repovoar o cache com dado antigo
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def get(self, key: Hashable) -> Any:
+        """Retorna o valor cacheado ou MISSING."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, generation: int = None) -> None:
+        """
+        Armazena valor. Se `generation` for informada e o cache tiver sido
+        invalidado desde então, o valor é descartado.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove todas as entradas (hook de invalidação)."""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+            self.invalidations += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para observabilidade."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# ==================== Hooks de invalidação ====================
+
+_invalidation_hooks: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+
+
+def register_invalidation_hook(table: str, hook: Callable[[], None]) -> None:
+    """Registra função chamada sempre que `table` for alterada."""
+    _invalidation_hooks[table].append(hook)
+
+
+def invalidate(table: str) -> None:
+    """Dispara os hooks de `table`. Chamado pelo CRUD após o commit."""
+    for hook in _invalidation_hooks[table]:
+        hook()
+
+
+def cache_key(request: Request) -> tuple:
+    """Chave do cache: rota + query params (ordem irrelevante)."""
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+
+# ==================== Caches da aplicação ====================
+
+episodes_cache = TTLCache(
+    "episodes", settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+# Payloads de JWT já verificados, por hash do token
+token_cache = TTLCache(
+    "tokens", settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS
+)
+# Usuários autenticados, por (sub, token_version). TTL curto: é a janela
+# em que outro worker ainda aceita um admin revogado
+principal_cache = TTLCache(
+    "principals",
+    settings.AUTH_CACHE_MAX_ENTRIES if settings.AUTH_PRINCIPAL_TTL_SECONDS else 0,
+    settings.AUTH_PRINCIPAL_TTL_SECONDS
+)
+
+# Variantes comprimidas de respostas com ETag forte, por (ETag, codificação).
+# O ETag inclui a versão da tabela, então a variante acompanha a entrada
+# de episodes_cache de onde veio o corpo
+compressed_cache = TTLCache(
+    "compressed", settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+register_invalidation_hook("episodes", episodes_cache.clear)
+register_invalidation_hook("episodes", compressed_cache.clear)
+register_invalidation_hook("admin_users", principal_cache.clear)
+
+# Todos os caches, para o endpoint /internal/cache
+response_caches = [episodes_cache, compressed_cache, token_cache, principal_cache]
@@ -0,0 +1,162 @@
+"""
+Compressão de respostas: negociação de Accept-Encoding e codificadores.
+Brotli é opcional - sem o pacote `brotli`, apenas gzip é oferecido.
+
+CompressionMiddleware comprime respostas acima de COMPRESSION_MIN_SIZE.
+Respostas com ETag forte (as rotas públicas cacheadas) têm a variante
+comprimida guardada em `compressed_cache`, então uma página popular é
+comprimida uma vez por versão, e não a cada requisição.
+"""
+import gzip
+from typing import Iterable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.cache import MISSING, TTLCache
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Ordem de preferência do servidor quando o cliente aceita várias
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str],
+    available: Iterable[str] = SUPPORTED_ENCODINGS
+) -> Optional[str]:
+    """
+    Escolhe a codificação a partir do header Accept-Encoding.
+    
+    Respeita q-values (q=0 recusa) e o curinga `*`.
+    Retorna None quando a resposta deve ir sem compressão.
+    """
+    if not accept_encoding:
+        return None
+    
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Comprime `body` com gzip ou brotli (nível máximo por padrão)."""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9 if level is None else level, mtime=0)
+    if encoding == "br" and brotli:
+        return brotli.compress(body, quality=11 if level is None else level)
+    raise ValueError(f"Codificação não suportada: {encoding}")
+
+
+# Tipos de conteúdo que valem a pena comprimir
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/rss+xml",
+    "application/javascript",
+    "text/",
+)
+
+
+def _level_for(encoding: str) -> int:
+    if encoding == "br":
+        return settings.COMPRESSION_BROTLI_QUALITY
+    return settings.COMPRESSION_GZIP_LEVEL
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compressão gzip/brotli negociada por Accept-Encoding.
+    
+    Só atua em respostas de corpo único (streaming passa direto), de tipo
+    comprimível, sem Content-Encoding prévio e com ao menos `minimum_size`
+    bytes. O ETag forte vira fraco (W/), como a representação comprimida
+    exige; `etag_matches` já faz comparação fraca no If-None-Match.
+    
+    Quando o cliente aceita compressão, o W/ vale para toda resposta
+    (inclusive 304 e corpos pequenos demais para comprimir): o mesmo
+    recurso tem sempre o mesmo validador, comprimido ou não.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = None, variant_cache: TTLCache = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.variant_cache = variant_cache
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message: Optional[Message] = None
+        passthrough = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                _weaken_etag(headers)
+                await send(start_message)
+                await send(message)
+                return
+            
+            etag = headers.get("etag")
+            cacheable = self.variant_cache is not None and etag and not etag.startswith("W/")
+            compressed = self.variant_cache.get((etag, encoding)) if cacheable else MISSING
+            if compressed is MISSING:
+                compressed = compress(body, encoding, _level_for(encoding))
+                if cacheable:
+                    self.variant_cache.set((etag, encoding), compressed)
+            
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            _weaken_etag(headers)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+        
+        await self.app(scope, receive, send_wrapper)
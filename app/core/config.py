@@ -13,11 +13,46 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = None
     DATABASE_PUBLIC_URL: Optional[str] = None
     
+    # Routers que usam o engine assíncrono (asyncpg), separados por vírgula.
+    # Ex: "episodes,links". Vazio = todos usam Session síncrona.
+    ASYNC_DB_ROUTERS: str = "episodes,links"
+    
+    # Réplicas de leitura (URLs separadas por vírgula). Vazio = tudo no primário.
+    # Os routers públicos leem das réplicas; admin e auth usam o primário.
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_BALANCING: str = "round_robin"  # ou "least_connections"
+    REPLICA_EJECT_SECONDS: float = 30.0  # réplica com falha fica fora da rotação
+    # Após uma escrita admin, leituras do mesmo cliente vão ao primário
+    # por este tempo (cookie), para ver a própria escrita
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+    
+    # Pool de conexões (vale para cada engine, síncrono e assíncrono)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # segundos esperando conexão livre
+    DB_POOL_RECYCLE: int = 1800  # segundos; -1 desativa
+    DB_POOL_SLOW_WAIT_MS: float = 100.0  # espera contada como lenta em /internal/pool
+    # statement_timeout do PostgreSQL por conexão (0 = sem limite)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    
     # Security
     SECRET_KEY: str = "metocast-super-secret-key-2026"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Pool de processos para bcrypt (login) e limite da fila de espera;
+    # acima do limite o login responde 503 na hora
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    
+    # Cache de tokens decodificados e usuários autenticados. O de usuários
+    # tem TTL curto: `update_user` limpa só o cache do próprio worker, e nos
+    # demais um admin desativado ou revogado ainda passa por até
+    # AUTH_PRINCIPAL_TTL_SECONDS (0 desativa o cache de usuários)
+    AUTH_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    AUTH_PRINCIPAL_TTL_SECONDS: float = 5.0
+    
     # API
     API_V1_PREFIX: str = "/api"
     ADMIN_API_PREFIX: str = "/api/admin"
@@ -25,6 +60,79 @@ class Settings(BaseSettings):
     # CORS - adicione URLs de produção do frontend
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8080,http://localhost:5173,https://lysk-dot.github.io,https://metocast.vercel.app"
     
+    # Cache de respostas públicas (em processo, TTL + LRU)
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048  # 0 desativa o cache
+    
+    # Compressão de respostas (gzip/brotli via Accept-Encoding)
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; respostas menores vão sem compressão
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    
+    # Busca de episódios: "auto" (PostgreSQL usa tsvector, outros bancos
+    # usam índice em processo), "postgres" ou "memory"
+    SEARCH_BACKEND: str = "auto"
+    # Profundidade da busca: skip + limit não passa disso, então só os N
+    # resultados mais relevantes são alcançáveis e o ORDER BY ts_rank ...
+    # LIMIT vira um top-N com memória limitada
+    SEARCH_MAX_RESULTS: int = 1000
+    
+    # Máximo de itens por requisição nos endpoints em lote (:batch)
+    BATCH_MAX_ITEMS: int = 5000
+    
+    # Linhas lidas por vez do cursor no servidor durante o export NDJSON
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Linhas validadas e enviadas por COPY a cada lote no import em massa
+    IMPORT_BATCH_SIZE: int = 10000
+    
+    # Caminho rápido de serialização: ORJSONResponse + TypeAdapters
+    # pré-compilados, sem revalidar dados vindos do banco
+    FAST_JSON: bool = False
+    
+    # Quanto tempo a versão das tabelas (ETag) é reaproveitada sem ir ao banco
+    WATERMARK_TTL_SECONDS: float = 1.0
+    
+    # Queries acima deste tempo vão para o log app.sql.slow (0 desativa)
+    SLOW_QUERY_MS: float = 200.0
+    # Orçamento de queries por requisição: "off", "log" ou "raise" (testes)
+    QUERY_BUDGET_MODE: str = "log"
+    QUERY_BUDGET_DEFAULT: int = 0  # rotas sem @query_budget (0 = sem limite)
+    NPLUSONE_THRESHOLD: int = 10  # mesma query repetida N vezes em uma requisição
+    
+    # Intervalo da conferência dos totais por status contra COUNT(*)
+    # (X-Total-Count); roda também na subida. 0 desativa. Com vários
+    # workers, um advisory lock garante que só um confere por vez
+    EPISODE_COUNT_RECONCILE_SECONDS: int = 3600
+    
+    # Rate limiting por IP e rota (token bucket): "N/second|minute|hour|day",
+    # vazio desativa a regra. Com RATE_LIMIT_REDIS_URL o limite é somado
+    # entre workers (requer o pacote redis)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_PUBLIC: str = "300/minute"
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # baldes em memória por worker
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    # Proxies (IPs/CIDRs, separados por vírgula) cujo X-Forwarded-For é
+    # aceito para achar o IP do cliente; vazio usa o IP da conexão
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""
+    
+    # Token Bearer exigido em GET /metrics (vazio = aberto, ex.: rede interna)
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Feed RSS do podcast (GET /api/feed.xml)
+    FEED_TITLE: str = "Metocast"
+    FEED_DESCRIPTION: str = "Podcast sobre metodologia científica"
+    FEED_LINK: str = "https://metocast.com"
+    FEED_IMAGE_URL: Optional[str] = None
+    FEED_LANGUAGE: str = "pt-br"
+    FEED_AUTHOR: str = "Metocast"
+    FEED_OWNER_EMAIL: Optional[str] = None
+    FEED_CATEGORY: str = "Education"
+    FEED_EXPLICIT: bool = False
+    FEED_MAX_EPISODES: int = 0  # 0 = todos os publicados
+    FEED_CACHE_MAX_AGE: int = 300  # Cache-Control para diretórios/proxies
+    
     # App
     PROJECT_NAME: str = "Metocast Hub API"
     VERSION: str = "1.0.0"
@@ -45,6 +153,16 @@ class Settings(BaseSettings):
         """Converte string de origins em lista"""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
     
+    @property
+    def async_db_routers_list(self) -> List[str]:
+        """Converte string de routers assíncronos em lista"""
+        return [name.strip() for name in self.ASYNC_DB_ROUTERS.split(",") if name.strip()]
+    
+    @property
+    def replica_urls_list(self) -> List[str]:
+        """Converte string de URLs de réplicas em lista"""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,99 @@
+"""
+ETags e GET condicional para os endpoints públicos.
+
+O ETag deriva da marca d'água (TableVersion) da tabela de origem e da
+chave da requisição. A marca d'água é memorizada por poucos segundos em
+processo, então um `If-None-Match` válido vira 304 sem consultar linhas
+nem serializar nada.
+
+Com réplicas, a marca d'água é memorizada por origem (primário ou nome
+da réplica, ver `data_source`) e lida na mesma sessão que lê as linhas:
+uma réplica atrasada nunca usa a versão vista no primário ou em outra
+réplica. A versão vai junto com a origem em `Watermark.source`, e os
+caches indexados por versão usam o par (origem, versão).
+"""
+import hashlib
+import threading
+import time
+from functools import partial
+from typing import Dict, Optional, Tuple
+from fastapi import Request, Response
+from app.core.cache import register_invalidation_hook
+from app.core.config import settings
+from app.crud.episode import PUBLISHED_SET
+from app.crud.watermark import Watermark, get_table_watermark
+from app.db.replicas import data_source
+from app.db.session import run_db
+
+
+class WatermarkMemo:
+    """Memoriza marcas d'água por (origem, tabela) durante `ttl_seconds`."""
+    
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._data: Dict[Tuple[str, str], Tuple[float, Watermark]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, source: str, table: str) -> Optional[Watermark]:
+        with self._lock:
+            entry = self._data.get((source, table))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def set(self, source: str, table: str, watermark: Watermark) -> None:
+        with self._lock:
+            self._data[(source, table)] = (time.monotonic() + self.ttl_seconds, watermark)
+    
+    def drop(self, table: str) -> None:
+        """Hook de invalidação: escrita local relê a versão na hora (todas as origens)."""
+        with self._lock:
+            for key in [key for key in self._data if key[1] == table]:
+                del self._data[key]
+
+
+watermarks = WatermarkMemo(settings.WATERMARK_TTL_SECONDS)
+
+for _table in ("episodes", "official_links", PUBLISHED_SET):
+    register_invalidation_hook(_table, partial(watermarks.drop, _table))
+
+
+async def current_watermark(db, table: str) -> Watermark:
+    """
+    Marca d'água da tabela na origem da sessão `db` (memorizada por
+    origem; senão, lookup por PK na própria sessão).
+    """
+    source = data_source(db)
+    watermark = watermarks.get(source, table)
+    if watermark is None:
+        watermark = (await run_db(db, get_table_watermark, table))._replace(source=source)
+        watermarks.set(source, table, watermark)
+    return watermark
+
+
+def make_etag(table: str, watermark: Watermark, key: tuple) -> str:
+    """
+    ETag forte: tabela + versão + hash da chave (rota e query params).
+    
+    A origem não entra no ETag: a mesma versão tem as mesmas linhas no
+    primário e em qualquer réplica (a versão é commitada na transação da
+    mutação), então o 304 continua valendo quando o cliente troca de réplica.
+    """
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f'"{table}-{watermark.version}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Compara If-None-Match com o ETag atual (comparação fraca, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """Resposta 304 sem corpo."""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,42 @@
+"""
+Export do catálogo em NDJSON (um episódio JSON por linha).
+
+Cada linha tem exatamente os campos de EpisodeCreate. O catálogo inteiro
+é reimportado pelo importador em massa (`python import_catalog.py
+episodes episodes.ndjson`: stream + COPY); POST /api/admin/episodes:batch
+aceita o mesmo formato, mas bufferiza o corpo e recusa (413) lotes acima
+de BATCH_MAX_ITEMS - serve só para trechos do arquivo.
+"""
+from typing import Iterator
+from pydantic import TypeAdapter
+from app.core.batch import NDJSON_MEDIA_TYPE
+from app.core.config import settings
+from app.crud.episode import iter_episodes_for_export
+from app.db.session import SessionLocal
+from app.schemas.schemas import EpisodeCreate
+
+_FIELDS = tuple(EpisodeCreate.model_fields)
+_episode_create_adapter = TypeAdapter(EpisodeCreate)
+
+
+def iter_episodes_ndjson(batch_size: int = None) -> Iterator[bytes]:
+    """
+    Gera o export em blocos de bytes (um bloco por lote do cursor).
+    
+    Abre a própria sessão: o gerador é consumido depois que a rota
+    retorna, quando a sessão da dependência já foi fechada.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        chunk = []
+        for row in iter_episodes_for_export(db, batch_size):
+            episode = EpisodeCreate.model_construct(**dict(zip(_FIELDS, row)))
+            chunk.append(_episode_create_adapter.dump_json(episode))
+            if len(chunk) >= batch_size:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+    finally:
+        db.close()
@@ -0,0 +1,172 @@
+"""
+Feed RSS dos episódios publicados, servido em GET /api/feed.xml.
+
+Os episódios não têm arquivo de áudio, então os itens não levam
+<enclosure> e o feed não é aceito por diretórios de podcast (Apple
+Podcasts, Spotify): é um RSS 2.0 comum, com metadados itunes:* e links
+para Spotify/YouTube, para leitores de RSS e integrações.
+
+O documento é renderizado em streaming: cada episódio vira um fragmento
+XML que vai direto para um compressor gzip, então apenas os bytes já
+comprimidos ficam em memória. Clientes sem gzip recebem o mesmo corpo
+descomprimido em pedaços (iter_gunzip), sem montar o XML inteiro de novo.
+O resultado é guardado por versão de
+PUBLISHED_SET (e por origem, com réplicas), que só muda quando o conjunto publicado muda - os
+diretórios de podcast podem consultar à vontade sem renderizar de novo.
+"""
+import asyncio
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+from sqlalchemy.orm import Session
+from app.core.cache import register_invalidation_hook
+from app.core.config import settings
+from app.crud.episode import PUBLISHED_SET, iter_published_episodes
+from app.crud.watermark import Watermark
+from app.db.replicas import PRIMARY_SOURCE
+
+FEED_MEDIA_TYPE = "application/rss+xml; charset=utf-8"
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+
+# wbits=31: deflate com cabeçalho gzip
+_GZIP_WBITS = 31
+
+# Tamanho máximo de cada pedaço descomprimido enviado a clientes sem gzip
+GUNZIP_CHUNK_SIZE = 64 * 1024
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """Data no formato RFC 2822/HTTP (GMT). Datas sem fuso são UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _element(name: str, value: Optional[str]) -> str:
+    return f"<{name}>{escape(value)}</{name}>" if value else ""
+
+
+def _channel_header(last_build: Optional[datetime]) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<rss version="2.0" xmlns:itunes={quoteattr(ITUNES_NS)}>\n<channel>\n',
+        _element("title", settings.FEED_TITLE),
+        _element("link", settings.FEED_LINK),
+        _element("description", settings.FEED_DESCRIPTION),
+        _element("language", settings.FEED_LANGUAGE),
+        _element("lastBuildDate", http_date(last_build)),
+        _element("itunes:author", settings.FEED_AUTHOR),
+        _element("itunes:summary", settings.FEED_DESCRIPTION),
+        f"<itunes:category text={quoteattr(settings.FEED_CATEGORY)}/>",
+        _element("itunes:explicit", "true" if settings.FEED_EXPLICIT else "false"),
+    ]
+    if settings.FEED_IMAGE_URL:
+        parts.append(f"<itunes:image href={quoteattr(settings.FEED_IMAGE_URL)}/>")
+    if settings.FEED_OWNER_EMAIL:
+        parts.append(
+            "<itunes:owner>"
+            + _element("itunes:name", settings.FEED_AUTHOR)
+            + _element("itunes:email", settings.FEED_OWNER_EMAIL)
+            + "</itunes:owner>"
+        )
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _item(episode) -> str:
+    """
+    Fragmento <item> de um episódio. O modelo não tem arquivo de áudio,
+    então não há <enclosure>; o link aponta para Spotify ou YouTube.
+    """
+    link = episode.spotify_url or episode.youtube_url
+    parts = [
+        "<item>",
+        _element("title", episode.title),
+        _element("link", link),
+        _element("description", episode.description),
+        _element("itunes:summary", episode.description),
+        f'<guid isPermaLink="false">metocast-episode-{episode.id}</guid>',
+        _element("pubDate", http_date(episode.published_at)),
+        _element("itunes:keywords", episode.tags),
+    ]
+    if episode.cover_image_url:
+        parts.append(f"<itunes:image href={quoteattr(episode.cover_image_url)}/>")
+    parts.append("</item>\n")
+    return "".join(parts)
+
+
+def iter_feed_xml(episodes: Iterable, last_build: Optional[datetime]) -> Iterator[str]:
+    """Gera o documento RSS em fragmentos (cabeçalho, um por episódio, rodapé)."""
+    yield _channel_header(last_build)
+    for episode in episodes:
+        yield _item(episode)
+    yield "</channel>\n</rss>\n"
+
+
+def render_feed_gzip(db: Session, last_build: Optional[datetime]) -> bytes:
+    """Renderiza o feed direto para gzip, lendo episódios em lotes."""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, _GZIP_WBITS)
+    episodes = iter_published_episodes(db, limit=settings.FEED_MAX_EPISODES or None)
+    chunks = [compressor.compress(part.encode()) for part in iter_feed_xml(episodes, last_build)]
+    chunks.append(compressor.flush())
+    return b"".join(chunks)
+
+
+def iter_gunzip(body: bytes, chunk_size: int = GUNZIP_CHUNK_SIZE) -> Iterator[bytes]:
+    """Descomprime o feed em pedaços de até `chunk_size` bytes."""
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    data = body
+    while data:
+        chunk = decompressor.decompress(data, chunk_size)
+        if chunk:
+            yield chunk
+        data = decompressor.unconsumed_tail
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+class FeedCache:
+    """Feed comprimido da versão vigente de PUBLISHED_SET, por origem."""
+    
+    def __init__(self):
+        # origem (primário ou réplica) -> (versão, corpo gzip)
+        self.entries: Dict[str, Tuple[int, bytes]] = {}
+        self.rebuilds = 0
+        # Uma renderização por vez: requisições simultâneas esperam o resultado
+        self.lock = asyncio.Lock()
+    
+    def get(self, watermark: Watermark) -> Optional[bytes]:
+        entry = self.entries.get(watermark.source)
+        if entry is not None and entry[0] == watermark.version:
+            return entry[1]
+        return None
+    
+    def store(self, watermark: Watermark, body: bytes) -> None:
+        self.entries[watermark.source] = (watermark.version, body)
+        self.rebuilds += 1
+    
+    def clear(self) -> None:
+        self.entries = {}
+    
+    def stats(self) -> dict:
+        entries = dict(self.entries)
+        version, body = entries.get(PRIMARY_SOURCE) or next(iter(entries.values()), (None, None))
+        return {
+            "name": "feed",
+            "version": version,
+            "bytes": len(body) if body else 0,
+            "variants": {"gzip": len(body)} if body else {},
+            "versions": {source: entry[0] for source, entry in entries.items()},
+            "rebuilds": self.rebuilds,
+        }
+
+
+feed_cache = FeedCache()
+
+register_invalidation_hook(PUBLISHED_SET, feed_cache.clear)
@@ -0,0 +1,238 @@
+"""
+Importador em massa de episódios e links (NDJSON ou CSV).
+
+O arquivo é lido como stream e validado em lotes com os schemas de
+criação (EpisodeCreate / OfficialLinkCreate). No PostgreSQL cada lote
+vai por COPY FROM STDIN para uma tabela temporária; no final, um único
+INSERT ... SELECT faz o upsert na tabela real, as tags e os totais por
+status são recalculados e a versão da tabela é incrementada - tudo na
+mesma transação.
+
+Registros com `id` fazem upsert por id (migração de outro CMS); sem `id`
+viram linhas novas. Em outros bancos (desenvolvimento), cada lote passa
+pelo caminho em lote do CRUD e `id` é ignorado.
+"""
+import csv
+import io
+import json
+import time
+from enum import Enum
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.cache import invalidate
+from app.core.config import settings
+from app.crud.episode import commit_episode_change, create_episodes_bulk
+from app.crud.episode_count import recount_episodes
+from app.crud.link import create_links_bulk
+from app.crud.tag import rebuild_tag_index
+from app.crud.watermark import bump_table_version
+from app.models.models import Episode, OfficialLink
+from app.schemas.schemas import EpisodeCreate, OfficialLinkCreate
+
+# tipo -> (modelo, schema de validação, caminho em lote sem COPY)
+IMPORT_KINDS = {
+    "episodes": (Episode, EpisodeCreate, create_episodes_bulk),
+    "links": (OfficialLink, OfficialLinkCreate, create_links_bulk),
+}
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+
+class ImportReport(NamedTuple):
+    """Resultado do import: linhas carregadas, erros (linha, detalhe) e duração."""
+    rows: int
+    errors: List[Tuple[int, Any]]
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Lê registros (número da linha, dict) de um arquivo NDJSON ou CSV.
+    Linhas NDJSON com JSON inválido são devolvidas como ValueError.
+    Em CSV, células vazias são omitidas (o schema aplica o padrão do campo).
+    """
+    if fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+    elif fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, {key: value for key, value in record.items() if value not in ("", None)}
+    else:
+        raise ValueError(f"Formato desconhecido: {fmt}")
+
+
+def _batched(records: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_value(value: Any) -> Any:
+    """Converte um valor para a representação de COPY ... (FORMAT csv)."""
+    if value is None:
+        return ""  # Vazio sem aspas = NULL
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _staging_table(model) -> str:
+    return f"_import_{model.__tablename__}"
+
+
+def _quote(columns: Iterable[str]) -> str:
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def _create_staging(db: Session, model) -> None:
+    staging = _staging_table(model)
+    db.execute(text(f"CREATE TEMP TABLE {staging} (LIKE {model.__tablename__}) ON COMMIT DROP"))
+    db.execute(text(f"ALTER TABLE {staging} ALTER COLUMN id DROP NOT NULL"))
+
+
+def _copy_batch(db: Session, model, fields: Tuple[str, ...], rows: List[Tuple[Optional[int], Any]]) -> None:
+    """Envia um lote validado para a tabela temporária via COPY FROM STDIN."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row_id, item in rows:
+        writer.writerow([_csv_value(row_id), *(_csv_value(getattr(item, field)) for field in fields)])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_staging_table(model)} (id, {_quote(fields)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _upsert_from_staging(db: Session, model, fields: Tuple[str, ...]) -> None:
+    """
+    Move a tabela temporária para a real.
+    Linhas com id fazem upsert (a última ocorrência no arquivo vence) e
+    a sequence é ajustada antes de inserir as linhas sem id.
+    """
+    table = model.__tablename__
+    staging = _staging_table(model)
+    columns = _quote(fields)
+    updates = ", ".join(f'"{field}" = EXCLUDED."{field}"' for field in fields)
+    db.execute(text(f"""
+        INSERT INTO {table} (id, {columns})
+        SELECT DISTINCT ON (id) id, {columns} FROM {staging}
+        WHERE id IS NOT NULL
+        ORDER BY id, ctid DESC
+        ON CONFLICT (id) DO UPDATE SET {updates}, updated_at = now()
+    """))
+    db.execute(text(f"""
+        SELECT setval(
+            pg_get_serial_sequence('{table}', 'id'),
+            coalesce((SELECT max(id) FROM {table}), 1)
+        )
+    """))
+    db.execute(text(f"""
+        INSERT INTO {table} ({columns})
+        SELECT {columns} FROM {staging}
+        WHERE id IS NULL
+    """))
+    db.execute(text(f"ANALYZE {table}"))
+
+
+def import_records(
+    db: Session,
+    kind: str,
+    records: Iterable[Tuple[int, Any]],
+    batch_size: int = None,
+    progress: Callable[[int, int, float], None] = None
+) -> ImportReport:
+    """
+    Valida e carrega registros (número da linha, dict) de `kind`
+    ("episodes" ou "links").
+    
+    `progress(linhas carregadas, erros, segundos)` é chamado a cada lote.
+    Registros inválidos são pulados e reportados em ImportReport.errors.
+    """
+    model, schema, bulk_create = IMPORT_KINDS[kind]
+    fields = tuple(schema.model_fields)
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    
+    started = time.perf_counter()
+    loaded = 0
+    errors = []
+    if use_copy:
+        _create_staging(db, model)
+    
+    for batch in _batched(records, batch_size):
+        valid = []
+        for line_number, record in batch:
+            if isinstance(record, Exception):
+                errors.append((line_number, "JSON inválido"))
+                continue
+            try:
+                item = schema.model_validate(record)
+                row_id = record.get("id")
+                valid.append((int(row_id) if row_id is not None else None, item))
+            except ValidationError as exc:
+                errors.append((line_number, exc.errors(
+                    include_url=False, include_context=False, include_input=False
+                )))
+            except (TypeError, ValueError):
+                errors.append((line_number, "id inválido"))
+        
+        if valid:
+            if use_copy:
+                _copy_batch(db, model, fields, valid)
+            else:
+                bulk_create(db, [item for _, item in valid])
+            loaded += len(valid)
+        if progress:
+            progress(loaded, len(errors), time.perf_counter() - started)
+    
+    if use_copy:
+        if not loaded:
+            db.commit()
+        elif model is Episode:
+            _upsert_from_staging(db, model, fields)
+            rebuild_tag_index(db)
+            recount_episodes(db)
+            commit_episode_change(db, published_changed=True)
+        else:
+            _upsert_from_staging(db, model, fields)
+            bump_table_version(db, model.__tablename__)
+            db.commit()
+            invalidate(model.__tablename__)
+    
+    return ImportReport(loaded, errors, time.perf_counter() - started)
+
+
+def import_file(
+    db: Session,
+    kind: str,
+    stream: TextIO,
+    fmt: str,
+    batch_size: int = None,
+    progress: Callable[[int, int, float], None] = None
+) -> ImportReport:
+    """Atalho: `import_records` sobre `read_records(stream, fmt)`."""
+    return import_records(db, kind, read_records(stream, fmt), batch_size, progress)
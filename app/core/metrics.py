@@ -0,0 +1,262 @@
+"""
+Métricas no formato texto do Prometheus (GET /metrics).
+
+- http_request_duration_seconds: histograma por método, rota e status
+- http_requests_in_flight: requisições em andamento
+- http_request_db_queries / http_request_db_seconds: número de queries e
+  tempo total de banco por requisição, medidos pelos eventos de cursor
+  compartilhados (app.db.query_events)
+- db_pool_*: estado dos pools (app.db.pool)
+- password_pool_*: fila, rejeições e espera na fila do pool de senhas
+  (app.core.security)
+
+Caminho quente sem locks: cada thread escreve no próprio shard (dict de
+séries) e a coleta soma os shards. A rota é o template (`/api/episodes/{id}`),
+não o path, para manter a cardinalidade limitada.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.security import password_pool_stats
+from app.db.pool import pool_stats
+from app.db.query_events import register_query_hook
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# [queries, segundos] da requisição atual; o mesmo objeto é visto pelas
+# threads do threadpool (o contexto é copiado, a lista é compartilhada)
+request_db_stats: ContextVar[Optional[List]] = ContextVar("request_db_stats", default=None)
+
+
+class _Histogram:
+    """Contagens por bucket (não cumulativas), soma e total."""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Shard:
+    """Séries escritas por uma única thread."""
+    
+    __slots__ = ("latency", "db_queries", "db_seconds", "in_flight", "queries", "query_seconds")
+    
+    def __init__(self):
+        self.latency: Dict[tuple, _Histogram] = {}
+        self.db_queries: Dict[str, _Histogram] = {}
+        self.db_seconds: Dict[str, _Histogram] = {}
+        self.in_flight = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+class MetricsRegistry:
+    """Shards por thread + renderização no formato do Prometheus."""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()  # só no primeiro uso de cada thread
+    
+    def shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+    
+    def observe_request(self, method: str, route: str, status: int, seconds: float, db: Optional[List]) -> None:
+        shard = self.shard()
+        key = (method, route, status)
+        histogram = shard.latency.get(key)
+        if histogram is None:
+            histogram = shard.latency[key] = _Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        if db is not None:
+            for series, buckets, value in (
+                (shard.db_queries, DB_QUERY_BUCKETS, db[0]),
+                (shard.db_seconds, DB_SECONDS_BUCKETS, db[1]),
+            ):
+                histogram = series.get(route)
+                if histogram is None:
+                    histogram = series[route] = _Histogram(buckets)
+                histogram.observe(value)
+    
+    def _merge(self, attr: str) -> Dict[tuple, _Histogram]:
+        merged: Dict = {}
+        for shard in list(self._shards):
+            for key, histogram in list(getattr(shard, attr).items()):
+                total = merged.get(key)
+                if total is None:
+                    total = merged[key] = _Histogram(histogram.buckets)
+                total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+                total.sum += histogram.sum
+                total.count += histogram.count
+        return merged
+    
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus (0.0.4)."""
+        lines = []
+        shards = list(self._shards)
+        
+        lines += _histogram_lines(
+            "http_request_duration_seconds", "Latência das requisições HTTP.",
+            ("method", "route", "status"), self._merge("latency")
+        )
+        lines += [
+            "# HELP http_requests_in_flight Requisições HTTP em andamento.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {sum(shard.in_flight for shard in shards)}",
+        ]
+        lines += _histogram_lines(
+            "http_request_db_queries", "Queries SQL por requisição.",
+            ("route",), {(route,): h for route, h in self._merge("db_queries").items()}
+        )
+        lines += _histogram_lines(
+            "http_request_db_seconds", "Tempo total de banco por requisição.",
+            ("route",), {(route,): h for route, h in self._merge("db_seconds").items()}
+        )
+        lines += [
+            "# HELP db_queries_total Queries SQL executadas.",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {sum(shard.queries for shard in shards)}",
+            "# HELP db_query_seconds_total Tempo total gasto em queries SQL.",
+            "# TYPE db_query_seconds_total counter",
+            f"db_query_seconds_total {sum(shard.query_seconds for shard in shards):.6f}",
+        ]
+        lines += _pool_lines()
+        lines += _password_pool_lines()
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _histogram_lines(name: str, help_text: str, label_names: Tuple[str, ...], series: Dict) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for key in sorted(series, key=str):
+        histogram = series[key]
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+            cumulative += count
+            le = f'le="{bound}"'
+            lines.append(f"{name}_bucket{_labels(label_names, key, le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, key)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_labels(label_names, key)} {histogram.count}")
+    return lines
+
+
+def _pool_lines() -> List[str]:
+    gauges = (
+        ("db_pool_checked_out", "checked_out", "Conexões em uso."),
+        ("db_pool_overflow_in_use", "overflow_in_use", "Conexões de overflow em uso."),
+        ("db_pool_wait_ms_max", "wait_ms_max", "Maior espera por conexão (ms)."),
+        ("db_pool_checkout_errors", "checkout_errors", "Timeouts ao obter conexão."),
+    )
+    snapshots = [stats.snapshot() for stats in pool_stats.values()]
+    lines = []
+    for metric, field, help_text in gauges:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [
+            f'{metric}{{pool="{snapshot["name"]}"}} {snapshot[field]}'
+            for snapshot in snapshots if field in snapshot
+        ]
+    return lines
+
+
+def _password_pool_lines() -> List[str]:
+    snapshot = password_pool_stats.snapshot()
+    series = (
+        ("password_pool_pending", "gauge", "pending", "Operações de senha na fila ou em execução."),
+        ("password_pool_completed_total", "counter", "completed", "Operações de senha concluídas."),
+        ("password_pool_rejected_total", "counter", "rejected", "Operações recusadas com a fila cheia."),
+        ("password_pool_queue_wait_seconds_total", "counter", "queue_wait_seconds_total",
+         "Tempo total de espera na fila do pool de senhas."),
+        ("password_pool_queue_wait_seconds_max", "gauge", "queue_wait_seconds_max",
+         "Maior espera na fila do pool de senhas."),
+    )
+    lines = []
+    for metric, kind, field, help_text in series:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}", f"{metric} {snapshot[field]}"]
+    return lines
+
+
+metrics = MetricsRegistry()
+
+
+# ==================== Tempo de banco por requisição ====================
+
+def _record_query(statement: str, parameters, elapsed: float) -> None:
+    """Hook de query (app.db.query_events): soma no shard e na requisição."""
+    shard = metrics.shard()
+    shard.queries += 1
+    shard.query_seconds += elapsed
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+
+register_query_hook(_record_query)
+
+
+# ==================== Middleware ====================
+
+class MetricsMiddleware:
+    """Mede latência, status e banco de cada requisição HTTP."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        shard = metrics.shard()
+        shard.in_flight += 1
+        db_stats = [0, 0.0]
+        token = request_db_stats.set(db_stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_db_stats.reset(token)
+            shard.in_flight -= 1
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"], route.path if route is not None else "unmatched",
+                status_code, elapsed, db_stats
+            )
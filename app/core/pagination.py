@@ -0,0 +1,72 @@
+"""
+Paginação por cursor (keyset) para listagens de episódios.
+O cursor é opaco para o cliente: base64 de (published_at, id) do último item.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, Query, status
+from starlette.datastructures import URL
+
+# (published_at, id) do último item da página anterior.
+# Internamente, (None, None) é o início da cauda de published_at NULL
+Cursor = Tuple[Optional[datetime], Optional[int]]
+
+
+class InvalidCursorError(ValueError):
+    """Cursor malformado ou adulterado."""
+
+
+def encode_cursor(published_at: Optional[datetime], episode_id: int) -> str:
+    """Gera cursor opaco a partir da chave de ordenação do último item."""
+    raw = json.dumps([published_at.isoformat() if published_at else None, episode_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decodifica cursor opaco.
+    
+    Raises:
+        InvalidCursorError: se o cursor não puder ser interpretado
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, episode_id = json.loads(base64.urlsafe_b64decode(padded))
+        if published_at is not None:
+            published_at = datetime.fromisoformat(published_at)
+        return published_at, int(episode_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+
+def cursor_param(
+    cursor: Optional[str] = Query(
+        None, description="Cursor opaco da próxima página (substitui skip)"
+    )
+) -> Optional[Cursor]:
+    """Dependency que decodifica o parâmetro `cursor` da query string."""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+
+def next_cursor_for(episodes: list, limit: int) -> Optional[str]:
+    """Cursor da próxima página, ou None se esta é a última."""
+    if len(episodes) < limit:
+        return None
+    last = episodes[-1]
+    return encode_cursor(last.published_at, last.id)
+
+
+def next_page_link(url: URL, cursor: str) -> str:
+    """Monta header Link (RFC 8288) apontando para a próxima página."""
+    next_url = url.remove_query_params("skip").include_query_params(cursor=cursor)
+    return f'<{next_url}>; rel="next"'
@@ -0,0 +1,176 @@
+"""
+Log de queries lentas e orçamento de queries por requisição.
+
+- Queries acima de SLOW_QUERY_MS vão para o logger `app.sql.slow`, com os
+  parâmetros trocados pelos tipos (nunca valores: senhas, e-mails).
+- QueryBudgetMiddleware conta as queries de cada requisição e compara com
+  o orçamento da rota (`@query_budget(n)`, ou QUERY_BUDGET_DEFAULT) e com
+  NPLUSONE_THRESHOLD (mesma query repetida = provável N+1).
+- QUERY_BUDGET_MODE: "off", "log" (produção) ou "raise" (testes: a
+  violação vira QueryBudgetExceeded e falha o teste).
+- `count_queries()` / `assert_num_queries(n)` contam as queries do
+  processo inteiro enquanto o bloco roda - inclusive as feitas pelo
+  TestClient em outra thread.
+"""
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.db.query_events import register_query_hook
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+budget_logger = logging.getLogger("app.sql.budget")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Requisição excedeu o orçamento de queries (QUERY_BUDGET_MODE=raise)."""
+
+
+class QueryCounter:
+    """Queries executadas: total, tempo e repetições por statement."""
+    
+    __slots__ = ("count", "seconds", "statements")
+    
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+    
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.statements[statement] += 1
+    
+    def most_repeated(self) -> Tuple[Optional[str], int]:
+        """Statement mais repetido e quantas vezes rodou."""
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+
+_request_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+# Contadores de count_queries() ativos (tupla: troca atômica, leitura sem lock)
+_process_counters: Tuple[QueryCounter, ...] = ()
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Substitui valores de parâmetros pelos nomes dos tipos."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: só o formato da primeira linha e o total
+            return [redact_parameters(parameters[0]), f"... {len(parameters)} linhas"]
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+# ==================== Hook de query ====================
+
+def _record_query(statement: str, parameters: Any, elapsed: float) -> None:
+    """Hook de query (app.db.query_events): log de lentas e contadores."""
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Query lenta (%.1f ms): %s | parâmetros: %s",
+            elapsed * 1000, statement, redact_parameters(parameters)
+        )
+    counter = _request_counter.get()
+    if counter is not None:
+        counter.record(statement, elapsed)
+    for counter in _process_counters:
+        counter.record(statement, elapsed)
+
+
+register_query_hook(_record_query)
+
+
+# ==================== Orçamento por rota ====================
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Define o máximo de queries de uma rota.
+    
+    Uso (abaixo do decorator da rota):
+        @router.get("")
+        @query_budget(2)
+        async def list_published_episodes(...):
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+
+def check_request_budget(route_path: str, budget: int, counter: QueryCounter) -> None:
+    """Registra (ou levanta, no modo raise) violações de orçamento e N+1."""
+    problems = []
+    if budget and counter.count > budget:
+        problems.append(f"{counter.count} queries (orçamento {budget})")
+    statement, repeats = counter.most_repeated()
+    if settings.NPLUSONE_THRESHOLD and repeats >= settings.NPLUSONE_THRESHOLD:
+        problems.append(f"possível N+1: statement repetido {repeats}x: {statement}")
+    if not problems:
+        return
+    message = f"{route_path}: " + "; ".join(problems)
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    budget_logger.warning(message)
+
+
+class QueryBudgetMiddleware:
+    """Conta as queries de cada requisição e aplica o orçamento da rota."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.QUERY_BUDGET_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+        
+        counter = QueryCounter()
+        token = _request_counter.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_counter.reset(token)
+        
+        route = scope.get("route")
+        if route is None:
+            return
+        budget = getattr(route.endpoint, "__query_budget__", settings.QUERY_BUDGET_DEFAULT)
+        check_request_budget(route.path, budget, counter)
+
+
+# ==================== Helpers para testes ====================
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Conta todas as queries do processo enquanto o bloco roda.
+    
+        with count_queries() as queries:
+            client.get("/api/episodes")
+        assert queries.count == 1
+    """
+    global _process_counters
+    counter = QueryCounter()
+    _process_counters = _process_counters + (counter,)
+    try:
+        yield counter
+    finally:
+        _process_counters = tuple(c for c in _process_counters if c is not counter)
+
+
+@contextmanager
+def assert_num_queries(expected: int) -> Iterator[QueryCounter]:
+    """Falha (AssertionError) se o bloco não executar exatamente `expected` queries."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count != expected:
+        statements = "\n".join(f"  {n}x {s}" for s, n in counter.statements.items())
+        raise AssertionError(f"Esperadas {expected} queries, executadas {counter.count}:\n{statements}")
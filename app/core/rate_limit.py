@@ -0,0 +1,385 @@
+"""
+Rate limiting por token bucket, por IP e por rota.
+
+Cada regra (login, episodes, links, ...) tem um balde por IP: capacidade
+igual ao limite da janela e reposição contínua (limite / período). O
+login protege o bcrypt de credential stuffing; as rotas públicas, o banco
+de scrapers.
+
+Backends:
+- MemoryBuckets (padrão): OrderedDict em processo, O(1) por checagem,
+  com despejo preguiçoso de baldes ociosos (já cheios de novo) e teto de
+  RATE_LIMIT_MAX_KEYS chaves. Cada worker do uvicorn tem seus baldes.
+- RedisBuckets (RATE_LIMIT_REDIS_URL): o balde vive no Redis e é
+  atualizado por um script Lua atômico, então todos os workers somam no
+  mesmo limite. Requer o pacote `redis`; se o Redis falhar, a checagem
+  cai para os baldes em memória em vez de derrubar a requisição.
+
+As respostas levam RateLimit-Limit / RateLimit-Remaining /
+RateLimit-Reset / RateLimit-Policy; o 429 leva também Retry-After.
+Atrás de proxy, RATE_LIMIT_TRUSTED_PROXIES (IPs/CIDRs) diz de quais
+conexões o X-Forwarded-For é aceito; o balde é do salto mais à direita
+que não é um proxy confiável. As entradas à esquerda dele vêm do próprio
+cliente e são ignoradas, então um X-Forwarded-For forjado não troca o
+balde. Vazio (padrão), vale o IP da conexão.
+"""
+import ipaddress
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - depende do ambiente
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class RateLimitRule(NamedTuple):
+    """Regra: métodos + prefixo de caminho, com `limit` requisições por `period` segundos."""
+    name: str
+    methods: Tuple[str, ...]
+    path: str
+    limit: int
+    period: float
+    
+    @property
+    def refill_rate(self) -> float:
+        """Tokens repostos por segundo."""
+        return self.limit / self.period
+    
+    def matches(self, method: str, path: str) -> bool:
+        """Rota coberta pela regra (o próprio prefixo ou subcaminhos)."""
+        return method in self.methods and (
+            path == self.path or path.startswith(self.path + "/")
+        )
+
+
+class Decision(NamedTuple):
+    """Resultado de uma checagem."""
+    allowed: bool
+    remaining: int
+    retry_after: float  # segundos até haver 1 token (0 se permitido)
+    reset: float  # segundos até o balde encher de novo
+
+
+def parse_rate(spec: str) -> Optional[Tuple[int, float]]:
+    """
+    Converte "10/minute" em (10, 60.0). Aceita second, minute, hour e day.
+    Vazio ou "0" desativa a regra (None).
+    """
+    spec = (spec or "").strip()
+    if not spec or spec == "0":
+        return None
+    count, _, unit = spec.partition("/")
+    period = PERIODS.get(unit.strip().rstrip("s") or "second")
+    if period is None:
+        raise ValueError(f"Período inválido em '{spec}': use second, minute, hour ou day")
+    limit = int(count)
+    return (limit, period) if limit > 0 else None
+
+
+def default_rules() -> List[RateLimitRule]:
+    """Regras a partir de RATE_LIMIT_LOGIN e RATE_LIMIT_PUBLIC."""
+    api = settings.API_V1_PREFIX
+    reads = ("GET", "HEAD")
+    specs = [
+        ("login", ("POST",), f"{api}/auth/login", settings.RATE_LIMIT_LOGIN),
+        ("episodes", reads, f"{api}/episodes", settings.RATE_LIMIT_PUBLIC),
+        ("links", reads, f"{api}/links", settings.RATE_LIMIT_PUBLIC),
+        ("tags", reads, f"{api}/tags", settings.RATE_LIMIT_PUBLIC),
+        ("feed", reads, f"{api}/feed.xml", settings.RATE_LIMIT_PUBLIC),
+    ]
+    rules = []
+    for name, methods, path, spec in specs:
+        rate = parse_rate(spec)
+        if rate:
+            rules.append(RateLimitRule(name, methods, path, *rate))
+    return rules
+
+
+def _decide(rule: RateLimitRule, tokens: float, allowed: bool) -> Decision:
+    """Monta a Decision a partir dos tokens que sobraram no balde."""
+    rate = rule.refill_rate
+    return Decision(
+        allowed=allowed,
+        remaining=int(tokens),
+        retry_after=0.0 if allowed else (1 - tokens) / rate,
+        reset=(rule.limit - tokens) / rate
+    )
+
+
+class MemoryBuckets:
+    """
+    Baldes em processo: chave -> [tokens, último acesso, ocioso a partir de].
+    
+    Um OrderedDict por regra, em ordem de acesso (move_to_end). Dentro de
+    uma regra todos os baldes enchem em no máximo `period` segundos, então
+    o da frente (acesso mais antigo) é o primeiro a ficar garantidamente
+    cheio: cada checagem olha no máximo duas entradas da frente da regra
+    e descarta as que já encheram (equivalem a um balde novo). Com uma
+    única fila, uma regra lenta (login) na frente travaria o despejo das
+    demais. Sem varredura periódica.
+    Usado só no event loop, então dispensa lock.
+    """
+    
+    EVICT_PER_CHECK = 2
+    
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.buckets: "Dict[str, OrderedDict[str, list]]" = {}
+        self.size = 0
+        self.evicted = 0
+    
+    def take(self, rule: RateLimitRule, key: str, now: Optional[float] = None) -> Decision:
+        """Consome um token do balde `key` (se houver)."""
+        now = time.monotonic() if now is None else now
+        buckets = self.buckets.get(rule.name)
+        if buckets is None:
+            buckets = self.buckets[rule.name] = OrderedDict()
+        self._evict_idle(buckets, now)
+        
+        state = buckets.get(key)
+        if state is None:
+            tokens = float(rule.limit)
+            if self.size >= self.max_keys:
+                self._evict_oldest(buckets)
+            self.size += 1
+        else:
+            tokens = min(rule.limit, state[0] + (now - state[1]) * rule.refill_rate)
+            buckets.move_to_end(key)
+        
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Após `idle_at` o balde estaria cheio: pode ser descartado
+        idle_at = now + (rule.limit - tokens) / rule.refill_rate
+        if state is None:
+            buckets[key] = [tokens, now, idle_at]
+        else:
+            state[0], state[1], state[2] = tokens, now, idle_at
+        return _decide(rule, tokens, allowed)
+    
+    def _evict_idle(self, buckets: "OrderedDict[str, list]", now: float) -> None:
+        """Descarta da frente da regra os baldes que já encheram de novo."""
+        for _ in range(self.EVICT_PER_CHECK):
+            if not buckets:
+                return
+            key, state = next(iter(buckets.items()))
+            if state[2] > now:
+                return
+            del buckets[key]
+            self.size -= 1
+            self.evicted += 1
+    
+    def _evict_oldest(self, buckets: "OrderedDict[str, list]") -> None:
+        """Limite de chaves atingido: despeja o acesso mais antigo (da regra, se houver)."""
+        if not buckets:
+            buckets = max(self.buckets.values(), key=len)
+        buckets.popitem(last=False)
+        self.size -= 1
+        self.evicted += 1
+    
+    def stats(self) -> dict:
+        """Chaves vivas (total e por regra) e despejadas."""
+        return {
+            "keys": self.size,
+            "max_keys": self.max_keys,
+            "evicted": self.evicted,
+            "by_rule": {name: len(buckets) for name, buckets in self.buckets.items()},
+        }
+
+
+# KEYS[1] = balde; ARGV = capacidade, tokens/s. Relógio do próprio Redis
+# (TIME), igual para todos os workers. Retorna {permitido, tokens}.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBuckets:
+    """
+    Baldes compartilhados no Redis (limite combinado entre workers).
+    O TTL de cada chave é o tempo até encher: o próprio Redis despeja os
+    ociosos. Em erro de Redis, usa `fallback` (baldes locais).
+    """
+    
+    def __init__(self, url: str, fallback: MemoryBuckets, prefix: str = "metocast:rl:"):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL exige o pacote 'redis' (pip install redis)")
+        self.client = redis_asyncio.from_url(url)
+        self.script = self.client.register_script(_TOKEN_BUCKET_LUA)
+        self.fallback = fallback
+        self.prefix = prefix
+        self.errors = 0
+    
+    async def take(self, rule: RateLimitRule, key: str) -> Decision:
+        """Consome um token no Redis; se ele falhar, no balde local."""
+        try:
+            allowed, tokens = await self.script(
+                keys=[self.prefix + key], args=[rule.limit, rule.refill_rate]
+            )
+        except Exception:
+            self.errors += 1
+            if self.errors == 1 or self.errors % 1000 == 0:
+                logger.warning("Rate limit: Redis indisponível, usando baldes locais", exc_info=True)
+            return self.fallback.take(rule, key)
+        return _decide(rule, float(tokens), bool(int(allowed)))
+    
+    def stats(self) -> dict:
+        """Erros de Redis + estado dos baldes locais de reserva."""
+        return {"backend": "redis", "errors": self.errors, "fallback": self.fallback.stats()}
+
+
+class RateLimiter:
+    """Regras + backend; `check` decide uma requisição."""
+    
+    def __init__(self, rules: List[RateLimitRule], redis_url: Optional[str] = None, max_keys: int = 100_000):
+        self.rules = rules
+        self.memory = MemoryBuckets(max_keys)
+        self.redis = RedisBuckets(redis_url, self.memory) if redis_url else None
+        self.rejected = 0
+    
+    def rule_for(self, method: str, path: str) -> Optional[RateLimitRule]:
+        """Primeira regra que cobre a rota (None = sem limite)."""
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+    
+    async def check(self, rule: RateLimitRule, client: str) -> Decision:
+        """Consome um token do balde (regra, IP)."""
+        key = f"{rule.name}:{client}"
+        if self.redis is not None:
+            decision = await self.redis.take(rule, key)
+        else:
+            decision = self.memory.take(rule, key)
+        if not decision.allowed:
+            self.rejected += 1
+        return decision
+    
+    def stats(self) -> dict:
+        """Regras ativas, rejeições e estado do backend."""
+        backend = self.redis.stats() if self.redis else {"backend": "memory", **self.memory.stats()}
+        return {
+            "rules": {rule.name: f"{rule.limit}/{rule.period:g}s" for rule in self.rules},
+            "rejected": self.rejected,
+            **backend,
+        }
+
+
+def parse_networks(spec: str) -> Tuple[Network, ...]:
+    """"10.0.0.1, 10.1.0.0/16" -> redes (IP sozinho vira /32 ou /128)."""
+    return tuple(ipaddress.ip_network(item.strip(), strict=False) for item in spec.split(",") if item.strip())
+
+
+def _is_trusted(host: str, networks: Sequence[Network]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def client_ip(scope: Scope, trusted_proxies: Sequence[Network] = ()) -> str:
+    """
+    IP que identifica o balde. Se a conexão vem de um proxy confiável, é o
+    salto mais à direita do X-Forwarded-For que não é proxy confiável;
+    senão (ou sem proxies configurados), o IP da conexão.
+    """
+    client = scope.get("client")
+    host = client[0] if client else "unknown"
+    if not trusted_proxies or not _is_trusted(host, trusted_proxies):
+        return host
+    forwarded = ",".join(
+        value.decode("latin-1") for name, value in scope["headers"] if name == b"x-forwarded-for"
+    )
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted_proxies):
+            return hop
+    return hops[0] if hops else host
+
+
+def rate_limit_headers(rule: RateLimitRule, decision: Decision) -> dict:
+    """Headers RateLimit-* (draft IETF) e, no 429, Retry-After."""
+    headers = {
+        "RateLimit-Limit": str(rule.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(math.ceil(decision.reset)),
+        "RateLimit-Policy": f"{rule.limit};w={rule.period:g}",
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return headers
+
+
+class RateLimitMiddleware:
+    """
+    Aplica o RateLimiter antes do roteamento: requisições acima do limite
+    recebem 429 sem tocar no banco nem no bcrypt.
+    """
+    
+    def __init__(self, app: ASGIApp, limiter: RateLimiter, trusted_proxies: Sequence[Network] = ()):
+        self.app = app
+        self.limiter = limiter
+        self.trusted_proxies = tuple(trusted_proxies)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        rule = None
+        if scope["type"] == "http":
+            rule = self.limiter.rule_for(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+        
+        decision = await self.limiter.check(rule, client_ip(scope, self.trusted_proxies))
+        headers = rate_limit_headers(rule, decision)
+        
+        if not decision.allowed:
+            response = JSONResponse(
+                {"detail": "Muitas requisições. Tente novamente em instantes."},
+                status_code=429,
+                headers=headers
+            )
+            await response(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"]).update(headers)
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+
+# Instância da aplicação (None com RATE_LIMIT_ENABLED=false)
+rate_limiter = RateLimiter(
+    default_rules(), settings.RATE_LIMIT_REDIS_URL, settings.RATE_LIMIT_MAX_KEYS
+) if settings.RATE_LIMIT_ENABLED else None
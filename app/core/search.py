@@ -0,0 +1,88 @@
+"""
+Índice invertido em processo para busca de episódios.
+
+Fallback da busca full-text do PostgreSQL (coluna `search_vector` +
+GIN) para execução local e testes (ex: SQLite). Imita o comportamento
+de `websearch_to_tsquery` + `ts_rank`: todos os termos precisam aparecer
+e o ranking pondera título (A), tags (B) e descrição (C) com os pesos
+padrão do ts_rank. Não tem stemming, stopwords nem a sintaxe de
+websearch ("frase", -termo, or) da configuração `portuguese`; os
+resultados podem diferir dos de produção.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+# Pesos padrão do ts_rank para A, B e C
+TITLE_WEIGHT = 1.0
+TAGS_WEIGHT = 0.4
+DESCRIPTION_WEIGHT = 0.2
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Minúsculas, sem acentos, quebrando em palavras."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(folded)
+
+
+class InvertedIndex:
+    """
+    Índice termo -> {episode_id: score}, reconstruído por versão da tabela.
+    Leitores sempre veem um índice completo (troca por atribuição).
+    """
+    
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._lock = threading.Lock()
+    
+    def build(self, rows: Iterable, version: int) -> None:
+        """Indexa linhas com id, title, tags e description."""
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for row in rows:
+            fields = (
+                (row.title, TITLE_WEIGHT),
+                ((row.tags or "").replace(",", " "), TAGS_WEIGHT),
+                (row.description, DESCRIPTION_WEIGHT),
+            )
+            for text, weight in fields:
+                for term in tokenize(text):
+                    scores = postings[term]
+                    scores[row.id] = scores.get(row.id, 0.0) + weight
+        with self._lock:
+            self._postings = dict(postings)
+            self.version = version
+    
+    def search(self, query: str, skip: int = 0, limit: int = 100) -> List[int]:
+        """
+        IDs que contêm todos os termos, por score DESC e id DESC.
+        Só os `skip + limit` primeiros são ordenados (heap), como o top-N
+        do PostgreSQL.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        postings = self._postings
+        matches = [postings.get(term, {}) for term in terms]
+        matches.sort(key=len)
+        candidates = set(matches[0])
+        for scores in matches[1:]:
+            candidates &= scores.keys()
+        ranked = heapq.nlargest(
+            skip + limit,
+            candidates,
+            key=lambda episode_id: (sum(scores[episode_id] for scores in matches), episode_id),
+        )
+        return ranked[skip:]
+
+
+# Índice do processo (usado quando o banco não é PostgreSQL)
+search_index = InvertedIndex()
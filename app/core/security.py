@@ -1,10 +1,17 @@
 """
 Funções de segurança: hash de senhas e JWT tokens.
 """
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import MISSING, token_cache
 from app.core.config import settings
 
 # Contexto para hash de senhas usando bcrypt
@@ -21,6 +28,150 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# ==================== Pool de processos para bcrypt ====================
+# bcrypt custa ~250 ms de CPU: rodar no threadpool do servidor deixa uma
+# rajada de logins travar as rotas públicas. As rotas usam as versões
+# async abaixo, que enviam o trabalho a um pool de processos limitado e
+# recusam na hora quando a fila passa de PASSWORD_HASH_MAX_PENDING.
+#
+# Os processos do pool saem de um forkserver (spawn onde não existe), não
+# de fork do servidor: com threads rodando, um fork copiaria locks presos
+# por outras threads para o filho.
+
+
+class PasswordPoolBusyError(Exception):
+    """Fila do pool de senhas cheia - a requisição deve falhar rápido."""
+
+
+class PasswordPoolStats:
+    """Métricas do pool: fila atual, rejeições e tempo de espera na fila."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_seconds_total": round(self.wait_seconds_total, 6),
+                "queue_wait_seconds_max": round(self.wait_seconds_max, 6),
+                "queue_wait_seconds_avg": round(
+                    self.wait_seconds_total / self.completed, 6
+                ) if self.completed else 0.0,
+            }
+
+
+password_pool_stats = PasswordPoolStats()
+_password_pool: Optional[ProcessPoolExecutor] = None
+_password_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    """Contexto forkserver (spawn onde não há forkserver, ex.: Windows)."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Filhos já nascem com passlib/bcrypt importados
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    """Pool de senhas; criado na subida da aplicação (ou no primeiro uso, em scripts)."""
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is None:
+            _password_pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, mp_context=_pool_context()
+            )
+        return _password_pool
+
+
+def start_password_pool() -> None:
+    """
+    Cria o pool e já sobe os processos (evento de startup da aplicação):
+    o primeiro login não paga a partida dos filhos na espera da fila.
+    """
+    pool = _get_password_pool()
+    for _ in range(settings.PASSWORD_HASH_WORKERS):
+        pool.submit(time.time)
+
+
+def shutdown_password_pool() -> None:
+    """Encerra o pool de processos (evento de shutdown da aplicação)."""
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is not None:
+            _password_pool.shutdown(wait=False, cancel_futures=True)
+            _password_pool = None
+
+
+def _timed_verify(plain_password: str, hashed_password: str):
+    """Executado no processo filho: devolve (resultado, instante de início)."""
+    started_at = time.time()
+    return verify_password(plain_password, hashed_password), started_at
+
+
+def _timed_hash(password: str):
+    """Executado no processo filho: devolve (hash, instante de início)."""
+    started_at = time.time()
+    return get_password_hash(password), started_at
+
+
+async def _run_in_password_pool(func, *args):
+    """Admissão + envio ao pool, registrando o tempo de espera na fila."""
+    stats = password_pool_stats
+    with stats._lock:
+        if stats.pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            stats.rejected += 1
+            raise PasswordPoolBusyError("Fila de verificação de senha cheia")
+        stats.pending += 1
+    
+    submitted_at = time.time()
+    try:
+        loop = asyncio.get_running_loop()
+        result, started_at = await loop.run_in_executor(_get_password_pool(), func, *args)
+    finally:
+        with stats._lock:
+            stats.pending -= 1
+    
+    wait = max(0.0, started_at - submitted_at)
+    with stats._lock:
+        stats.completed += 1
+        stats.wait_seconds_total += wait
+        stats.wait_seconds_max = max(stats.wait_seconds_max, wait)
+    return result
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password no pool de processos.
+    
+    Raises:
+        PasswordPoolBusyError: se a fila estiver cheia
+    """
+    return await _run_in_password_pool(_timed_verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash no pool de processos.
+    
+    Raises:
+        PasswordPoolBusyError: se a fila estiver cheia
+    """
+    return await _run_in_password_pool(_timed_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Cria um JWT token.
@@ -60,3 +211,21 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def decode_access_token_cached(token: str) -> Optional[dict]:
+    """
+    Decodifica JWT memorizando o resultado pelo hash do token.
+    
+    Requisições repetidas com o mesmo token pulam a verificação HMAC;
+    a expiração (`exp`) continua sendo conferida a cada uso.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is MISSING:
+        payload = decode_access_token(token)
+        token_cache.set(key, payload)
+    
+    if payload is not None and payload.get("exp", 0) < time.time():
+        return None
+    return payload
@@ -0,0 +1,118 @@
+"""
+Caminho rápido de serialização (opt-in via FAST_JSON).
+
+Sem ele, o FastAPI valida cada objeto ORM no response_model, converte
+para dict com jsonable_encoder e só então roda o json da stdlib. Aqui:
+
+- TypeAdapters pré-compilados serializam listas direto para bytes;
+- linhas vindas do banco viram modelos com `model_construct`, sem
+  revalidar dados que o próprio schema do banco já garante;
+- ORJSONResponse é a classe de resposta padrão da aplicação.
+
+Listas com `?fields=` (sparse fieldsets) sempre usam este caminho, com
+um modelo de projeção por conjunto de campos.
+"""
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Type
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from app.schemas.schemas import EpisodeInDB, EpisodeSummary
+
+# Compilados uma vez na importação - reutilizados em todas as requisições
+episode_adapter = TypeAdapter(EpisodeInDB)
+episode_list_adapter = TypeAdapter(List[EpisodeInDB])
+
+_EPISODE_FIELDS = tuple(EpisodeInDB.model_fields)
+
+
+def episode_from_db(row) -> EpisodeInDB:
+    """Constrói EpisodeInDB a partir do ORM sem validação."""
+    return EpisodeInDB.model_construct(**{field: getattr(row, field) for field in _EPISODE_FIELDS})
+
+
+def episodes_from_db(rows: Iterable) -> List[EpisodeInDB]:
+    """Versão em lista de `episode_from_db`."""
+    return [episode_from_db(row) for row in rows]
+
+
+class JSONBytesResponse(Response):
+    """Resposta cujo conteúdo já são os bytes JSON finais."""
+    media_type = "application/json"
+
+
+def render_episodes(episodes: List[EpisodeInDB], headers: dict = None) -> JSONBytesResponse:
+    """Serializa lista de episódios direto para bytes."""
+    return JSONBytesResponse(episode_list_adapter.dump_json(episodes), headers=headers)
+
+
+def render_episode(episode: EpisodeInDB, headers: dict = None) -> JSONBytesResponse:
+    """Serializa um episódio direto para bytes."""
+    return JSONBytesResponse(episode_adapter.dump_json(episode), headers=headers)
+
+
+# ==================== Sparse fieldsets ====================
+
+# Campos que `?fields=` aceita, na ordem canônica de saída
+EPISODE_FIELDS = tuple(EpisodeInDB.model_fields)
+
+# Atalho `?fields=summary`
+SUMMARY_FIELDS = tuple(EpisodeSummary.model_fields)
+
+
+def fields_param(
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a retornar, separados por vírgula (ex.: id,title,published_at), "
+                    "ou `summary`. Omitido = todos."
+    )
+) -> Optional[Tuple[str, ...]]:
+    """Dependency: valida `?fields=` e devolve os campos em ordem canônica."""
+    if not fields:
+        return None
+    requested = set()
+    for name in fields.split(","):
+        name = name.strip()
+        if name == "summary":
+            requested.update(SUMMARY_FIELDS)
+        elif name in EPISODE_FIELDS:
+            requested.add(name)
+        elif name:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campo inválido: {name}"
+            )
+    if not requested:
+        return None
+    return tuple(name for name in EPISODE_FIELDS if name in requested)
+
+
+@lru_cache(maxsize=128)
+def episode_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Modelo com apenas `fields` (EpisodeSummary para o conjunto summary)."""
+    if set(fields) == set(SUMMARY_FIELDS):
+        return EpisodeSummary
+    return create_model(
+        "EpisodeFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (EpisodeInDB.model_fields[name].annotation, None) for name in fields}
+    )
+
+
+@lru_cache(maxsize=128)
+def _projection_list_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(List[episode_projection(fields)])
+
+
+def project_episodes(rows: Iterable, fields: Tuple[str, ...]) -> List[BaseModel]:
+    """Projeções sem validação, lendo só os atributos pedidos."""
+    model = episode_projection(fields)
+    return [model.model_construct(**{name: getattr(row, name) for name in fields}) for row in rows]
+
+
+def render_projection(
+    episodes: List[BaseModel],
+    fields: Tuple[str, ...],
+    headers: dict = None
+) -> JSONBytesResponse:
+    """Serializa projeções direto para bytes."""
+    return JSONBytesResponse(_projection_list_adapter(fields).dump_json(episodes), headers=headers)
@@ -0,0 +1,78 @@
+"""
+Snapshots pré-serializados e pré-comprimidos de respostas pequenas.
+
+A lista de links oficiais quase nunca muda: os bytes JSON finais (e suas
+variantes gzip/brotli) são gerados uma vez por versão da tabela e
+servidos direto da memória. A troca do snapshot é uma única atribuição,
+então leitores nunca veem um snapshot pela metade.
+"""
+from typing import Dict, List, Optional, Type
+from pydantic import BaseModel, TypeAdapter
+from app.core.compression import SUPPORTED_ENCODINGS, compress
+from app.crud.watermark import Watermark
+from app.db.replicas import PRIMARY_SOURCE
+from app.schemas.schemas import OfficialLinkResponse
+
+
+class ResponseSnapshot:
+    """Corpo JSON imutável + variantes comprimidas de uma versão."""
+    
+    __slots__ = ("version", "body", "variants")
+    
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        self.body = body
+        self.variants: Dict[str, bytes] = {
+            encoding: compress(body, encoding) for encoding in SUPPORTED_ENCODINGS
+        }
+    
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """Bytes na codificação pedida (None = identidade)."""
+        if encoding is None:
+            return self.body
+        return self.variants[encoding]
+
+
+class SnapshotStore:
+    """
+    Guarda o snapshot vigente de cada origem (primário ou réplica) e o
+    reconstrói quando a versão lida nessa origem muda.
+    """
+    
+    def __init__(self, name: str, item_model: Type[BaseModel]):
+        self.name = name
+        self.adapter = TypeAdapter(List[item_model])
+        self.current: Dict[str, ResponseSnapshot] = {}
+        self.rebuilds = 0
+    
+    def get(self, watermark: Watermark) -> Optional[ResponseSnapshot]:
+        """Snapshot da versão pedida na origem da marca d'água, ou None."""
+        snapshot = self.current.get(watermark.source)
+        if snapshot is not None and snapshot.version == watermark.version:
+            return snapshot
+        return None
+    
+    def rebuild(self, watermark: Watermark, rows: List) -> ResponseSnapshot:
+        """Serializa `rows` e publica o novo snapshot da origem atomicamente."""
+        items = self.adapter.validate_python(rows, from_attributes=True)
+        snapshot = ResponseSnapshot(watermark.version, self.adapter.dump_json(items))
+        self.current[watermark.source] = snapshot
+        self.rebuilds += 1
+        return snapshot
+    
+    def stats(self) -> dict:
+        """Versão, tamanhos e número de reconstruções (snapshot do primário, se houver)."""
+        snapshots = dict(self.current)
+        snapshot = snapshots.get(PRIMARY_SOURCE) or next(iter(snapshots.values()), None)
+        return {
+            "name": self.name,
+            "version": snapshot.version if snapshot else None,
+            "bytes": len(snapshot.body) if snapshot else 0,
+            "variants": {k: len(v) for k, v in snapshot.variants.items()} if snapshot else {},
+            "versions": {source: item.version for source, item in snapshots.items()},
+            "rebuilds": self.rebuilds,
+        }
+
+
+# Snapshot de GET /api/links
+links_snapshot = SnapshotStore("links", OfficialLinkResponse)
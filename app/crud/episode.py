@@ -2,51 +2,267 @@
 Operações CRUD para Episode.
 Funções para criar, ler, atualizar e deletar episódios no banco.
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, insert, literal_column, tuple_, update
+from collections import Counter
+from sqlalchemy.orm import Session, load_only
+from typing import Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
+from app.core.cache import invalidate
+from app.core.config import settings
+from app.core.pagination import Cursor
+from app.core.search import search_index
+from app.crud.episode_count import (
+    add_episode_counts, get_episode_total, recount_episodes, status_deltas, try_reconcile_lock
+)
+from app.crud.tag import (
+    TagChange, episode_ids_with_tag, get_tag_published_count, parse_tags,
+    sync_episode_tags, sync_episode_tags_bulk
+)
+from app.crud.watermark import bump_table_version, get_table_watermark
 from app.models.models import Episode, EpisodeStatus
 from app.schemas.schemas import EpisodeCreate, EpisodeUpdate
 
+# Pseudo-tabela versionada em TableVersion: muda só quando o conjunto de
+# episódios publicados (ou o conteúdo de um deles) muda
+PUBLISHED_SET = "published_episodes"
+
 
 def get_episode(db: Session, episode_id: int) -> Optional[Episode]:
     """Busca episódio por ID."""
     return db.query(Episode).filter(Episode.id == episode_id).first()
 
 
-def get_episodes(
+def _get_episode_for_update(db: Session, episode_id: int) -> Optional[Episode]:
+    """
+    Busca o episódio com SELECT ... FOR UPDATE antes de uma mutação.
+    
+    Os deltas de tags e dos totais por status saem do estado lido aqui:
+    com a linha travada, duas edições/publicações simultâneas do mesmo
+    episódio não aplicam o mesmo delta duas vezes (a segunda espera o
+    commit da primeira e relê o estado já alterado).
+    """
+    return (
+        db.query(Episode)
+        .filter(Episode.id == episode_id)
+        .populate_existing()
+        .with_for_update()
+        .first()
+    )
+
+
+def episodes_query(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    status: Optional[EpisodeStatus] = None
-) -> List[Episode]:
+    status: Optional[EpisodeStatus] = None,
+    cursor: Optional[Cursor] = None,
+    tags: Optional[List[str]] = None,
+    fields: Optional[Sequence[str]] = None
+):
     """
-    Lista episódios com paginação e filtro opcional por status.
+    Monta (sem executar) a query de listagem de episódios.
+    
+    Ordem estável: published_at DESC (NULLs por último), id DESC -
+    a mesma dos índices ix_episodes_status_published_at_id e
+    ix_episodes_published_published_at_id.
     
     Args:
         db: Sessão do banco
-        skip: Quantos registros pular (para paginação)
+        skip: Quantos registros pular (paginação por offset, legado)
         limit: Limite de registros a retornar
         status: Filtro opcional por status
+        cursor: (published_at, id) do último item da página anterior;
+            quando informado, `skip` é ignorado (paginação keyset).
+            Cada fase tem um predicado que o índice resolve sozinho (Index
+            Cond): com published_at, só a comparação de linha; com
+            published_at None, a cauda de NULLs (`id < last_id`, ou a
+            cauda inteira se o id também for None). A passagem de uma fase
+            para a outra fica com `get_episodes`
+        tags: Filtra episódios que têm TODAS as tags informadas
+        fields: Carrega só estas colunas (+ id e published_at, usados na
+            ordenação/cursor); as demais nem saem do banco, e acessá-las
+            levanta erro em vez de disparar um SELECT por linha
     """
     query = db.query(Episode)
     
+    if fields:
+        columns = {"id", "published_at", *fields}
+        query = query.options(load_only(*(getattr(Episode, name) for name in columns), raiseload=True))
+    
     if status:
         query = query.filter(Episode.status == status)
     
-    return query.order_by(Episode.published_at.desc()).offset(skip).limit(limit).all()
+    for tag in tags or []:
+        query = query.filter(Episode.id.in_(episode_ids_with_tag(tag)))
+    
+    if cursor:
+        last_published_at, last_id = cursor
+        if last_published_at is None:
+            # Cauda de NULLs: só resta desempatar por id
+            query = query.filter(Episode.published_at.is_(None))
+            if last_id is not None:
+                query = query.filter(Episode.id < last_id)
+        else:
+            # Sem OR com IS NULL: a comparação de linha vira um único range no índice
+            query = query.filter(tuple_(Episode.published_at, Episode.id) < (last_published_at, last_id))
+        skip = 0
+    
+    return (
+        query
+        .order_by(Episode.published_at.desc().nullslast(), Episode.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def get_episodes(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[EpisodeStatus] = None,
+    cursor: Optional[Cursor] = None,
+    tags: Optional[List[str]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> List[Episode]:
+    """
+    Lista episódios com paginação e filtro opcional por status.
+    Parâmetros iguais aos de `episodes_query`.
+    
+    Se a página de um cursor com published_at acaba antes de `limit`, os
+    published_at não nulos terminaram: o restante vem da cauda de NULLs
+    numa segunda query (só nessa página de fronteira).
+    """
+    episodes = episodes_query(db, skip, limit, status, cursor, tags, fields).all()
+    if cursor and cursor[0] is not None and len(episodes) < limit:
+        episodes += episodes_query(db, 0, limit - len(episodes), status, (None, None), tags, fields).all()
+    return episodes
 
 
-def get_published_episodes(db: Session, skip: int = 0, limit: int = 100) -> List[Episode]:
+def get_published_episodes(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    tags: Optional[List[str]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> List[Episode]:
     """Lista apenas episódios publicados."""
-    return get_episodes(db, skip, limit, status=EpisodeStatus.PUBLISHED)
+    return get_episodes(
+        db, skip, limit, status=EpisodeStatus.PUBLISHED, cursor=cursor, tags=tags, fields=fields
+    )
+
+
+def count_published_episodes(db: Session, tags: Optional[List[str]] = None) -> Optional[int]:
+    """
+    Total de episódios publicados para a listagem, sem COUNT(*):
+    contador por status ou, filtrando por uma tag, `Tag.published_count`.
+    Com várias tags não há contador barato e retorna None.
+    """
+    if not tags:
+        return get_episode_total(db, EpisodeStatus.PUBLISHED)
+    if len(tags) == 1:
+        return get_tag_published_count(db, tags[0])
+    return None
+
+
+def iter_published_episodes(
+    db: Session,
+    limit: Optional[int] = None,
+    batch_size: int = 500
+) -> Iterator[Episode]:
+    """
+    Percorre os episódios publicados na ordem da listagem, em lotes de
+    `batch_size` (cursor no servidor). `limit=None` percorre todos.
+    """
+    return episodes_query(db, 0, limit, status=EpisodeStatus.PUBLISHED).yield_per(batch_size)
+
+
+# Configuração de texto usada na coluna gerada search_vector (migration 0005)
+SEARCH_TEXT_CONFIG = "portuguese"
+
+
+def _use_postgres_search(db: Session) -> bool:
+    """PostgreSQL usa tsvector/GIN; demais bancos, o índice em processo."""
+    if settings.SEARCH_BACKEND != "auto":
+        return settings.SEARCH_BACKEND == "postgres"
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_published_episodes(
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 100
+) -> List[Episode]:
+    """
+    Busca full-text em título, tags e descrição de episódios publicados.
+    Ordena por relevância (ts_rank) e id.
+    
+    A rota limita skip + limit a SEARCH_MAX_RESULTS: o ts_rank ainda roda
+    em cada linha que casa, mas a ordenação é um top-N (heap de
+    skip + limit linhas), não um sort de todos os resultados.
+    
+    Args:
+        db: Sessão do banco
+        query: Texto da busca (sintaxe de websearch_to_tsquery)
+        skip: Quantos resultados pular
+        limit: Limite de resultados
+    """
+    if _use_postgres_search(db):
+        # regconfig literal: asyncpg não converte bind de texto para regconfig
+        text_config = literal_column(f"'{SEARCH_TEXT_CONFIG}'::regconfig")
+        tsquery = func.websearch_to_tsquery(text_config, query)
+        search_vector = literal_column("episodes.search_vector")
+        return (
+            db.query(Episode)
+            .filter(Episode.status == EpisodeStatus.PUBLISHED, search_vector.op("@@")(tsquery))
+            .order_by(func.ts_rank(search_vector, tsquery).desc(), Episode.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
+    # Fallback: índice invertido reconstruído quando a tabela muda
+    watermark = get_table_watermark(db, Episode.__tablename__)
+    if search_index.version != watermark.version:
+        rows = db.query(
+            Episode.id, Episode.title, Episode.tags, Episode.description
+        ).filter(Episode.status == EpisodeStatus.PUBLISHED).all()
+        search_index.build(rows, watermark.version)
+    
+    ids = search_index.search(query, skip, limit)
+    if not ids:
+        return []
+    by_id = {episode.id: episode for episode in db.query(Episode).filter(Episode.id.in_(ids))}
+    return [by_id[episode_id] for episode_id in ids if episode_id in by_id]
+
+
+def commit_episode_change(db: Session, published_changed: bool) -> None:
+    """
+    Fecha uma mutação de episódios: incrementa a versão da tabela, faz
+    commit e invalida os caches. Se o conjunto publicado mudou (o que o
+    público e o feed RSS enxergam), incrementa também PUBLISHED_SET.
+    """
+    bump_table_version(db, Episode.__tablename__)
+    if published_changed:
+        bump_table_version(db, PUBLISHED_SET)
+    db.commit()
+    invalidate(Episode.__tablename__)
+    if published_changed:
+        invalidate(PUBLISHED_SET)
 
 
 def create_episode(db: Session, episode: EpisodeCreate) -> Episode:
     """Cria novo episódio."""
     db_episode = Episode(**episode.model_dump())
     db.add(db_episode)
-    db.commit()
+    db.flush()
+    sync_episode_tags(
+        db, db_episode.id, [], False,
+        parse_tags(db_episode.tags), db_episode.status == EpisodeStatus.PUBLISHED
+    )
+    add_episode_counts(db, status_deltas(None, db_episode.status))
+    commit_episode_change(db, published_changed=db_episode.status == EpisodeStatus.PUBLISHED)
     db.refresh(db_episode)
     return db_episode
 
@@ -60,43 +276,64 @@ def update_episode(
     Atualiza episódio existente.
     Apenas campos fornecidos são atualizados (exclude_unset=True).
     """
-    db_episode = get_episode(db, episode_id)
+    db_episode = _get_episode_for_update(db, episode_id)
     if not db_episode:
         return None
     
+    old_tags = parse_tags(db_episode.tags)
+    old_status = db_episode.status
+    old_published = old_status == EpisodeStatus.PUBLISHED
+    
     update_data = episode_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_episode, field, value)
     
-    db.commit()
+    new_published = db_episode.status == EpisodeStatus.PUBLISHED
+    sync_episode_tags(
+        db, db_episode.id, old_tags, old_published,
+        parse_tags(db_episode.tags), new_published
+    )
+    add_episode_counts(db, status_deltas(old_status, db_episode.status))
+    commit_episode_change(db, published_changed=old_published or new_published)
     db.refresh(db_episode)
     return db_episode
 
 
 def publish_episode(db: Session, episode_id: int) -> Optional[Episode]:
     """Publica um episódio (muda status para PUBLISHED)."""
-    db_episode = get_episode(db, episode_id)
+    db_episode = _get_episode_for_update(db, episode_id)
     if not db_episode:
         return None
     
+    old_status = db_episode.status
+    was_published = old_status == EpisodeStatus.PUBLISHED
     db_episode.status = EpisodeStatus.PUBLISHED
-    if not db_episode.published_at:
+    stamped = not db_episode.published_at
+    if stamped:
         db_episode.published_at = datetime.utcnow()
     
-    db.commit()
+    tags = parse_tags(db_episode.tags)
+    sync_episode_tags(db, db_episode.id, tags, was_published, tags, True)
+    add_episode_counts(db, status_deltas(old_status, EpisodeStatus.PUBLISHED))
+    commit_episode_change(db, published_changed=not was_published or stamped)
     db.refresh(db_episode)
     return db_episode
 
 
 def unpublish_episode(db: Session, episode_id: int) -> Optional[Episode]:
     """Despublica um episódio (muda status para DRAFT)."""
-    db_episode = get_episode(db, episode_id)
+    db_episode = _get_episode_for_update(db, episode_id)
     if not db_episode:
         return None
     
+    old_status = db_episode.status
+    was_published = old_status == EpisodeStatus.PUBLISHED
     db_episode.status = EpisodeStatus.DRAFT
     
-    db.commit()
+    tags = parse_tags(db_episode.tags)
+    sync_episode_tags(db, db_episode.id, tags, was_published, tags, False)
+    add_episode_counts(db, status_deltas(old_status, EpisodeStatus.DRAFT))
+    commit_episode_change(db, published_changed=was_published)
     db.refresh(db_episode)
     return db_episode
 
@@ -108,10 +345,118 @@ def delete_episode(db: Session, episode_id: int) -> bool:
     Returns:
         True se deletado, False se não encontrado
     """
-    db_episode = get_episode(db, episode_id)
+    db_episode = _get_episode_for_update(db, episode_id)
     if not db_episode:
         return False
     
+    was_published = db_episode.status == EpisodeStatus.PUBLISHED
+    sync_episode_tags(
+        db, db_episode.id,
+        parse_tags(db_episode.tags), was_published,
+        [], False
+    )
+    add_episode_counts(db, status_deltas(db_episode.status, None))
     db.delete(db_episode)
-    db.commit()
+    commit_episode_change(db, published_changed=was_published)
     return True
+
+
+def iter_episodes_for_export(db: Session, batch_size: int = 1000) -> Iterator:
+    """
+    Percorre todos os episódios por id, no formato de EpisodeCreate.
+    
+    `yield_per` usa cursor no servidor (stream_results): apenas `batch_size`
+    linhas ficam em memória, independente do tamanho da tabela.
+    """
+    columns = [getattr(Episode, field) for field in EpisodeCreate.model_fields]
+    return db.query(*columns).order_by(Episode.id).yield_per(batch_size)
+
+
+def create_episodes_bulk(db: Session, episodes: List[EpisodeCreate]) -> List[int]:
+    """
+    Cria vários episódios em uma única transação.
+    INSERT ... RETURNING em lote (executemany), um commit no final.
+    
+    Returns:
+        IDs criados, na mesma ordem de `episodes`
+    """
+    rows = [episode.model_dump() for episode in episodes]
+    result = db.execute(
+        insert(Episode).returning(Episode.id, sort_by_parameter_order=True),
+        rows
+    )
+    ids = list(result.scalars())
+    
+    changes = [
+        TagChange(episode_id, [], False, parse_tags(row["tags"]), row["status"] == EpisodeStatus.PUBLISHED)
+        for episode_id, row in zip(ids, rows)
+    ]
+    sync_episode_tags_bulk(db, changes)
+    add_episode_counts(db, Counter(EpisodeStatus(row["status"]) for row in rows))
+    commit_episode_change(db, published_changed=any(change.new_published for change in changes))
+    return ids
+
+
+def publish_episodes_bulk(db: Session, episode_ids: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    Publica vários episódios em uma única transação (um SELECT + um UPDATE).
+    published_at só é preenchido em quem ainda não tinha. IDs repetidos
+    contam uma vez (na ordem da primeira ocorrência).
+    
+    Returns:
+        (IDs publicados, IDs não encontrados), sem repetições
+    """
+    episode_ids = list(dict.fromkeys(episode_ids))
+    # Travadas em ordem de id (sem deadlock entre lotes que se sobrepõem)
+    rows = db.query(Episode.id, Episode.status, Episode.tags).filter(
+        Episode.id.in_(episode_ids)
+    ).order_by(Episode.id).with_for_update().all()
+    found = {row.id: row for row in rows}
+    missing = [episode_id for episode_id in episode_ids if episode_id not in found]
+    if not found:
+        return [], missing
+    
+    db.execute(
+        update(Episode)
+        .where(Episode.id.in_(list(found)))
+        .values(
+            status=EpisodeStatus.PUBLISHED,
+            published_at=func.coalesce(Episode.published_at, datetime.utcnow())
+        )
+    )
+    sync_episode_tags_bulk(db, [
+        TagChange(row.id, tags, row.status == EpisodeStatus.PUBLISHED, tags, True)
+        for row in rows
+        for tags in [parse_tags(row.tags)]
+    ])
+    newly_published = sum(row.status != EpisodeStatus.PUBLISHED for row in rows)
+    add_episode_counts(db, {
+        EpisodeStatus.DRAFT: -newly_published, EpisodeStatus.PUBLISHED: newly_published
+    })
+    commit_episode_change(db, published_changed=True)
+    return [episode_id for episode_id in episode_ids if episode_id in found], missing
+
+
+def reconcile_episode_counts(db: Session) -> Optional[dict]:
+    """
+    Confere os totais por status contra COUNT(*) e corrige divergências,
+    em uma transação com os contadores travados (ver `recount_episodes`).
+    Havendo correção, incrementa a versão de episodes para que totais
+    cacheados (X-Total-Count) sejam descartados.
+    
+    Com vários workers, só o que obtém o advisory lock reconcilia; os
+    outros retornam None sem tocar nos contadores.
+    
+    Returns:
+        Divergência corrigida por status (vazio se estava tudo certo),
+        ou None se outro worker está reconciliando
+    """
+    if not try_reconcile_lock(db):
+        db.rollback()
+        return None
+    drift = recount_episodes(db)
+    if drift:
+        commit_episode_change(db, published_changed=False)
+    else:
+        db.commit()
+    return drift
@@ -0,0 +1,105 @@
+"""
+Operações CRUD para EpisodeCount.
+Totais de episódios por status, mantidos por delta pelas mutações do
+CRUD de episódios e recalculados pela reconciliação.
+"""
+from collections import Counter
+from sqlalchemy import func, text, update
+from sqlalchemy.orm import Session
+from typing import Dict, Optional
+from app.models.models import Episode, EpisodeCount, EpisodeStatus
+
+# Chave do advisory lock da reconciliação (pg_try_advisory_xact_lock)
+RECONCILE_LOCK_KEY = 7_220_301
+
+
+def get_episode_total(db: Session, status: Optional[EpisodeStatus] = None) -> int:
+    """
+    Total de episódios com o status (None = todos).
+    Lê no máximo duas linhas: nunca varre a tabela de episódios.
+    """
+    query = db.query(func.coalesce(func.sum(EpisodeCount.total), 0))
+    if status is not None:
+        query = query.filter(EpisodeCount.status == EpisodeStatus(status).value)
+    return int(query.scalar())
+
+
+def add_episode_counts(db: Session, deltas: Dict[EpisodeStatus, int]) -> None:
+    """
+    Aplica deltas aos totais (ex.: {DRAFT: -1, PUBLISHED: +1}).
+    Deve rodar antes do commit, na mesma transação da mutação; um UPDATE
+    por status com delta diferente de zero.
+    """
+    for status, delta in deltas.items():
+        if not delta:
+            continue
+        status = EpisodeStatus(status).value
+        result = db.execute(
+            update(EpisodeCount)
+            .where(EpisodeCount.status == status)
+            .values(total=EpisodeCount.total + delta)
+        )
+        if result.rowcount == 0:
+            # Banco criado sem a migration 0007: a reconciliação acerta o valor
+            db.add(EpisodeCount(status=status, total=max(delta, 0)))
+            db.flush()
+
+
+def status_deltas(old_status, new_status) -> Counter:
+    """Deltas de uma mudança de status (None = episódio inexistente)."""
+    deltas = Counter()
+    if old_status == new_status:
+        return deltas
+    if old_status is not None:
+        deltas[EpisodeStatus(old_status)] -= 1
+    if new_status is not None:
+        deltas[EpisodeStatus(new_status)] += 1
+    return deltas
+
+
+def recount_episodes(db: Session) -> Dict[str, int]:
+    """
+    Recalcula os totais com COUNT(*) ... GROUP BY status e corrige os
+    que divergem. Não faz commit.
+    
+    As linhas de contador são travadas (SELECT ... FOR UPDATE) antes da
+    contagem: uma mutação concorrente ou já aplicou seu delta e commitou
+    (o COUNT a enxerga), ou espera o fim desta transação para aplicá-lo
+    sobre o valor corrigido - o total absoluto nunca apaga um delta.
+    
+    Returns:
+        Divergência corrigida por status (valor real - valor guardado);
+        vazio se os contadores já estavam certos
+    """
+    stored = dict(db.query(EpisodeCount.status, EpisodeCount.total).with_for_update().all())
+    actual = {
+        EpisodeStatus(status).value: total
+        for status, total in db.query(Episode.status, func.count(Episode.id)).group_by(Episode.status)
+    }
+    
+    drift = {}
+    for status in EpisodeStatus:
+        real = actual.get(status.value, 0)
+        if status.value not in stored:
+            db.add(EpisodeCount(status=status.value, total=real))
+        elif stored[status.value] != real:
+            db.execute(
+                update(EpisodeCount).where(EpisodeCount.status == status.value).values(total=real)
+            )
+        if real != stored.get(status.value, 0):
+            drift[status.value] = real - stored.get(status.value, 0)
+    db.flush()
+    return drift
+
+
+def try_reconcile_lock(db: Session) -> bool:
+    """
+    Advisory lock de transação (PostgreSQL) da reconciliação: com vários
+    workers, só um confere os totais por vez; os demais pulam a rodada.
+    Outros bancos (um processo só): sempre True.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+    ).scalar())
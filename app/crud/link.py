@@ -2,8 +2,11 @@
 Operações CRUD para OfficialLink.
 Funções para criar, ler, atualizar e deletar links oficiais.
 """
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.core.cache import invalidate
+from app.crud.watermark import bump_table_version
 from app.models.models import OfficialLink
 from app.schemas.schemas import OfficialLinkCreate, OfficialLinkUpdate
 
@@ -24,7 +27,9 @@ def create_link(db: Session, link: OfficialLinkCreate) -> OfficialLink:
     """Cria novo link oficial."""
     db_link = OfficialLink(**link.model_dump())
     db.add(db_link)
+    bump_table_version(db, OfficialLink.__tablename__)
     db.commit()
+    invalidate(OfficialLink.__tablename__)
     db.refresh(db_link)
     return db_link
 
@@ -43,7 +48,9 @@ def update_link(
     for field, value in update_data.items():
         setattr(db_link, field, value)
     
+    bump_table_version(db, OfficialLink.__tablename__)
     db.commit()
+    invalidate(OfficialLink.__tablename__)
     db.refresh(db_link)
     return db_link
 
@@ -60,5 +67,25 @@ def delete_link(db: Session, link_id: int) -> bool:
         return False
     
     db.delete(db_link)
+    bump_table_version(db, OfficialLink.__tablename__)
     db.commit()
+    invalidate(OfficialLink.__tablename__)
     return True
+
+
+def create_links_bulk(db: Session, links: List[OfficialLinkCreate]) -> List[int]:
+    """
+    Cria vários links em uma única transação (INSERT ... RETURNING em lote).
+    
+    Returns:
+        IDs criados, na mesma ordem de `links`
+    """
+    result = db.execute(
+        insert(OfficialLink).returning(OfficialLink.id, sort_by_parameter_order=True),
+        [link.model_dump() for link in links]
+    )
+    ids = list(result.scalars())
+    bump_table_version(db, OfficialLink.__tablename__)
+    db.commit()
+    invalidate(OfficialLink.__tablename__)
+    return ids
@@ -0,0 +1,193 @@
+"""
+Operações CRUD para Tag.
+Sincroniza a forma normalizada (tags + episode_tags) com Episode.tags e
+mantém as contagens de episódios publicados por tag.
+"""
+from collections import defaultdict, namedtuple
+from sqlalchemy import delete, insert, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List
+from app.models.models import EpisodeStatus, Tag, episode_tags
+
+# INSERT com ON CONFLICT por dialeto (outros bancos: INSERT simples)
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Mudança de tags/status de um episódio (antes -> depois)
+TagChange = namedtuple(
+    "TagChange", ["episode_id", "old_tags", "old_published", "new_tags", "new_published"]
+)
+
+
+def parse_tags(tags: str) -> List[str]:
+    """
+    Converte "tag1, Tag2,tag1" em ["tag1", "tag2"].
+    Minúsculas, sem espaços nas pontas, sem vazias nem repetidas.
+    """
+    if not tags:
+        return []
+    names = []
+    for raw in tags.split(","):
+        name = raw.strip().lower()[:100]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def get_tag_facets(db: Session, limit: int = 100) -> List[Tag]:
+    """Tags com episódios publicados, da mais usada para a menos usada."""
+    return (
+        db.query(Tag)
+        .filter(Tag.published_count > 0)
+        .order_by(Tag.published_count.desc(), Tag.name)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_tag_published_count(db: Session, name: str) -> int:
+    """Episódios publicados com a tag (0 se a tag não existe)."""
+    count = db.query(Tag.published_count).filter(Tag.name == name.strip().lower()).scalar()
+    return count or 0
+
+
+def _get_or_create_tags(db: Session, names: Iterable[str]) -> dict:
+    """
+    Mapa nome -> id, criando as tags que faltam.
+    
+    INSERT ... ON CONFLICT (name) DO NOTHING + novo SELECT: se outra
+    transação criar a mesma tag ao mesmo tempo, o INSERT espera por ela e
+    pula a linha, em vez de falhar na unicidade de `name`.
+    """
+    names = list(names)
+    if not names:
+        return {}
+    existing = dict(db.query(Tag.name, Tag.id).filter(Tag.name.in_(names)).all())
+    missing = [name for name in names if name not in existing]
+    if missing:
+        dialect_insert = _INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is None:
+            db.add_all([Tag(name=name, published_count=0) for name in missing])
+            db.flush()
+        else:
+            db.execute(
+                dialect_insert(Tag)
+                .values([{"name": name, "published_count": 0} for name in missing])
+                .on_conflict_do_nothing(index_elements=[Tag.name])
+            )
+        existing.update(db.query(Tag.name, Tag.id).filter(Tag.name.in_(missing)).all())
+    return existing
+
+
+def sync_episode_tags(
+    db: Session,
+    episode_id: int,
+    old_tags: List[str],
+    old_published: bool,
+    new_tags: List[str],
+    new_published: bool
+) -> None:
+    """
+    Aplica a mudança de tags/status de um episódio na forma normalizada.
+    Deve rodar antes do commit, na mesma transação da mutação, com o
+    estado antigo lido da linha travada (SELECT ... FOR UPDATE): senão
+    duas mutações simultâneas aplicam o mesmo delta.
+    """
+    sync_episode_tags_bulk(db, [
+        TagChange(episode_id, old_tags, old_published, new_tags, new_published)
+    ])
+
+
+def sync_episode_tags_bulk(db: Session, changes: List["TagChange"]) -> None:
+    """
+    Versão em lote de `sync_episode_tags`: um SELECT/INSERT de tags, um
+    DELETE e um INSERT em episode_tags e um UPDATE por valor de delta.
+    
+    As contagens mudam só pelo delta: +1 para tags que passam a contar
+    (episódio publicado com a tag), -1 para as que deixam de contar.
+    """
+    names = set()
+    for change in changes:
+        names.update(change.old_tags)
+        names.update(change.new_tags)
+    tag_ids = _get_or_create_tags(db, names)
+    
+    removed_links = []
+    added_links = []
+    deltas: Dict[int, int] = defaultdict(int)
+    for change in changes:
+        old_tags, new_tags = set(change.old_tags), set(change.new_tags)
+        removed_links += [(change.episode_id, tag_ids[name]) for name in old_tags - new_tags]
+        added_links += [(change.episode_id, tag_ids[name]) for name in new_tags - old_tags]
+        
+        counted_before = old_tags if change.old_published else set()
+        counted_after = new_tags if change.new_published else set()
+        for name in counted_after - counted_before:
+            deltas[tag_ids[name]] += 1
+        for name in counted_before - counted_after:
+            deltas[tag_ids[name]] -= 1
+    
+    if removed_links:
+        db.execute(delete(episode_tags).where(
+            tuple_(episode_tags.c.episode_id, episode_tags.c.tag_id).in_(removed_links)
+        ))
+    if added_links:
+        db.execute(insert(episode_tags), [
+            {"episode_id": episode_id, "tag_id": tag_id} for episode_id, tag_id in added_links
+        ])
+    
+    # Um UPDATE por valor de delta (normalmente só +1 e/ou -1)
+    by_delta: Dict[int, List[int]] = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(tag_id)
+    for delta, ids in by_delta.items():
+        db.execute(
+            update(Tag)
+            .where(Tag.id.in_(ids))
+            .values(published_count=Tag.published_count + delta)
+        )
+
+
+def episode_ids_with_tag(name: str):
+    """Subquery de ids de episódios que têm a tag (para filtros IN)."""
+    return (
+        select(episode_tags.c.episode_id)
+        .join(Tag, Tag.id == episode_tags.c.tag_id)
+        .where(Tag.name == name.strip().lower())
+    )
+
+
+def rebuild_tag_index(db: Session) -> None:
+    """
+    Reconstrói tags/episode_tags e as contagens a partir de Episode.tags.
+    Usado após cargas em massa; exige PostgreSQL. Não faz commit.
+    """
+    db.execute(delete(episode_tags))
+    db.execute(text("""
+        INSERT INTO tags (name, published_count)
+        SELECT DISTINCT left(lower(trim(t)), 100), 0
+        FROM episodes, unnest(string_to_array(episodes.tags, ',')) AS t
+        WHERE trim(t) <> ''
+        ON CONFLICT (name) DO NOTHING
+    """))
+    db.execute(text("""
+        INSERT INTO episode_tags (episode_id, tag_id)
+        SELECT DISTINCT e.id, tg.id
+        FROM episodes e, unnest(string_to_array(e.tags, ',')) AS t
+        JOIN tags tg ON tg.name = left(lower(trim(t)), 100)
+        WHERE trim(t) <> ''
+        ON CONFLICT DO NOTHING
+    """))
+    db.execute(text("""
+        UPDATE tags SET published_count = coalesce(counts.total, 0)
+        FROM tags AS t
+        LEFT JOIN (
+            SELECT et.tag_id, count(*) AS total
+            FROM episode_tags et
+            JOIN episodes e ON e.id = et.episode_id
+            WHERE e.status = :published
+            GROUP BY et.tag_id
+        ) AS counts ON counts.tag_id = t.id
+        WHERE tags.id = t.id
+    """), {"published": EpisodeStatus.PUBLISHED.value})
@@ -6,7 +6,11 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from app.models.models import AdminUser
 from app.schemas.schemas import AdminUserCreate, AdminUserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import invalidate
+from app.core.security import (
+    get_password_hash, get_password_hash_async, verify_password, verify_password_async
+)
+from app.db.session import run_db
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[AdminUser]:
@@ -19,15 +23,16 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[AdminUser]:
     return db.query(AdminUser).filter(AdminUser.id == user_id).first()
 
 
-def create_user(db: Session, user: AdminUserCreate) -> AdminUser:
+def create_user(db: Session, user: AdminUserCreate, password_hash: Optional[str] = None) -> AdminUser:
     """
     Cria novo usuário admin.
-    Hash da senha é gerado automaticamente.
+    Hash da senha é gerado automaticamente, a menos que `password_hash`
+    já venha calculado (`create_user_async`).
     """
     db_user = AdminUser(
         name=user.name,
         email=user.email,
-        password_hash=get_password_hash(user.password),
+        password_hash=password_hash or get_password_hash(user.password),
         role="ADMIN"
     )
     db.add(db_user)
@@ -36,6 +41,18 @@ def create_user(db: Session, user: AdminUserCreate) -> AdminUser:
     return db_user
 
 
+async def create_user_async(db: Session, user: AdminUserCreate) -> AdminUser:
+    """
+    Versão de `create_user` para rotas async: o bcrypt roda no pool de
+    processos de senhas e a escrita no threadpool.
+    
+    Raises:
+        PasswordPoolBusyError: se a fila do pool estiver cheia
+    """
+    password_hash = await get_password_hash_async(user.password)
+    return await run_db(db, create_user, user, password_hash)
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[AdminUser]:
     """
     Autentica usuário verificando email e senha.
@@ -54,12 +71,36 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[AdminU
     return user
 
 
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[AdminUser]:
+    """
+    Versão de `authenticate_user` para rotas async: a busca roda no
+    threadpool e o bcrypt no pool de processos de senhas.
+    
+    Raises:
+        PasswordPoolBusyError: se a fila do pool estiver cheia
+    """
+    user = await run_db(db, get_user_by_email, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.password_hash):
+        return None
+    if not user.is_active:
+        return None
+    
+    return user
+
+
 def update_user(
     db: Session,
     user_id: int,
-    user_update: AdminUserUpdate
+    user_update: AdminUserUpdate,
+    password_hash: Optional[str] = None
 ) -> Optional[AdminUser]:
-    """Atualiza usuário existente."""
+    """
+    Atualiza usuário existente.
+    Trocar senha/email ou desativar revoga os tokens já emitidos.
+    `password_hash` é o hash da nova senha já calculado (`update_user_async`).
+    """
     db_user = get_user_by_id(db, user_id)
     if not db_user:
         return None
@@ -68,11 +109,35 @@ def update_user(
     
     # Se senha foi fornecida, gera novo hash
     if "password" in update_data:
-        update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+        password = update_data.pop("password")
+        update_data["password_hash"] = password_hash or get_password_hash(password)
+    
+    # Tokens carregam o token_version (claim "tv"); incrementar revoga todos
+    if {"password_hash", "email", "is_active"} & update_data.keys():
+        db_user.token_version = (db_user.token_version or 0) + 1
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
     db.commit()
+    invalidate(AdminUser.__tablename__)
     db.refresh(db_user)
     return db_user
+
+
+async def update_user_async(
+    db: Session,
+    user_id: int,
+    user_update: AdminUserUpdate
+) -> Optional[AdminUser]:
+    """
+    Versão de `update_user` para rotas async: a nova senha (se houver) é
+    hasheada no pool de processos de senhas, fora do threadpool.
+    
+    Raises:
+        PasswordPoolBusyError: se a fila do pool estiver cheia
+    """
+    password_hash = None
+    if user_update.password is not None:
+        password_hash = await get_password_hash_async(user_update.password)
+    return await run_db(db, update_user, user_id, user_update, password_hash)
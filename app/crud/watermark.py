@@ -0,0 +1,53 @@
+"""
+Operações CRUD para TableVersion.
+Leitura e incremento da marca d'água de alteração de cada tabela.
+"""
+from collections import namedtuple
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.db.replicas import PRIMARY_SOURCE
+from app.models.models import TableVersion
+
+# version: contador monotônico; updated_at: momento da última alteração;
+# source: origem da leitura (primário ou réplica), para separar caches
+Watermark = namedtuple("Watermark", ["version", "updated_at", "source"], defaults=(PRIMARY_SOURCE,))
+
+# INSERT ... ON CONFLICT dos bancos que suportam upsert
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def get_table_watermark(db: Session, table_name: str) -> Watermark:
+    """Busca a marca d'água da tabela (lookup por chave primária)."""
+    row = db.query(TableVersion.version, TableVersion.updated_at).filter(
+        TableVersion.table_name == table_name
+    ).first()
+    if not row:
+        return Watermark(0, None)
+    return Watermark(row.version, row.updated_at)
+
+
+def bump_table_version(db: Session, table_name: str) -> None:
+    """
+    Incrementa a versão da tabela.
+    Deve ser chamado antes do commit da mutação, na mesma transação.
+    
+    Upsert atômico (INSERT ... ON CONFLICT DO UPDATE): dois primeiros
+    escritores da mesma tabela não disputam o INSERT da chave primária.
+    """
+    dialect_insert = _INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(TableVersion).values(table_name=table_name, version=1)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1, "updated_at": func.now()},
+        ))
+        return
+    result = db.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name == table_name)
+        .values(version=TableVersion.version + 1, updated_at=func.now())
+    )
+    if result.rowcount == 0:
+        db.add(TableVersion(table_name=table_name, version=1))
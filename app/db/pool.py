@@ -0,0 +1,129 @@
+"""
+Pool de conexões instrumentado.
+
+QueuePool (engine síncrono) e AsyncAdaptedQueuePool (engine assíncrono)
+ganham subclasses que medem o tempo de espera por uma conexão e contam
+timeouts de checkout - informação que os eventos do pool não expõem.
+Checkouts, checkins, conexões novas e invalidações vêm dos eventos de
+pool do SQLAlchemy. O estado ao vivo (em uso, overflow) é lido do pool.
+"""
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+
+class PoolStats:
+    """Contadores de um pool (thread-safe)."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_errors = 0
+        self.waits = 0
+        self.slow_waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+            if seconds * 1000 >= settings.DB_POOL_SLOW_WAIT_MS:
+                self.slow_waits += 1
+    
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def snapshot(self) -> dict:
+        """Estado ao vivo do pool + contadores acumulados."""
+        pool = self.pool
+        with self._lock:
+            data = {
+                "name": self.name,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_errors": self.checkout_errors,
+                "waits": self.waits,
+                "slow_waits": self.slow_waits,
+                "wait_ms_avg": round(self.wait_seconds_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # overflow() começa em -pool_size; só o excedente conta
+                "overflow_in_use": max(pool.overflow(), 0),
+            })
+        return data
+
+
+# Um por engine: "sync" (psycopg2), "async" (asyncpg) e um par por réplica
+pool_stats: Dict[str, PoolStats] = {"sync": PoolStats("sync"), "async": PoolStats("async")}
+
+
+class _InstrumentedPoolMixin:
+    """Mede a espera em `_do_get` (inclui abrir conexão de overflow)."""
+    
+    def _do_get(self):
+        stats = pool_stats[self._orig_logging_name]
+        stats.pool = self
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            stats.increment("checkout_errors")
+            raise
+        finally:
+            stats.record_wait(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool com medição de espera e timeouts."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool com medição de espera e timeouts."""
+
+
+def pool_options(async_: bool = False, name: str = None) -> dict:
+    """
+    Argumentos de pool para create_engine/create_async_engine.
+    `name` identifica o pool em pool_stats (padrão: "sync"/"async").
+    """
+    name = name or ("async" if async_ else "sync")
+    pool_stats.setdefault(name, PoolStats(name))
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if async_ else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Registra os eventos de pool do engine (sync ou `async_engine.sync_engine`)."""
+    stats = pool_stats[name]
+    stats.pool = engine.pool
+    event.listen(engine, "connect", lambda *args: stats.increment("connects"))
+    event.listen(engine, "checkout", lambda *args: stats.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: stats.increment("checkins"))
+    event.listen(engine, "invalidate", lambda *args: stats.increment("invalidations"))
@@ -0,0 +1,39 @@
+"""
+Eventos de cursor compartilhados: um único par before/after_cursor_execute
+por engine mede o tempo de cada query e repassa (statement, parâmetros,
+segundos) aos hooks registrados - métricas (app.core.metrics) e orçamento
+de queries / log de lentas (app.core.query_budget).
+"""
+import time
+from typing import Any, Callable, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QueryHook = Callable[[str, Any, float], None]
+
+# Tupla: troca atômica no registro, leitura sem lock no caminho quente
+_query_hooks: Tuple[QueryHook, ...] = ()
+
+
+def register_query_hook(hook: QueryHook) -> None:
+    """Registra função chamada após cada query: hook(statement, parâmetros, segundos)."""
+    global _query_hooks
+    _query_hooks = _query_hooks + (hook,)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    for hook in _query_hooks:
+        hook(statement, parameters, elapsed)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Registra os hooks de cursor no engine (sync ou `async_engine.sync_engine`)."""
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
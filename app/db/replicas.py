@@ -0,0 +1,180 @@
+"""
+Roteamento de leituras para réplicas.
+
+ReplicaSet escolhe a réplica de cada sessão pública (round-robin ou menos
+conexões em uso) e tira de rotação, por REPLICA_EJECT_SECONDS, a réplica
+cuja conexão falhou; depois disso ela volta em caráter de teste.
+
+Read-your-writes: ReadYourWritesMiddleware marca com um cookie o cliente
+que acabou de escrever pela API admin; enquanto o cookie vale, as
+leituras públicas desse cliente vão ao primário.
+
+Cada sessão pública leva em `session.info` a origem dos dados (nome da
+réplica ou "primary"): marcas d'água memorizadas e caches indexados por
+versão são separados por origem, porque uma réplica atrasada só pode
+servir linhas junto com a versão que ela mesma leu.
+"""
+import itertools
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+READ_PRIMARY_COOKIE = "metocast_read_primary"
+
+# Origem das sessões do primário (réplicas usam o próprio nome)
+PRIMARY_SOURCE = "primary"
+DATA_SOURCE_KEY = "data_source"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    """Uma réplica: factories de sessão (sync/async) e estado de saúde."""
+    
+    def __init__(self, name: str, engine, session_factory, async_engine, async_session_factory):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.async_engine = async_engine
+        self.async_session_factory = async_session_factory
+        self.ejected_until = 0.0
+        self.failures = 0
+        self.sessions = 0
+    
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+    
+    def connections_in_use(self) -> int:
+        """Conexões em uso nos dois pools (critério de least_connections)."""
+        total = 0
+        for engine in (self.engine, self.async_engine.sync_engine):
+            checkedout = getattr(engine.pool, "checkedout", None)
+            total += checkedout() if checkedout else 0
+        return total
+    
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "failures": self.failures,
+            "sessions": self.sessions,
+            "connections_in_use": self.connections_in_use(),
+        }
+
+
+class ReplicaSet:
+    """Balanceamento e ejeção de réplicas não saudáveis."""
+    
+    def __init__(self, replicas: List[Replica], balancing: str = "round_robin"):
+        if balancing not in ("round_robin", "least_connections"):
+            raise ValueError(f"REPLICA_BALANCING inválido: {balancing}")
+        self.replicas = replicas
+        self.balancing = balancing
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.primary_fallbacks = 0
+    
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+    
+    def choose(self) -> Optional[Replica]:
+        """Réplica para a próxima sessão, ou None (nenhuma saudável: primário)."""
+        candidates = [replica for replica in self.replicas if replica.healthy]
+        if not candidates:
+            self.primary_fallbacks += 1
+            return None
+        start = next(self._counter) % len(candidates)
+        if self.balancing == "least_connections":
+            # Empates (ex.: réplicas ociosas) se alternam em round-robin
+            rotated = candidates[start:] + candidates[:start]
+            replica = min(rotated, key=Replica.connections_in_use)
+        else:
+            replica = candidates[start]
+        replica.sessions += 1
+        return replica
+    
+    def eject(self, replica: Replica) -> None:
+        """Tira a réplica de rotação por REPLICA_EJECT_SECONDS."""
+        with self._lock:
+            replica.failures += 1
+            replica.ejected_until = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+    
+    def report_error(self, replica: Optional[Replica], exc: BaseException) -> None:
+        """
+        Ejeta a réplica se o erro for de conexão: conexão perdida durante
+        a query, ou falha ao conectar (erro sem statement associado).
+        Erros de SQL (timeout, sintaxe) não tiram a réplica de rotação.
+        """
+        if replica is None or not isinstance(exc, DBAPIError):
+            return
+        if exc.connection_invalidated or (
+            isinstance(exc, (OperationalError, InterfaceError)) and exc.statement is None
+        ):
+            self.eject(replica)
+    
+    def stats(self) -> dict:
+        return {
+            "balancing": self.balancing,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+
+def data_source(db) -> str:
+    """Origem dos dados da sessão (sync ou async): réplica ou primário."""
+    return db.info.get(DATA_SOURCE_KEY, PRIMARY_SOURCE)
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True se o cliente escreveu há pouco (cookie de read-your-writes)."""
+    value = request.cookies.get(READ_PRIMARY_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Após uma escrita bem-sucedida na API admin, define o cookie que manda
+    as leituras públicas do cliente para o primário por
+    READ_YOUR_WRITES_SECONDS.
+    
+    O painel admin e o site público podem estar em origens diferentes
+    (requisições cross-site com credentials), então o cookie usa
+    SameSite=None; Secure: com Lax ele não seria enviado nos fetch do site.
+    """
+    
+    def __init__(self, app: ASGIApp, prefix: str = None):
+        self.app = app
+        self.prefix = prefix or settings.ADMIN_API_PREFIX
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                seconds = settings.READ_YOUR_WRITES_SECONDS
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}={time.time() + seconds:.0f}; "
+                    f"Max-Age={int(seconds)}; Path=/; HttpOnly; Secure; SameSite=None"
+                )
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
@@ -2,10 +2,27 @@
 Aplicação principal FastAPI - Metocast Hub API.
 Configura rotas, middlewares e documentação.
 """
+import asyncio
+import logging
+from typing import Optional
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.core.cache import compressed_cache
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.api.v1 import auth, episodes, links, admin_episodes, admin_links
+from app.core.metrics import MetricsMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.rate_limit import RateLimitMiddleware, parse_networks, rate_limiter
+from app.core.security import shutdown_password_pool, start_password_pool
+from app.crud.episode import reconcile_episode_counts
+from app.db.replicas import ReadYourWritesMiddleware
+from app.db.query_events import instrument_queries
+from app.db.session import SessionLocal, async_engine, engine, replica_set
+from app.api.v1 import (
+    auth, episodes, links, tags, feed, admin_episodes, admin_links, admin_export, internal, metrics
+)
 
 # Criar instância do FastAPI
 app = FastAPI(
@@ -13,7 +30,9 @@ app = FastAPI(
     version=settings.VERSION,
     description="API para gerenciamento de episódios e links do Metocast",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson como encoder padrão quando o caminho rápido está ativo
+    default_response_class=ORJSONResponse if settings.FAST_JSON else JSONResponse
 )
 
 # Configurar CORS
@@ -23,8 +42,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Headers de paginação legíveis pelo frontend (fetch)
+    expose_headers=["ETag", "Link", "X-Next-Cursor", "X-Total-Count"],
 )
 
+# Compressão gzip/brotli (variantes de respostas com ETag ficam em cache)
+app.add_middleware(CompressionMiddleware, variant_cache=compressed_cache)
+
+# Contagem de queries por requisição, orçamento por rota e log de lentas
+app.add_middleware(QueryBudgetMiddleware)
+
+# Read-your-writes: após escrita admin, leituras do cliente vão ao primário
+if replica_set:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Rate limiting por IP e rota: 429 antes de tocar no banco/bcrypt
+if rate_limiter:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        trusted_proxies=parse_networks(settings.RATE_LIMIT_TRUSTED_PROXIES)
+    )
+
+# Métricas Prometheus (mais externo: mede a requisição inteira)
+app.add_middleware(MetricsMiddleware)
+
+_replica_engines = [
+    replica_engine for replica in replica_set.replicas
+    for replica_engine in (replica.engine, replica.async_engine.sync_engine)
+]
+for _engine in (engine, async_engine.sync_engine, *_replica_engines):
+    instrument_queries(_engine)
+
 
 # ==================== Rotas Públicas ====================
 # Rotas acessíveis sem autenticação
@@ -38,6 +87,12 @@ app.include_router(episodes.router, prefix=settings.API_V1_PREFIX)
 # Links oficiais públicos
 app.include_router(links.router, prefix=settings.API_V1_PREFIX)
 
+# Tags (facetas com contagem de episódios publicados)
+app.include_router(tags.router, prefix=settings.API_V1_PREFIX)
+
+# Feed RSS dos episódios publicados
+app.include_router(feed.router, prefix=settings.API_V1_PREFIX)
+
 
 # ==================== Rotas Administrativas ====================
 # Rotas protegidas por autenticação JWT
@@ -48,6 +103,15 @@ app.include_router(admin_episodes.router, prefix=settings.ADMIN_API_PREFIX)
 # Admin: Links oficiais (CRUD completo)
 app.include_router(admin_links.router, prefix=settings.ADMIN_API_PREFIX)
 
+# Admin: Export do catálogo (NDJSON em streaming)
+app.include_router(admin_export.router, prefix=settings.ADMIN_API_PREFIX)
+
+# Internas: estatísticas de cache e recursos (/internal/...)
+app.include_router(internal.router)
+
+# Métricas Prometheus (/metrics)
+app.include_router(metrics.router)
+
 
 # ==================== Endpoints Básicos ====================
 
@@ -70,14 +134,47 @@ def health_check():
 
 # ==================== Event Handlers ====================
 
+logger = logging.getLogger(__name__)
+
+
+def _reconcile_counts() -> Optional[dict]:
+    """Confere os totais por status em uma sessão própria (None: outro worker conferindo)."""
+    db = SessionLocal()
+    try:
+        return reconcile_episode_counts(db)
+    finally:
+        db.close()
+
+
+async def reconcile_counts_periodically(interval: float) -> None:
+    """Roda a conferência dos totais na subida e a cada `interval` segundos."""
+    while True:
+        try:
+            drift = await run_in_threadpool(_reconcile_counts)
+            if drift:
+                logger.warning("Totais de episódios corrigidos: %s", drift)
+        except Exception:
+            logger.exception("Falha ao conferir totais de episódios")
+        await asyncio.sleep(interval)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Executado ao iniciar a aplicação."""
     print(f"🚀 {settings.PROJECT_NAME} v{settings.VERSION} iniciado!")
     print(f"📚 Documentação: http://localhost:8000/docs")
+    start_password_pool()
+    if settings.EPISODE_COUNT_RECONCILE_SECONDS > 0:
+        app.state.reconcile_task = asyncio.create_task(
+            reconcile_counts_periodically(settings.EPISODE_COUNT_RECONCILE_SECONDS)
+        )
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Executado ao encerrar a aplicação."""
+    task = getattr(app.state, "reconcile_task", None)
+    if task:
+        task.cancel()
+    shutdown_password_pool()
     print("👋 Aplicação encerrada!")
@@ -1,8 +1,12 @@
 """
 Modelos de banco de dados usando SQLAlchemy ORM.
-Define as tabelas: Episode, OfficialLink e AdminUser.
+Define as tabelas: Episode, Tag (+ episode_tags), OfficialLink,
+AdminUser, TableVersion e EpisodeCount.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum
+from sqlalchemy import (
+    BigInteger, Column, ForeignKey, Integer, String, Table, Text, DateTime, Index,
+    Enum as SQLEnum, text
+)
 from sqlalchemy.sql import func
 from datetime import datetime
 from enum import Enum
@@ -47,10 +51,55 @@ class Episode(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Índices das listagens (mesma ordem de crud.episode.episodes_query).
+    # Criados via migration 0002 com CREATE INDEX CONCURRENTLY;
+    # NULLS LAST em índice é específico do PostgreSQL.
+    __table_args__ = (
+        # Listagem admin com filtro por status
+        Index(
+            "ix_episodes_status_published_at_id",
+            status, published_at.desc().nullslast(), id.desc()
+        ).ddl_if(dialect="postgresql"),
+        # Listagem pública: índice parcial só com publicados
+        Index(
+            "ix_episodes_published_published_at_id",
+            published_at.desc().nullslast(), id.desc(),
+            postgresql_where=text("status = 'PUBLISHED'")
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     def __repr__(self):
         return f"<Episode(id={self.id}, title='{self.title}', status={self.status})>"
 
 
+# Associação N:N episódio <-> tag (forma normalizada de Episode.tags)
+episode_tags = Table(
+    "episode_tags",
+    Base.metadata,
+    Column("episode_id", Integer, ForeignKey("episodes.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # Filtro por tag: tag_id -> episódios
+    Index("ix_episode_tags_tag_id_episode_id", "tag_id", "episode_id"),
+)
+
+
+class Tag(Base):
+    """
+    Tag normalizada de episódios.
+    
+    `published_count` é mantido incrementalmente pelo CRUD de episódios
+    (número de episódios PUBLISHED com a tag) e alimenta /api/tags.
+    """
+    __tablename__ = "tags"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)
+    published_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    def __repr__(self):
+        return f"<Tag(id={self.id}, name='{self.name}', published_count={self.published_count})>"
+
+
 class OfficialLink(Base):
     """
     Links oficiais do projeto Metocast.
@@ -88,6 +137,8 @@ class AdminUser(Base):
     password_hash = Column(String(255), nullable=False)
     role = Column(String(50), default="ADMIN", nullable=False)
     is_active = Column(Integer, default=1)  # 1 = ativo, 0 = inativo
+    # Incrementado ao trocar senha/email ou desativar: invalida tokens emitidos
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -95,3 +146,37 @@ class AdminUser(Base):
     
     def __repr__(self):
         return f"<AdminUser(id={self.id}, email='{self.email}', role={self.role})>"
+
+
+class TableVersion(Base):
+    """
+    Marca d'água de alteração por tabela.
+    
+    Incrementada pelas mutações do CRUD na mesma transação da escrita;
+    alimenta ETags e a coerência dos caches entre workers.
+    """
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<TableVersion(table_name='{self.table_name}', version={self.version})>"
+
+
+class EpisodeCount(Base):
+    """
+    Total de episódios por status.
+    
+    Mantido incrementalmente pelo CRUD de episódios (na mesma transação
+    da escrita) e conferido periodicamente por `reconcile_episode_counts`;
+    alimenta o header X-Total-Count das listagens sem COUNT(*).
+    """
+    __tablename__ = "episode_counts"
+    
+    status = Column(String(20), primary_key=True)
+    total = Column(BigInteger, default=0, server_default="0", nullable=False)
+    
+    def __repr__(self):
+        return f"<EpisodeCount(status='{self.status}', total={self.total})>"
@@ -3,7 +3,7 @@ Schemas Pydantic para validação e serialização de dados.
 Define a estrutura de entrada e saída da API.
 """
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
-from typing import Optional, List
+from typing import Any, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -37,6 +37,7 @@ class EpisodeBase(BaseModel):
 class EpisodeCreate(EpisodeBase):
     """Schema para criar episódio."""
     status: EpisodeStatus = EpisodeStatus.DRAFT
+    published_at: Optional[datetime] = None  # Preservado em export/import
 
 
 class EpisodeUpdate(BaseModel):
@@ -71,6 +72,23 @@ class EpisodeInDB(EpisodeBase):
 EpisodeResponse = EpisodeInDB
 
 
+class EpisodeSummary(BaseModel):
+    """Projeção leve para grades e listas (sem description): `?fields=summary`."""
+    id: int
+    title: str
+    cover_image_url: Optional[str] = None
+    published_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class TagFacet(BaseModel):
+    """Tag com número de episódios publicados."""
+    name: str
+    count: int
+
+
 # ==================== OfficialLink Schemas ====================
 
 class OfficialLinkBase(BaseModel):
@@ -126,6 +144,7 @@ class AdminUserUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     email: Optional[EmailStr] = None
     password: Optional[str] = Field(None, min_length=8)
+    is_active: Optional[int] = Field(None, ge=0, le=1)
 
 
 class AdminUserInDB(AdminUserBase):
@@ -162,6 +181,27 @@ class LoginRequest(BaseModel):
     password: str
 
 
+# ==================== Batch Schemas ====================
+
+class EpisodeBatchPublish(BaseModel):
+    """IDs de episódios a publicar em lote."""
+    ids: List[int] = Field(..., min_length=1)
+
+
+class BatchItemError(BaseModel):
+    """Erro de um item do lote (posição no array enviado)."""
+    index: int
+    detail: Any
+
+
+class BatchResult(BaseModel):
+    """Resultado de operação em lote: itens aplicados e erros por item."""
+    succeeded: int
+    failed: int
+    ids: List[int]
+    errors: List[BatchItemError] = []
+
+
 # ==================== Generic Responses ====================
 
 class MessageResponse(BaseModel):
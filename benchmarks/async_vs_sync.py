@@ -0,0 +1,115 @@
+"""
+Benchmark: throughput dos routers públicos com Session síncrona vs AsyncSession.
+
+Sobe a API duas vezes com uvicorn (ASYNC_DB_ROUTERS vazio e "episodes,links")
+contra o mesmo banco e dispara N clientes concorrentes em /api/episodes,
+/api/episodes/{id} e /api/links.
+
+Uso:
+    python -m benchmarks.async_vs_sync --concurrency 500 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+ENDPOINTS = ["/api/episodes?limit=20", "/api/links"]
+
+
+def start_server(port: int, async_routers: str) -> subprocess.Popen:
+    """
+    Inicia uvicorn em subprocesso com a configuração de routers desejada,
+    sem rate limit (a carga vem de um IP só).
+    """
+    env = dict(os.environ, ASYNC_DB_ROUTERS=async_routers, RATE_LIMIT_ENABLED="false")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    """Aguarda o /health responder."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu em {base_url}")
+
+
+async def drive(base_url: str, concurrency: int, duration: float) -> dict:
+    """Executa `concurrency` clientes em loop fechado por `duration` segundos."""
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    deadline = time.monotonic() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker(index: int) -> None:
+            nonlocal errors
+            path = ENDPOINTS[index % len(ENDPOINTS)]
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    latencies.sort()
+    count = len(latencies)
+
+    def pct(p: float) -> float:
+        return round(latencies[min(count - 1, int(count * p))] * 1000, 2) if count else 0.0
+
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / duration, 1),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+async def run(args) -> dict:
+    results = {}
+    for label, routers in (("sync", ""), ("async", "episodes,links")):
+        server = start_server(args.port, routers)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            await wait_ready(base_url)
+            results[label] = await drive(base_url, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
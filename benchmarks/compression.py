@@ -0,0 +1,55 @@
+"""
+Micro-benchmark: custo de CPU vs economia de banda por nível de compressão.
+
+Para uma página de episódios com descrições longas (o pior caso de
+GET /api/episodes), mede em cada nível de gzip e brotli:
+- ms para comprimir a página (custo por requisição sem cache de variantes)
+- tamanho final e razão de compressão
+- throughput de entrada (MB/s)
+
+Uso:
+    python -m benchmarks.compression --page-size 100 --description-chars 4000
+"""
+import argparse
+import json
+import timeit
+
+from app.core.compression import brotli, compress
+from app.core.serialization import episode_list_adapter, episodes_from_db
+from benchmarks.serialization import make_rows
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 9, 11)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--description-chars", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    body = episode_list_adapter.dump_json(episodes_from_db(make_rows(args.page_size, args.description_chars)))
+
+    cases = [("gzip", level) for level in GZIP_LEVELS]
+    if brotli:
+        cases += [("br", quality) for quality in BROTLI_QUALITIES]
+
+    results = {"identity_bytes": len(body), "levels": []}
+    for encoding, level in cases:
+        seconds = min(timeit.repeat(lambda: compress(body, encoding, level), number=args.repeat, repeat=3)) / args.repeat
+        size = len(compress(body, encoding, level))
+        results["levels"].append({
+            "encoding": encoding,
+            "level": level,
+            "ms_per_page": round(seconds * 1000, 3),
+            "bytes": size,
+            "ratio": round(len(body) / size, 2),
+            "mb_per_s": round(len(body) / seconds / 1e6, 1),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Suíte de carga reprodutível: throughput e latência de todos os routers.
+
+Para cada tamanho de catálogo (--rows, ex.: 10000,100000,1000000):
+1. completa o banco (DATABASE_URL) até N episódios com o gerador
+   sintético (app/core/synthetic.py: vários processos + COPY no
+   PostgreSQL) e garante um admin de teste;
+2. sobe a API com uvicorn (rate limit desligado);
+3. para cada cenário e nível de concorrência (--concurrency, ex.: 1,16,64)
+   roda clientes em loop fechado por --duration segundos, após um
+   aquecimento de --warmup segundos que não entra na conta.
+
+Cenários: episodes_list, episode_detail, links, login e admin_crud
+(criar -> editar -> publicar -> excluir; cada passo medido separado).
+
+O resultado (req/s, erros, p50/p95/p99) sai em JSON. Com --baseline, cada
+métrica é comparada com a do arquivo e o processo sai com código 1 se
+alguma piorar mais que --threshold (req/s caindo ou p95/p99 subindo).
+--save-baseline grava o resultado como a nova referência.
+
+Uso:
+    python -m benchmarks.load --rows 10000,100000 --concurrency 1,16,64 --duration 10
+    python -m benchmarks.load --rows 10000 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load --rows 10000 --baseline benchmarks/baseline.json --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+from app.core.synthetic import generate_catalog
+from app.crud.user import create_user, get_user_by_email
+from app.db.session import SessionLocal, engine
+from app.models.models import Episode, EpisodeStatus
+from app.schemas.schemas import AdminUserCreate
+from benchmarks.async_vs_sync import wait_ready
+
+SCENARIOS = ("episodes_list", "episode_detail", "links", "login", "admin_crud")
+
+BENCH_EMAIL = "benchmark@metocast.com"
+BENCH_PASSWORD = "bench-password"
+
+# Métricas comparadas com o baseline: (chave, maior é melhor?)
+COMPARED_METRICS = (("rps", True), ("p95_ms", False), ("p99_ms", False))
+
+
+def prepare_database(rows: int, seed: int) -> list:
+    """
+    Completa `episodes` até `rows` linhas e garante o admin de teste.
+    Retorna até 1000 ids publicados para o cenário de detalhe.
+    """
+    db = SessionLocal()
+    try:
+        existing = db.query(Episode).count()
+        if existing < rows:
+            print(f"⏳ Inserindo {rows - existing} episódios...", file=sys.stderr)
+            report = generate_catalog(db, rows - existing, seed=seed, start=existing)
+            print(f"✅ {report.rows} episódios em {report.seconds:.1f}s", file=sys.stderr)
+        if not get_user_by_email(db, BENCH_EMAIL):
+            create_user(db, AdminUserCreate(name="Benchmark", email=BENCH_EMAIL, password=BENCH_PASSWORD))
+        ids = db.query(Episode.id).filter(Episode.status == EpisodeStatus.PUBLISHED).limit(1000).all()
+        return [row.id for row in ids]
+    finally:
+        db.close()
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Inicia uvicorn em subprocesso, sem rate limit (a carga vem de um IP só)."""
+    env = dict(os.environ, RATE_LIMIT_ENABLED="false")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=sys.stderr,  # stdout fica só para o JSON do relatório
+    )
+
+
+def stop_server(server: subprocess.Popen, timeout: float = 10.0) -> None:
+    """Encerra o uvicorn; mata o processo se ele não sair a tempo."""
+    server.terminate()
+    try:
+        server.wait(timeout)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def summarize(latencies: list, errors: int, duration: float) -> dict:
+    """req/s, erros e percentis (ms) de uma série de latências."""
+    latencies.sort()
+    count = len(latencies)
+
+    def pct(p: float) -> float:
+        return round(latencies[min(count - 1, int(count * p))] * 1000, 2) if count else 0.0
+
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / duration, 1),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+async def run_iteration(scenario: str, client: httpx.AsyncClient, headers: dict, ids: list,
+                        rng: random.Random, timed) -> None:
+    """
+    Uma iteração do cenário. `timed(nome, requisição)` mede e devolve a
+    resposta (None em erro); admin_crud encadeia os passos pelo id criado.
+    """
+    if scenario == "episodes_list":
+        await timed(scenario, client.get("/api/episodes", params={"limit": 20}))
+    elif scenario == "episode_detail":
+        await timed(scenario, client.get(f"/api/episodes/{rng.choice(ids)}"))
+    elif scenario == "links":
+        await timed(scenario, client.get("/api/links"))
+    elif scenario == "login":
+        await timed(scenario, client.post(
+            "/api/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+        ))
+    elif scenario == "admin_crud":
+        created = await timed("admin_create", client.post("/api/admin/episodes", headers=headers, json={
+            "title": "Benchmark", "description": "carga", "tags": "benchmark"
+        }))
+        if created is None:
+            return
+        base = f"/api/admin/episodes/{created.json()['id']}"
+        if await timed("admin_update", client.put(base, headers=headers, json={"description": "carga editada"})):
+            await timed("admin_publish", client.patch(f"{base}/publish", headers=headers))
+        await timed("admin_delete", client.delete(base, headers=headers))
+    else:
+        raise ValueError(f"Cenário desconhecido: {scenario}")
+
+
+async def drive(base_url: str, scenario: str, concurrency: int, duration: float, warmup: float,
+                headers: dict, ids: list, seed: int) -> dict:
+    """Roda `concurrency` clientes em loop fechado; retorna stats por medida."""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    measure_from = time.monotonic() + warmup
+    deadline = measure_from + duration
+
+    async def timed(name: str, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            response, failed = None, True
+        # Durante o aquecimento nada é registrado
+        if time.monotonic() >= measure_from:
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += failed
+        return None if failed else response
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def worker(index: int) -> None:
+            rng = random.Random(seed * 1000 + index)
+            while time.monotonic() < deadline:
+                await run_iteration(scenario, client, headers, ids, rng, timed)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    return {name: summarize(values, errors[name], duration) for name, values in latencies.items()}
+
+
+async def login_headers(base_url: str) -> dict:
+    """Authorization do admin de teste."""
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post("/api/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run(args) -> dict:
+    """Executa a matriz catálogo x cenário x concorrência."""
+    results = {}
+    for rows in args.rows:
+        ids = prepare_database(rows, args.seed)
+        server = start_server(args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            await wait_ready(base_url)
+            headers = await login_headers(base_url)
+            by_scenario = results[str(rows)] = {}
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    print(f"▶ {rows} linhas · {scenario} · c={concurrency}", file=sys.stderr)
+                    stats = await drive(
+                        base_url, scenario, concurrency, args.duration, args.warmup,
+                        headers, ids, args.seed
+                    )
+                    for name, values in stats.items():
+                        by_scenario.setdefault(name, {})[str(concurrency)] = values
+        finally:
+            stop_server(server)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Regressões em relação ao baseline: req/s abaixo de (1 - threshold) x
+    referência ou p95/p99 acima de (1 + threshold) x referência.
+    Medidas ausentes em um dos lados são ignoradas.
+    """
+    regressions = []
+    for rows, by_name in results.items():
+        for name, by_concurrency in by_name.items():
+            for concurrency, current in by_concurrency.items():
+                reference = baseline.get(rows, {}).get(name, {}).get(concurrency)
+                if not reference:
+                    continue
+                for metric, higher_is_better in COMPARED_METRICS:
+                    before, after = reference[metric], current[metric]
+                    if not before:
+                        continue
+                    change = (after - before) / before
+                    if (-change if higher_is_better else change) > threshold:
+                        regressions.append({
+                            "rows": rows, "measure": name, "concurrency": concurrency,
+                            "metric": metric, "baseline": before, "current": after,
+                            "change_pct": round(change * 100, 1),
+                        })
+    return regressions
+
+
+def csv_ints(value: str) -> list:
+    """"1,16,64" -> [1, 16, 64]."""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=csv_ints, default=[10_000], help="Tamanhos de catálogo (ex.: 10000,100000)")
+    parser.add_argument("--concurrency", type=csv_ints, default=[1, 16, 64])
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="Também grava o JSON neste arquivo")
+    parser.add_argument("--baseline", help="JSON de referência para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Piora tolerada (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", help="Grava o resultado como novo baseline")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    report = {
+        "meta": {
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+        },
+        "results": asyncio.run(run(args)),
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        report["regressions"] = compare(report["results"], baseline, args.threshold)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+
+    if exit_code:
+        print(f"❌ {len(report['regressions'])} regressões acima de {args.threshold:.0%}", file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
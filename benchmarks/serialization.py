@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: serialização padrão do FastAPI vs caminho rápido (FAST_JSON).
+
+Compara, para páginas de episódios com descrições longas:
+- padrão: model_validate do ORM + serialize_response (revalidação no
+  response_model + jsonable_encoder) + JSONResponse (json da stdlib)
+- rápido: model_construct (sem validação) + TypeAdapter.dump_json
+
+Uso:
+    python -m benchmarks.serialization --page-size 100 --description-chars 4000
+"""
+import argparse
+import asyncio
+import json
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.serialization import episode_list_adapter, episodes_from_db
+from app.models.models import Episode, EpisodeStatus
+from app.schemas.schemas import EpisodeResponse
+
+
+def make_rows(count: int, description_chars: int) -> List[Episode]:
+    """Episódios transientes com conteúdo realista (acentos, URLs, tags)."""
+    rng = random.Random(42)
+    words = ["metodologia", "ciência", "pesquisa", "episódio", "convidado", "análise", "dados"]
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        text = []
+        while sum(len(w) + 1 for w in text) < description_chars:
+            text.append(rng.choice(words))
+        rows.append(Episode(
+            id=i + 1,
+            title=f"Episódio {i + 1} - {rng.choice(words).title()}",
+            description=" ".join(text),
+            published_at=now - timedelta(days=i),
+            status=EpisodeStatus.PUBLISHED,
+            cover_image_url=f"https://cdn.metocast.com/covers/{i + 1}.jpg",
+            spotify_url=f"https://open.spotify.com/episode/{i + 1:022d}",
+            youtube_url=f"https://youtube.com/watch?v={i + 1:011d}",
+            tags=",".join(rng.sample(words, 3)),
+            created_at=now - timedelta(days=i, hours=1),
+            updated_at=None,
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--description-chars", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.page_size, args.description_chars)
+    field = create_response_field(name="response", type_=List[EpisodeResponse])
+    loop = asyncio.new_event_loop()
+
+    def default_path() -> bytes:
+        models = [EpisodeResponse.model_validate(row) for row in rows]
+        content = loop.run_until_complete(serialize_response(field=field, response_content=models))
+        return JSONResponse(content).body
+
+    def orjson_only() -> bytes:
+        models = [EpisodeResponse.model_validate(row) for row in rows]
+        content = loop.run_until_complete(serialize_response(field=field, response_content=models))
+        return ORJSONResponse(content).body
+
+    def fast_path() -> bytes:
+        return episode_list_adapter.dump_json(episodes_from_db(rows))
+
+    assert json.loads(default_path()) == json.loads(fast_path())
+
+    results = {}
+    for name, func in (("default", default_path), ("orjson_only", orjson_only), ("fast_path", fast_path)):
+        seconds = min(timeit.repeat(func, number=args.repeat, repeat=3)) / args.repeat
+        results[name] = {"ms_per_page": round(seconds * 1000, 3), "bytes": len(func())}
+    results["speedup"] = round(results["default"]["ms_per_page"] / results["fast_path"]["ms_per_page"], 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Script para exportar todos os episódios em NDJSON.
+Mesmo formato de GET /api/admin/export/episodes.ndjson.
+
+Uso:
+    python export_episodes.py                 # escreve no stdout
+    python export_episodes.py episodes.ndjson # escreve no arquivo
+"""
+import sys
+import os
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.export import iter_episodes_ndjson
+
+
+def main():
+    """Executa o export."""
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    out = open(path, "wb") if path else sys.stdout.buffer
+    try:
+        for chunk in iter_episodes_ndjson():
+            out.write(chunk)
+    finally:
+        if path:
+            out.close()
+    if path:
+        print(f"✅ Export concluído: {path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
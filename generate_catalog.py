@@ -0,0 +1,56 @@
+"""
+Script para gerar um catálogo sintético grande (testes de capacidade).
+Episódios determinísticos a partir de --seed, gerados em vários processos
+e carregados em massa (COPY no PostgreSQL).
+
+Uso:
+    python generate_catalog.py 1000000
+    python generate_catalog.py 100000 --seed 7 --processes 4 --published-ratio 0.8
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.synthetic import generate_catalog
+from app.db.session import SessionLocal
+
+
+def print_progress(rows, errors, seconds):
+    """Linha de progresso com linhas/s (reescrita no lugar)."""
+    rate = rows / seconds if seconds else 0.0
+    print(f"\r⏳ {rows} linhas · {rate:,.0f} linhas/s", end="", file=sys.stderr)
+
+
+def main():
+    """Executa a geração."""
+    parser = argparse.ArgumentParser(description="Gera episódios sintéticos em massa.")
+    parser.add_argument("count", type=int, help="Número de episódios")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", type=int, default=0,
+                        help="Ordinal inicial (para completar um catálogo já gerado)")
+    parser.add_argument("--processes", type=int, default=None, help="padrão: número de CPUs")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--published-ratio", type=float, default=0.9)
+    parser.add_argument("--years", type=float, default=5.0, help="Período coberto pelas datas")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = generate_catalog(
+            db, args.count, seed=args.seed, start=args.start, processes=args.processes,
+            chunk_size=args.chunk_size, published_ratio=args.published_ratio, years=args.years,
+            progress=print_progress
+        )
+        print(file=sys.stderr)
+        print(f"✅ {report.rows} episódios em {report.seconds:.1f}s ({report.rows_per_second:,.0f} linhas/s)")
+    except Exception as e:
+        print(f"\n❌ Erro na geração: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Script para importar episódios ou links em massa (NDJSON ou CSV).
+Aceita o formato de export_episodes.py / GET /api/admin/export/episodes.ndjson.
+
+Uso:
+    python import_catalog.py episodes episodes.ndjson
+    python import_catalog.py links links.csv --batch-size 5000
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.importer import IMPORT_FORMATS, IMPORT_KINDS, import_file
+from app.db.session import SessionLocal
+
+MAX_ERRORS_SHOWN = 20
+
+
+def print_progress(rows, errors, seconds):
+    """Linha de progresso com linhas/s (reescrita no lugar)."""
+    rate = rows / seconds if seconds else 0.0
+    print(f"\r⏳ {rows} linhas · {errors} erros · {rate:,.0f} linhas/s", end="", file=sys.stderr)
+
+
+def main():
+    """Executa o import."""
+    parser = argparse.ArgumentParser(description="Importa episódios ou links em massa.")
+    parser.add_argument("kind", choices=sorted(IMPORT_KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="padrão: pela extensão do arquivo")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            report = import_file(db, args.kind, stream, fmt, args.batch_size, print_progress)
+        print(file=sys.stderr)
+        print(f"✅ {report.rows} linhas em {report.seconds:.1f}s ({report.rows_per_second:,.0f} linhas/s)")
+        if report.errors:
+            print(f"⚠️  {len(report.errors)} linhas rejeitadas:")
+            for line_number, detail in report.errors[:MAX_ERRORS_SHOWN]:
+                print(f"   linha {line_number}: {detail}")
+    except Exception as e:
+        print(f"\n❌ Erro no import: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
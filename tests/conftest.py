@@ -0,0 +1,80 @@
+"""
+Fixtures da suíte: SQLite em arquivo temporário, orçamento de queries em
+modo raise e caches de processo zerados entre testes.
+
+TEST_DATABASE_URL troca o banco (ex.: PostgreSQL para os testes de
+EXPLAIN); o DATABASE_URL de desenvolvimento nunca é usado, porque as
+tabelas são limpas a cada teste.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/metocast_test_{os.getpid()}.db"
+)
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["QUERY_BUDGET_MODE"] = "raise"
+os.environ["EPISODE_COUNT_RECONCILE_SECONDS"] = "0"
+# O limiter tem testes próprios; na suíte toda a carga vem de um IP só
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.core.search import search_index
+from app.core.security import create_access_token
+from app.core.snapshots import links_snapshot
+from app.crud.user import create_user
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models import models
+from app.schemas.schemas import AdminUserCreate
+
+ADMIN_EMAIL = "admin@metocast.com"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    """Cria as tabelas uma vez; o arquivo SQLite é apagado no fim."""
+    Base.metadata.create_all(engine)
+    yield
+    engine.dispose()
+    if engine.dialect.name == "sqlite" and engine.url.database:
+        os.remove(engine.url.database)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Tabelas vazias e caches/memos de processo zerados antes de cada teste."""
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    # Versões recomeçam do zero: nada versionado pode sobreviver ao teste anterior
+    for table in list(cache._invalidation_hooks):
+        cache.invalidate(table)
+    links_snapshot.current.clear()
+    search_index.version = None
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_headers(db):
+    """Authorization de um admin (token emitido direto, sem o bcrypt do login)."""
+    user = create_user(db, AdminUserCreate(name="Admin", email=ADMIN_EMAIL, password="senha-de-teste"))
+    token = create_access_token({"sub": user.email, "tv": user.token_version or 0})
+    return {"Authorization": f"Bearer {token}"}
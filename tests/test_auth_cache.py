@@ -0,0 +1,21 @@
+"""Cache de usuários autenticados: revogação feita por outro worker expira com o TTL."""
+import time
+
+from app.core import cache
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.models.models import AdminUser
+
+
+def test_revocation_by_another_worker_applies_after_ttl(client, db, admin_headers, monkeypatch):
+    assert principal_cache.ttl_seconds == settings.AUTH_PRINCIPAL_TTL_SECONDS
+    assert client.get("/api/admin/episodes", headers=admin_headers).status_code == 200
+
+    # Outro worker desativa o admin: o banco muda, mas este processo não é avisado
+    db.query(AdminUser).update({AdminUser.is_active: False})
+    db.commit()
+    assert client.get("/api/admin/episodes", headers=admin_headers).status_code == 200
+
+    later = time.monotonic() + settings.AUTH_PRINCIPAL_TTL_SECONDS + 1
+    monkeypatch.setattr(cache.time, "monotonic", lambda: later)
+    assert client.get("/api/admin/episodes", headers=admin_headers).status_code == 401
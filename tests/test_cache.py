@@ -0,0 +1,49 @@
+"""Invalidação do cache de respostas e dos snapshots após escritas."""
+import pytest
+
+from app.core.snapshots import links_snapshot
+from app.crud.episode import create_episode
+from app.crud.watermark import Watermark
+from app.schemas.schemas import EpisodeCreate
+
+
+@pytest.fixture
+def episode(db):
+    return create_episode(db, EpisodeCreate(title="Original", status="PUBLISHED"))
+
+
+@pytest.mark.parametrize("path", ["/api/episodes", "/api/episodes/{id}", "/api/feed.xml"])
+def test_admin_write_invalidates_cached_responses(client, episode, admin_headers, path):
+    path = path.format(id=episode.id)
+    before = client.get(path)
+    assert "Original" in before.text
+
+    updated = client.put(f"/api/admin/episodes/{episode.id}", json={"title": "Editado"}, headers=admin_headers)
+    assert updated.status_code == 200
+
+    after = client.get(path, headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert "Editado" in after.text
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_links_snapshot_is_rebuilt_after_write(client, admin_headers):
+    assert client.get("/api/links").json() == []
+
+    created = client.post("/api/admin/links", json={
+        "label": "Instagram", "url": "https://instagram.com/metocast", "type": "INSTAGRAM", "order": 1
+    }, headers=admin_headers)
+    assert created.status_code == 201
+
+    assert [link["label"] for link in client.get("/api/links").json()] == ["Instagram"]
+
+
+def test_snapshot_of_one_source_is_not_served_to_another():
+    primary = Watermark(2, None)
+    lagging = Watermark(1, None, "replica0")
+    links_snapshot.rebuild(primary, [])
+
+    assert links_snapshot.get(primary) is not None
+    assert links_snapshot.get(lagging) is None
+    assert links_snapshot.get(Watermark(2, None, "replica0")) is None
+
@@ -0,0 +1,96 @@
+"""Totais por status mantidos por delta e X-Total-Count."""
+from sqlalchemy import func, update
+
+from app.crud import episode as episode_crud
+from app.crud.episode import (
+    create_episode, create_episodes_bulk, delete_episode, publish_episode,
+    publish_episodes_bulk, reconcile_episode_counts, unpublish_episode, update_episode
+)
+from app.crud.episode_count import get_episode_total
+from app.models.models import Episode, EpisodeCount, EpisodeStatus
+from app.schemas.schemas import EpisodeCreate, EpisodeUpdate
+
+
+def assert_counters_match(db):
+    """Contadores iguais ao COUNT(*) real, por status e no total."""
+    for status in EpisodeStatus:
+        real = db.query(func.count(Episode.id)).filter(Episode.status == status).scalar()
+        assert get_episode_total(db, status) == real, status
+    assert get_episode_total(db) == db.query(func.count(Episode.id)).scalar()
+
+
+def test_counters_follow_every_mutation(db):
+    draft = create_episode(db, EpisodeCreate(title="Rascunho"))
+    published = create_episode(db, EpisodeCreate(title="Publicado", status="PUBLISHED"))
+    assert_counters_match(db)
+
+    publish_episode(db, draft.id)
+    assert_counters_match(db)
+    # Publicar de novo não conta duas vezes
+    publish_episode(db, draft.id)
+    assert_counters_match(db)
+
+    unpublish_episode(db, published.id)
+    update_episode(db, draft.id, EpisodeUpdate(status=EpisodeStatus.DRAFT))
+    assert_counters_match(db)
+
+    delete_episode(db, published.id)
+    assert_counters_match(db)
+    assert get_episode_total(db) == 1
+
+
+def test_counters_follow_bulk_paths(db):
+    ids = create_episodes_bulk(db, [
+        EpisodeCreate(title=f"Lote {number}", status="PUBLISHED" if number % 2 else "DRAFT")
+        for number in range(6)
+    ])
+    assert_counters_match(db)
+
+    publish_episodes_bulk(db, ids + [999_999])
+    assert_counters_match(db)
+    assert get_episode_total(db, EpisodeStatus.PUBLISHED) == 6
+
+
+def test_reconcile_fixes_drift(db):
+    for number in range(3):
+        create_episode(db, EpisodeCreate(title=f"Ep {number}", status="PUBLISHED"))
+    db.execute(update(EpisodeCount).where(EpisodeCount.status == "PUBLISHED").values(total=10))
+    db.commit()
+
+    assert reconcile_episode_counts(db) == {"PUBLISHED": -7}
+    assert_counters_match(db)
+    assert reconcile_episode_counts(db) == {}
+
+
+def test_total_count_headers(client, db, admin_headers):
+    for number in range(4):
+        create_episode(db, EpisodeCreate(title=f"Ep {number}", status="PUBLISHED" if number else "DRAFT"))
+
+    assert client.get("/api/episodes", params={"limit": 1}).headers["X-Total-Count"] == "3"
+    admin = client.get("/api/admin/episodes", params={"limit": 1}, headers=admin_headers)
+    assert admin.headers["X-Total-Count"] == "4"
+    drafts = client.get("/api/admin/episodes", params={"status": "DRAFT"}, headers=admin_headers)
+    assert drafts.headers["X-Total-Count"] == "1"
+
+
+def test_batch_publish_counts_repeated_ids_once(client, db, admin_headers):
+    episode = create_episode(db, EpisodeCreate(title="Rascunho"))
+
+    response = client.patch("/api/admin/episodes:batch-publish", json={
+        "ids": [episode.id, 999_999, episode.id, 999_999]
+    }, headers=admin_headers)
+
+    body = response.json()
+    assert (body["succeeded"], body["ids"], body["failed"]) == (1, [episode.id], 1)
+    assert [error["index"] for error in body["errors"]] == [1]
+    assert_counters_match(db)
+
+
+def test_reconcile_skips_when_another_worker_holds_the_lock(db, monkeypatch):
+    create_episode(db, EpisodeCreate(title="Ep", status="PUBLISHED"))
+    db.execute(update(EpisodeCount).where(EpisodeCount.status == "PUBLISHED").values(total=10))
+    db.commit()
+    monkeypatch.setattr(episode_crud, "try_reconcile_lock", lambda db: False)
+
+    assert reconcile_episode_counts(db) is None
+    assert get_episode_total(db, EpisodeStatus.PUBLISHED) == 10
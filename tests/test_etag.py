@@ -0,0 +1,92 @@
+"""ETag / GET condicional a partir das marcas d'água por tabela."""
+import asyncio
+
+import pytest
+
+from app.core.etag import WatermarkMemo, current_watermark
+from app.crud.episode import PUBLISHED_SET, create_episode
+from app.crud.watermark import Watermark, bump_table_version, get_table_watermark
+from app.db.replicas import DATA_SOURCE_KEY
+from app.schemas.schemas import EpisodeCreate
+
+
+@pytest.fixture
+def episode(db):
+    return create_episode(db, EpisodeCreate(title="Original", status="PUBLISHED"))
+
+
+def test_matching_etag_returns_304(client, episode):
+    first = client.get("/api/episodes")
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/episodes", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    # Outra query string é outra representação
+    assert client.get("/api/episodes?limit=5", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.parametrize("count", [1, 30])
+def test_304_repeats_the_validator_of_the_200(client, db, count):
+    # 30 episódios passam de COMPRESSION_MIN_SIZE: a resposta sai comprimida
+    for n in range(count):
+        create_episode(db, EpisodeCreate(title=f"Episódio {n}", description="x" * 200, status="PUBLISHED"))
+
+    first = client.get("/api/episodes", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["ETag"].startswith('W/"episodes-')
+    again = client.get("/api/episodes", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+    # Sem compressão negociada, o ETag forte é o mesmo nas duas respostas
+    plain = client.get("/api/episodes", headers={"Accept-Encoding": "identity"})
+    assert plain.headers["ETag"] == first.headers["ETag"][2:]
+    assert client.get("/api/episodes", headers={
+        "Accept-Encoding": "identity", "If-None-Match": plain.headers["ETag"]
+    }).headers["ETag"] == plain.headers["ETag"]
+
+
+def test_draft_write_keeps_feed_etag(client, episode, admin_headers):
+    before = client.get("/api/feed.xml").headers["ETag"]
+
+    client.post("/api/admin/episodes", json={"title": "Rascunho"}, headers=admin_headers)
+
+    # O feed só depende do conjunto publicado
+    assert client.get("/api/feed.xml", headers={"If-None-Match": before}).status_code == 304
+
+
+def test_watermark_memo_is_per_source():
+    memo = WatermarkMemo(ttl_seconds=60)
+    memo.set("primary", "episodes", Watermark(5, None))
+    memo.set("replica0", "episodes", Watermark(3, None, "replica0"))
+
+    assert memo.get("primary", "episodes").version == 5
+    assert memo.get("replica0", "episodes").version == 3
+    assert memo.get("replica1", "episodes") is None
+
+    memo.drop("episodes")
+    assert memo.get("primary", "episodes") is None
+    assert memo.get("replica0", "episodes") is None
+
+
+def test_watermark_is_read_in_the_session_source(db, episode):
+    db.info[DATA_SOURCE_KEY] = "replica0"
+    watermark = asyncio.run(current_watermark(db, "episodes"))
+
+    assert watermark.source == "replica0"
+    assert watermark.version >= 1
+
+
+def test_bump_table_version_creates_then_increments(db):
+    assert get_table_watermark(db, PUBLISHED_SET).version == 0
+
+    bump_table_version(db, PUBLISHED_SET)
+    db.commit()
+    assert get_table_watermark(db, PUBLISHED_SET).version == 1
+
+    bump_table_version(db, PUBLISHED_SET)
+    bump_table_version(db, PUBLISHED_SET)
+    db.commit()
+    watermark = get_table_watermark(db, PUBLISHED_SET)
+    assert watermark.version == 3
+    assert watermark.updated_at is not None
@@ -0,0 +1,176 @@
+"""
+Planos (EXPLAIN ANALYZE) das queries quentes de episódios.
+
+Cria um schema temporário com a mesma estrutura e índices de `episodes`,
+popula EXPLAIN_ROWS linhas com generate_series (padrão 200 mil), roda
+ANALYZE e confere, com EXPLAIN (ANALYZE, BUFFERS):
+- listagens (página 1, cursor nas duas fases, filtro de status) e detalhe
+  usam índice, sem Seq Scan e sem Sort;
+- o predicado do cursor está no `Index Cond` (range no índice), não num
+  `Filter` aplicado linha a linha;
+- uma página profunda não remove mais linhas nem lê muito mais buffers
+  que a página 1 (custo plano, independente da profundidade).
+
+Requer PostgreSQL em TEST_DATABASE_URL (ver conftest.py); com SQLite
+(padrão da suíte) ou sem conexão os testes são pulados.
+
+Uso:
+    TEST_DATABASE_URL=postgresql://... python -m pytest tests/test_explain_episode_queries.py
+    EXPLAIN_ROWS=1000000 TEST_DATABASE_URL=postgresql://... python -m pytest tests/test_explain_episode_queries.py
+"""
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from app.crud.episode import episodes_query
+from app.db.session import SessionLocal, engine
+from app.models.models import Episode, EpisodeStatus
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="EXPLAIN dos índices requer PostgreSQL"
+)
+
+SCHEMA = "explain_check"
+ROWS = int(os.getenv("EXPLAIN_ROWS", "200000"))
+PAGE = 100
+
+# Folga da comparação de buffers: a descida na árvore de uma página
+# profunda pode tocar alguns blocos a mais que a da página 1
+BUFFER_SLACK = 8
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Sessão com search_path no schema temporário populado."""
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        pytest.skip("PostgreSQL indisponível")
+    try:
+        session.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        session.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        session.execute(text(f"CREATE TABLE {SCHEMA}.episodes (LIKE public.episodes INCLUDING ALL)"))
+        session.execute(text(f"""
+            INSERT INTO {SCHEMA}.episodes (id, title, description, status, published_at, created_at)
+            SELECT
+                g,
+                'Episódio ' || g,
+                repeat('descrição ', 20),
+                CASE WHEN g % 10 = 0 THEN 'DRAFT' ELSE 'PUBLISHED' END::episodestatus,
+                CASE WHEN g % 10 = 0 THEN NULL
+                     ELSE now() - (g || ' minutes')::interval END,
+                now()
+            FROM generate_series(1, :rows) AS g
+        """), {"rows": ROWS})
+        session.execute(text(f"ANALYZE {SCHEMA}.episodes"))
+        session.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        yield session
+    finally:
+        session.rollback()
+        session.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        session.commit()
+        session.close()
+
+
+def plan_nodes(plan: dict):
+    """Percorre recursivamente os nós do plano."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db, query) -> dict:
+    """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) de uma Query do ORM."""
+    sql = str(query.statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    result = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def index_scan(plan: dict) -> dict:
+    """Único nó de varredura por índice de episodes no plano."""
+    scans = [node for node in plan_nodes(plan) if "Index Name" in node]
+    assert len(scans) == 1, [node["Node Type"] for node in plan_nodes(plan)]
+    return scans[0]
+
+
+def rows_removed(plan: dict) -> int:
+    """Linhas lidas e descartadas por Filter/recheck em todo o plano."""
+    return sum(
+        node.get("Rows Removed by Filter", 0) + node.get("Rows Removed by Index Recheck", 0)
+        for node in plan_nodes(plan)
+    )
+
+
+def buffers(plan: dict) -> int:
+    """Blocos tocados (cache + disco); o nó raiz já inclui os filhos."""
+    return plan["Shared Hit Blocks"] + plan["Shared Read Blocks"]
+
+
+def cursor_at(db, status: EpisodeStatus, position: int):
+    """(published_at, id) da linha na posição `position` da listagem."""
+    row = db.query(Episode.published_at, Episode.id).filter(Episode.status == status).order_by(
+        Episode.published_at.desc().nullslast(), Episode.id.desc()
+    ).offset(position).first()
+    return row.published_at, row.id
+
+
+def public_page(db, cursor=None):
+    return episodes_query(db, limit=PAGE, status=EpisodeStatus.PUBLISHED, cursor=cursor)
+
+
+def draft_page(db, cursor=None):
+    return episodes_query(db, limit=PAGE, status=EpisodeStatus.DRAFT, cursor=cursor)
+
+
+def test_hot_queries_use_indexes(db):
+    cases = {
+        "lista pública (página 1)": public_page(db),
+        "lista pública (cursor profundo)": public_page(db, cursor_at(db, EpisodeStatus.PUBLISHED, ROWS // 2)),
+        "lista admin (status=DRAFT)": draft_page(db),
+        "lista admin (cauda de NULLs)": draft_page(db, cursor_at(db, EpisodeStatus.DRAFT, ROWS // 20)),
+        "detalhe por id": db.query(Episode).filter(Episode.id == ROWS // 3).limit(1),
+    }
+    for name, query in cases.items():
+        nodes = list(plan_nodes(explain(db, query)))
+        node_types = [node["Node Type"] for node in nodes]
+        assert "Seq Scan" not in node_types, name
+        assert "Sort" not in node_types and "Incremental Sort" not in node_types, name
+        assert any("Index Name" in node for node in nodes), name
+
+
+def test_cursor_predicate_is_index_condition(db):
+    scan = index_scan(explain(db, public_page(db, cursor_at(db, EpisodeStatus.PUBLISHED, ROWS // 2))))
+    assert "ROW(published_at, id) <" in scan["Index Cond"]
+    assert "Filter" not in scan
+
+
+def test_null_phase_predicate_is_index_condition(db):
+    scan = index_scan(explain(db, draft_page(db, cursor_at(db, EpisodeStatus.DRAFT, ROWS // 20))))
+    assert "published_at IS NULL" in scan["Index Cond"]
+    assert "id <" in scan["Index Cond"]
+    assert "Filter" not in scan
+
+
+@pytest.mark.parametrize("status, page", [
+    (EpisodeStatus.PUBLISHED, public_page),
+    (EpisodeStatus.DRAFT, draft_page),
+])
+def test_deep_page_cost_stays_flat(db, status, page):
+    first = explain(db, page(db))
+    # Perto do fim da listagem: offset teria de pular quase tudo
+    deep = explain(db, page(db, cursor_at(db, status, db.query(Episode).filter(
+        Episode.status == status
+    ).count() - 2 * PAGE)))
+    assert deep["Actual Rows"] == first["Actual Rows"] == PAGE
+    assert rows_removed(deep) <= rows_removed(first)
+    assert buffers(deep) <= buffers(first) + BUFFER_SLACK
@@ -0,0 +1,31 @@
+"""Feed RSS: corpo gzip em cache e variante descomprimida em streaming."""
+import gzip
+import os
+
+from app.core.feed import iter_gunzip
+from app.crud.episode import create_episode
+from app.schemas.schemas import EpisodeCreate
+
+
+def test_iter_gunzip_yields_bounded_chunks():
+    raw = os.urandom(1000).hex().encode() * 20
+    chunks = list(iter_gunzip(gzip.compress(raw), chunk_size=4096))
+
+    assert b"".join(chunks) == raw
+    assert len(chunks) > 1
+    assert max(len(chunk) for chunk in chunks) <= 4096
+
+
+def test_feed_variants_have_same_xml(client, db):
+    create_episode(db, EpisodeCreate(title="Episódio no feed", status="PUBLISHED"))
+
+    identity = client.get("/api/feed.xml", headers={"Accept-Encoding": "identity"})
+    assert identity.status_code == 200
+    assert "Content-Encoding" not in identity.headers
+    assert identity.text.startswith('<?xml version="1.0" encoding="UTF-8"?>')
+    assert "<title>Episódio no feed</title>" in identity.text
+
+    compressed = client.get("/api/feed.xml", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.text == identity.text
+    assert compressed.headers["ETag"] != identity.headers["ETag"]
@@ -0,0 +1,77 @@
+"""Paginação keyset: ordem estável, sem repetições e fronteira de published_at NULL."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.crud.episode import create_episode
+from app.models.models import Episode
+from app.schemas.schemas import EpisodeCreate
+
+BASE = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def catalog(db):
+    """8 publicados (dois pares com o mesmo published_at) e 5 rascunhos (NULL)."""
+    for day in (1, 2, 2, 3, 4, 4, 5, 6):
+        create_episode(db, EpisodeCreate(
+            title=f"Publicado {day}", status="PUBLISHED", published_at=BASE + timedelta(days=day)
+        ))
+    for number in range(5):
+        create_episode(db, EpisodeCreate(title=f"Rascunho {number}"))
+
+
+def expected_ids(db, published_only=False):
+    query = db.query(Episode.id)
+    if published_only:
+        query = query.filter(Episode.published_at.isnot(None))
+    return [row.id for row in query.order_by(Episode.published_at.desc().nullslast(), Episode.id.desc())]
+
+
+def walk(client, path, headers=None, limit=3):
+    """Segue X-Next-Cursor até o fim; retorna as páginas (listas de ids)."""
+    pages, params = [], {"limit": limit}
+    while True:
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_admin_cursor_crosses_null_boundary(client, db, catalog, admin_headers):
+    pages = walk(client, "/api/admin/episodes", admin_headers)
+
+    ids = [episode_id for page in pages for episode_id in page]
+    assert ids == expected_ids(db)
+    # A página da fronteira (3 publicados restantes não fecham 3+3) vem cheia
+    assert all(len(page) == 3 for page in pages[:-1])
+
+
+def test_boundary_at_page_end(client, db, catalog, admin_headers):
+    # limit=2: a última página de publicados fecha exatamente na fronteira
+    pages = walk(client, "/api/admin/episodes", admin_headers, limit=2)
+
+    assert [episode_id for page in pages for episode_id in page] == expected_ids(db)
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 2, 2, 1]
+
+
+def test_public_cursor_lists_only_published(client, db, catalog):
+    pages = walk(client, "/api/episodes")
+
+    assert [episode_id for page in pages for episode_id in page] == expected_ids(db, published_only=True)
+
+
+def test_ties_on_published_at_are_broken_by_id(client, db, catalog):
+    pages = walk(client, "/api/episodes", limit=1)
+
+    ids = [episode_id for page in pages for episode_id in page]
+    assert ids == expected_ids(db, published_only=True)
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/episodes", params={"cursor": "não-é-cursor"})
+
+    assert response.status_code == 400
@@ -0,0 +1,24 @@
+"""Pool de processos de senhas: contexto de início e métricas no /metrics."""
+import asyncio
+import multiprocessing
+
+from app.core import security
+
+
+def test_pool_does_not_fork_the_server():
+    context = security._pool_context()
+    assert context.get_start_method() in ("forkserver", "spawn")
+    assert "forkserver" not in multiprocessing.get_all_start_methods() or context.get_start_method() == "forkserver"
+
+
+def test_queue_wait_is_exported_in_metrics(client):
+    hashed = security.get_password_hash("senha")
+    try:
+        assert asyncio.run(security.verify_password_async("senha", hashed))
+    finally:
+        security.shutdown_password_pool()
+
+    body = client.get("/metrics").text
+    assert "# TYPE password_pool_queue_wait_seconds_total counter" in body
+    assert "password_pool_completed_total " in body
+    assert "password_pool_rejected_total 0" in body
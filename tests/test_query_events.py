@@ -0,0 +1,25 @@
+"""Um único par de eventos de cursor alimenta métricas e orçamento de queries."""
+from sqlalchemy import event, text
+
+from app.core.metrics import metrics
+from app.core.query_budget import assert_num_queries
+from app.db import query_events
+from app.db.session import engine
+
+
+def test_one_listener_per_engine():
+    query_events.instrument_queries(engine)  # já registrado pelo app: não duplica
+
+    listeners = engine.dispatch.after_cursor_execute
+    assert sum(1 for listener in listeners if listener is query_events._after_cursor_execute) == 1
+    assert event.contains(engine, "before_cursor_execute", query_events._before_cursor_execute)
+
+
+def test_query_feeds_metrics_and_budget(db):
+    before = sum(shard.queries for shard in metrics._shards)
+
+    with assert_num_queries(2):
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+
+    assert sum(shard.queries for shard in metrics._shards) - before == 2
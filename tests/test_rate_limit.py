@@ -0,0 +1,143 @@
+"""Token bucket por (regra, IP): decisões, despejo e middleware."""
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.rate_limit import (
+    MemoryBuckets, RateLimitMiddleware, RateLimitRule, RateLimiter, client_ip, parse_networks, parse_rate
+)
+
+LOGIN = RateLimitRule("login", ("POST",), "/api/auth/login", 10, 60.0)
+PUBLIC = RateLimitRule("episodes", ("GET", "HEAD"), "/api/episodes", 300, 60.0)
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("10/minute", (10, 60.0)),
+    ("5/seconds", (5, 1.0)),
+    ("100/hour", (100, 3600.0)),
+    ("0", None),
+    ("", None),
+])
+def test_parse_rate(spec, expected):
+    assert parse_rate(spec) == expected
+
+
+def test_parse_rate_rejects_unknown_period():
+    with pytest.raises(ValueError):
+        parse_rate("10/week")
+
+
+def test_rule_matches_prefix_and_method():
+    assert PUBLIC.matches("GET", "/api/episodes")
+    assert PUBLIC.matches("GET", "/api/episodes/42")
+    assert not PUBLIC.matches("GET", "/api/episodes-old")
+    assert not PUBLIC.matches("POST", "/api/episodes")
+
+
+def test_bucket_empties_and_refills():
+    buckets = MemoryBuckets(max_keys=100)
+    decisions = [buckets.take(LOGIN, "login:1.2.3.4", now=0.0) for _ in range(11)]
+
+    assert all(decision.allowed for decision in decisions[:10])
+    denied = decisions[10]
+    assert not denied.allowed
+    assert denied.remaining == 0
+    assert denied.retry_after == pytest.approx(6.0)
+    # Outro IP tem o próprio balde
+    assert buckets.take(LOGIN, "login:5.6.7.8", now=0.0).allowed
+    # 6 s repõem um token (10 por minuto)
+    assert buckets.take(LOGIN, "login:1.2.3.4", now=6.0).allowed
+    assert not buckets.take(LOGIN, "login:1.2.3.4", now=6.0).allowed
+
+
+def test_slow_rule_does_not_block_eviction_of_fast_rule():
+    buckets = MemoryBuckets(max_keys=1000)
+    # Login drenado na frente: só enche de novo em 60 s
+    for _ in range(10):
+        buckets.take(LOGIN, "login:1.1.1.1", now=0.0)
+    for number in range(20):
+        buckets.take(PUBLIC, f"episodes:{number}", now=0.0)
+
+    # Baldes públicos com 1 token gasto enchem em 0,2 s
+    for number in range(10):
+        buckets.take(PUBLIC, f"episodes:new{number}", now=5.0)
+
+    stats = buckets.stats()
+    assert stats["by_rule"] == {"login": 1, "episodes": 10}
+    assert stats["evicted"] == 20
+
+
+def test_max_keys_evicts_least_recently_used():
+    buckets = MemoryBuckets(max_keys=3)
+    for number in range(3):
+        buckets.take(LOGIN, f"login:{number}", now=0.0)
+        buckets.take(LOGIN, f"login:{number}", now=0.0)
+    buckets.take(LOGIN, "login:0", now=0.1)
+
+    buckets.take(LOGIN, "login:new", now=0.2)
+
+    assert list(buckets.buckets["login"]) == ["login:2", "login:0", "login:new"]
+    assert buckets.stats()["keys"] == 3
+
+
+def test_middleware_returns_429_with_headers():
+    async def endpoint(request):
+        return PlainTextResponse("ok")
+
+    limiter = RateLimiter([RateLimitRule("episodes", ("GET",), "/api/episodes", 2, 60.0)])
+    app = Starlette(routes=[Route("/api/episodes", endpoint), Route("/health", endpoint)])
+    client = TestClient(RateLimitMiddleware(app, limiter=limiter))
+
+    first = client.get("/api/episodes")
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert first.headers["RateLimit-Policy"] == "2;w=60"
+
+    client.get("/api/episodes")
+    limited = client.get("/api/episodes")
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "30"
+    assert limited.json()["detail"]
+
+    # Rotas sem regra passam direto, sem headers de limite
+    health = client.get("/health")
+    assert health.status_code == 200
+    assert "RateLimit-Limit" not in health.headers
+    assert limiter.stats()["rejected"] == 1
+
+
+def scope_from(peer: str, forwarded: str = None) -> dict:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"type": "http", "client": (peer, 50000), "headers": headers}
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer():
+    proxies = parse_networks("10.0.0.0/8")
+    assert client_ip(scope_from("203.0.113.7", "1.2.3.4")) == "203.0.113.7"
+    assert client_ip(scope_from("203.0.113.7", "1.2.3.4"), proxies) == "203.0.113.7"
+
+
+def test_client_ip_uses_rightmost_untrusted_hop():
+    proxies = parse_networks("10.0.0.0/8, 192.0.2.1")
+    # O cliente forjou "1.2.3.4"; o proxy acrescentou o IP real à direita
+    assert client_ip(scope_from("10.0.0.5", "1.2.3.4, 203.0.113.7"), proxies) == "203.0.113.7"
+    assert client_ip(scope_from("10.0.0.5", "1.2.3.4, 203.0.113.7, 192.0.2.1"), proxies) == "203.0.113.7"
+    assert client_ip(scope_from("10.0.0.5"), proxies) == "10.0.0.5"
+
+
+def test_spoofed_forwarded_for_does_not_change_bucket():
+    async def endpoint(request):
+        return PlainTextResponse("ok")
+
+    limiter = RateLimiter([RateLimitRule("login", ("POST",), "/api/auth/login", 2, 60.0)])
+    app = Starlette(routes=[Route("/api/auth/login", endpoint, methods=["POST"])])
+    client = TestClient(RateLimitMiddleware(app, limiter=limiter, trusted_proxies=parse_networks("10.0.0.0/8")))
+
+    statuses = [
+        client.post("/api/auth/login", headers={"X-Forwarded-For": f"198.51.100.{n}"}).status_code
+        for n in range(3)
+    ]
+    assert statuses == [200, 200, 429]
@@ -0,0 +1,40 @@
+"""Índice de busca em processo: ranking e paginação top-N."""
+from types import SimpleNamespace
+
+from app.core.search import InvertedIndex
+
+
+def build(rows) -> InvertedIndex:
+    index = InvertedIndex()
+    index.build([SimpleNamespace(id=i, title=t, tags=None, description=d) for i, t, d in rows], version=1)
+    return index
+
+
+def test_title_match_ranks_above_description():
+    index = build([(1, "Metodologia", ""), (2, "Outro", "metodologia"), (3, "Nada", "")])
+    assert index.search("metodologia") == [1, 2]
+
+
+def test_pages_keep_relevance_order_across_ids():
+    # O id 1 é o mais antigo, mas o mais relevante: vem primeiro
+    index = build([(1, "dados", ""), (2, "x", "dados"), (3, "y", "dados"), (4, "z", "")])
+    assert index.search("dados") == [1, 3, 2]
+    assert index.search("dados", skip=0, limit=2) == [1, 3]
+    assert index.search("dados", skip=2, limit=2) == [2]
+
+
+def test_route_stops_at_max_results(client, db, monkeypatch):
+    from app.core.config import settings
+    from app.crud.episode import create_episode
+    from app.schemas.schemas import EpisodeCreate
+
+    monkeypatch.setattr(settings, "SEARCH_MAX_RESULTS", 3)
+    for number in range(4):
+        create_episode(db, EpisodeCreate(title=f"Dados {number}", status="PUBLISHED"))
+
+    first = client.get("/api/episodes/search", params={"q": "dados", "limit": 2})
+    assert first.status_code == 200
+    assert "skip=2" in first.headers["Link"] and "limit=1" in first.headers["Link"]
+    last = client.get("/api/episodes/search", params={"q": "dados", "skip": 2, "limit": 1})
+    assert len(last.json()) == 1 and "Link" not in last.headers
+    assert client.get("/api/episodes/search", params={"q": "dados", "skip": 2, "limit": 2}).status_code == 400
@@ -0,0 +1,22 @@
+"""Gerador sintético: mesmas linhas para a mesma seed, qualquer que seja a divisão em blocos."""
+from app.core.synthetic import GeneratorOptions, generate_rows, plan_chunks
+
+
+def generate(options: GeneratorOptions, chunk_size: int) -> list:
+    return [
+        row
+        for chunk in plan_chunks(options.count, chunk_size, options.start)
+        for row in generate_rows(chunk, options)
+    ]
+
+
+def test_rows_do_not_depend_on_chunk_size():
+    options = GeneratorOptions(count=250, start=10, seed=7)
+    rows = generate(options, 250)
+    assert len(rows) == 250
+    assert generate(options, 64) == rows
+    assert generate(options, 1) == rows
+
+
+def test_seed_changes_rows():
+    assert generate(GeneratorOptions(count=20, seed=1), 20) != generate(GeneratorOptions(count=20, seed=2), 20)
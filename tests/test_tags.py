@@ -0,0 +1,109 @@
+"""Contagens de tags publicadas mantidas por delta (e o endpoint de facets)."""
+from collections import Counter
+
+from sqlalchemy import false
+
+from app.crud.episode import (
+    create_episode, create_episodes_bulk, delete_episode, publish_episode,
+    publish_episodes_bulk, unpublish_episode, update_episode
+)
+from app.crud.tag import _get_or_create_tags, parse_tags
+from app.db.session import SessionLocal
+from app.models.models import Episode, EpisodeStatus, Tag
+from app.schemas.schemas import EpisodeCreate, EpisodeUpdate
+
+
+def stored_counts(db):
+    return {tag.name: tag.published_count for tag in db.query(Tag) if tag.published_count}
+
+
+def recount(db):
+    """Contagens calculadas do zero a partir de Episode.tags."""
+    counts = Counter()
+    for episode in db.query(Episode).filter(Episode.status == EpisodeStatus.PUBLISHED):
+        counts.update(parse_tags(episode.tags))
+    return dict(counts)
+
+
+def test_tag_deltas_follow_mutations(db):
+    first = create_episode(db, EpisodeCreate(title="Um", tags="Ciência, dados", status="PUBLISHED"))
+    second = create_episode(db, EpisodeCreate(title="Dois", tags="ciência"))
+    assert stored_counts(db) == recount(db) == {"ciência": 1, "dados": 1}
+
+    publish_episode(db, second.id)
+    assert stored_counts(db) == recount(db) == {"ciência": 2, "dados": 1}
+
+    update_episode(db, first.id, EpisodeUpdate(tags="dados,ética"))
+    assert stored_counts(db) == recount(db) == {"ciência": 1, "dados": 1, "ética": 1}
+
+    unpublish_episode(db, second.id)
+    assert stored_counts(db) == recount(db) == {"dados": 1, "ética": 1}
+
+    # Rascunho não conta: mudar as tags dele não mexe nas contagens
+    update_episode(db, second.id, EpisodeUpdate(tags="outra"))
+    assert stored_counts(db) == recount(db)
+
+    delete_episode(db, first.id)
+    assert stored_counts(db) == recount(db) == {}
+
+
+def test_tag_deltas_in_bulk(db):
+    ids = create_episodes_bulk(db, [
+        EpisodeCreate(title="A", tags="a,b"),
+        EpisodeCreate(title="B", tags="b", status="PUBLISHED"),
+        EpisodeCreate(title="C", tags="a,b,c"),
+    ])
+    assert stored_counts(db) == recount(db) == {"b": 1}
+
+    publish_episodes_bulk(db, ids)
+    assert stored_counts(db) == recount(db) == {"a": 2, "b": 3, "c": 1}
+
+
+def test_facets_endpoint_and_tag_total(client, db):
+    create_episode(db, EpisodeCreate(title="Um", tags="dados,ciência", status="PUBLISHED"))
+    create_episode(db, EpisodeCreate(title="Dois", tags="dados", status="PUBLISHED"))
+    create_episode(db, EpisodeCreate(title="Três", tags="ciência"))
+
+    facets = client.get("/api/tags").json()
+    assert facets == [{"name": "dados", "count": 2}, {"name": "ciência", "count": 1}]
+
+    response = client.get("/api/episodes", params={"tag": "dados"})
+    assert response.headers["X-Total-Count"] == "2"
+    assert {episode["title"] for episode in response.json()} == {"Um", "Dois"}
+
+
+def test_tag_created_concurrently_is_reused(db, monkeypatch):
+    other = SessionLocal()
+    other.add(Tag(name="dados", published_count=0))
+    other.commit()
+    other.close()
+    # O primeiro SELECT não enxerga a tag: ela "surge" entre o SELECT e o INSERT
+    query = db.query
+    calls = []
+
+    def stale_first_query(*entities):
+        calls.append(entities)
+        return query(*entities).filter(false()) if len(calls) == 1 else query(*entities)
+
+    monkeypatch.setattr(db, "query", stale_first_query)
+    tag_ids = _get_or_create_tags(db, ["dados", "novo"])
+    db.commit()
+
+    assert set(tag_ids) == {"dados", "novo"}
+    monkeypatch.undo()
+    assert db.query(Tag).filter(Tag.name == "dados").count() == 1
+
+
+def test_mutation_rereads_episode_changed_by_another_session(db):
+    episode = create_episode(db, EpisodeCreate(title="Um", tags="ciência"))
+    stale = db.get(Episode, episode.id)  # rascunho, já no identity map desta sessão
+
+    other = SessionLocal()
+    try:
+        publish_episode(other, episode.id)
+    finally:
+        other.close()
+
+    # O delta sai do estado relido (e travado), não do objeto antigo da sessão
+    publish_episode(db, stale.id)
+    assert stored_counts(db) == recount(db) == {"ciência": 1}